@@ -23,6 +23,20 @@ if __name__ == "__main__":
         core.set_censys_max_results(args.censys_max)
     if args.shodan_max:
         core.set_shodan_max_results(args.shodan_max)
+    if args.shodan_workers:
+        core.set_shodan_workers(args.shodan_workers)
+    if args.censys_workers:
+        core.set_censys_workers(args.censys_workers)
+    if args.shodan_rate is not None:
+        core.set_shodan_rate_limit(args.shodan_rate)
+    if args.censys_rate is not None:
+        core.set_censys_rate_limit(args.censys_rate)
+    if args.no_cache:
+        core.set_search_cache(mode="disabled")
+    elif args.refresh_cache:
+        core.set_search_cache(mode="refresh")
+    if args.cache_ttl is not None or args.cache_max_size is not None:
+        core.set_search_cache(ttl=args.cache_ttl, max_size=args.cache_max_size)
     if args.vendor_confidence:
         core.set_vendor_confidence(args.vendor_confidence)
     if args.query_confidence:
@@ -31,6 +45,18 @@ if __name__ == "__main__":
         core.set_unique_entities_quantity(args.max_limit)
     if args.vendors:
         core.set_vendors(args.vendors)
+    if args.columnar:
+        core.set_columnar_analytics()
+    if args.load_vendors or args.load_products or args.load_countries:
+        core.set_load_filters(
+            vendors=args.load_vendors,
+            products=args.load_products,
+            countries=args.load_countries,
+        )
+
+    if args.diff_scans:
+        core.diff_scans(*args.diff_scans)
+        sys.exit(0)
 
     search_results = (
         core.batch_search(queries_filename=args.queries_file)
@@ -48,29 +74,47 @@ if __name__ == "__main__":
             top_ports=args.top_ports,
             host_timeout=args.host_timeout,
             workers=args.vulners_workers,
+            group_size=args.group_size,
+            resume=args.resume,
         )
     if args.nmap_scan:
         core.nmap_scan(
             top_ports=args.top_ports,
             host_timeout=args.host_timeout,
             workers=args.nmap_workers,
+            group_size=args.group_size,
+            resume=args.resume,
         )
     if args.tls_scan:
-        core.tls_scan(args.tls_scan_path)
+        core.tls_scan(
+            args.tls_scan_path,
+            workers=args.tls_workers,
+            threads_budget=args.tls_threads_budget,
+            service=args.tls_service,
+            stratify_by=args.tls_stratify,
+            ping_workers=args.tls_ping_workers,
+            ping_method=args.tls_ping_method,
+            detect_method=args.tls_detect_method,
+            decode_certificates=args.tls_decode_certificates,
+        )
     if args.script_check:
         core.run_scripts(queries_filename=args.queries_file)
     if args.count_unique:
-        core.count_unique_entities("product")
-        core.count_unique_entities("vendor")
-        core.count_unique_entities("port")
-        core.count_unique_entities("proto")
-        core.count_unique_entities("country")
-        core.count_unique_entities("vulnerability")
-        core.count_unique_entities("continent")
+        core.count_unique_entities_batch(
+            [
+                "product",
+                "vendor",
+                "port",
+                "proto",
+                "country",
+                "vulnerability",
+                "continent",
+            ]
+        )
     if args.update_markers:
         core.update_map_markers()
     if args.create_plots:
         core.create_plots()
     if args.run:
         core.save_results_to_database()
-    core.save_results()
+    core.save_results(ndjson=args.ndjson, columnar=args.columnar)
@@ -16,6 +16,7 @@ from grinder.errors import (
     CensysConnectorInitError,
     CensysConnectorSearchError,
 )
+from grinder.ratelimiter import SearchRateLimiters
 
 
 class CensysConnector:
@@ -25,12 +26,14 @@ class CensysConnector:
         api_id=DefaultValues.CENSYS_API_ID,
         api_secret=DefaultValues.CENSYS_API_SECRET,
     ):
+        self.rate_limiter_key = f"censys:{api_id}"
         try:
             self.api = CensysIPv4(api_id=api_id, api_secret=api_secret)
         except CensysUnauthorizedException as api_error:
             print(f"Censys API error: {api_error}")
         self.results: list = []
         self.censys_results_count: int = 0
+        self.search_failed: bool = False
         self.search_fields = [
             "ip",
             "location.country",
@@ -52,12 +55,25 @@ class CensysConnector:
     def search(
         self, query: str, max_records=DefaultValues.CENSYS_DEFAULT_RESULTS_QUANTITY
     ) -> None:
+        self.results = []
+        self.search_failed = False
         try:
-            self.results = list(
-                self.api.search(
-                    query, fields=self.search_fields, max_records=max_records
+            page = 1
+            pages = 1
+            while page <= pages and len(self.results) < max_records:
+                results_page = SearchRateLimiters.CENSYS.call(
+                    self.rate_limiter_key,
+                    self.api.paged_search,
+                    query,
+                    fields=self.search_fields,
+                    page=page,
+                    retry_if=self.is_retryable_error,
                 )
-            )
+                pages = results_page.get("metadata", {}).get("pages") or 0
+                self.results.extend(
+                    results_page.get("results", [])[: max_records - len(self.results)]
+                )
+                page += 1
         except (
             CensysRateLimitExceededException,
             CensysJSONDecodeException,
@@ -65,22 +81,29 @@ class CensysConnector:
             CensysUnauthorizedException,
         ) as api_error:
             print(f"Censys API error: {api_error}")
+            self.search_failed = True
         except AttributeError as api_not_defined:
             print(f"Censys API was not initialized: {api_not_defined}")
+            self.search_failed = True
         except CensysException as too_much_results_required:
             if "Only the first 1,000 search results are available" in str(
                 too_much_results_required
             ):
                 print(
-                    "Only the first 1,000 search results are available. Retry search with 1,000 results limit."
-                )
-                self.search(
-                    query, max_records=DefaultValues.CENSYS_FREE_PLAN_RESULTS_QUANTITY
+                    f"Only the first 1,000 search results are available. Stop search with {len(self.results)} results."
                 )
             else:
                 print(f"Censys API core exception: {too_much_results_required}")
+                self.search_failed = True
         self.censys_results_count = len(self.results)
 
+    @staticmethod
+    def is_retryable_error(api_error: Exception) -> bool:
+        return isinstance(api_error, CensysRateLimitExceededException)
+
+    def is_search_failed(self) -> bool:
+        return self.search_failed
+
     def get_raw_results(self) -> list:
         return self.results
 
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Columnar representation of processed hosts. Repeated host fields
+are dictionary-encoded into integer codes, so unique entities are
+counted with vectorized bincount instead of Python loops, and whole
+table can be saved to NumPy .npz file and used again without
+parsing of JSON results (for example, from notebooks).
+"""
+
+from collections.abc import Hashable
+from operator import attrgetter
+from typing import Iterable
+
+import numpy as np
+
+from grinder.continents import GrinderContinents
+from grinder.decorators import exception_handler
+from grinder.errors import (
+    GrinderColumnarResultsBuildError,
+    GrinderColumnarResultsSaveError,
+    GrinderColumnarResultsLoadError,
+    GrinderColumnarResultsCountError,
+)
+from grinder.hostrecord import HostRecord
+
+
+class GrinderColumnarResults:
+    """
+    Host table with columns:
+    - "<entity>_codes" (int32) and "<entity>_categories" for encoded
+      entities, code -1 means empty value
+    - "ip" (str), "lat" and "lng" (float64, NaN means empty value)
+    - vulnerabilities of every host in CSR form: "vulnerability_codes"
+      for host i are in range of "vulnerability_offsets"[i:i + 2]
+    """
+
+    ENCODED_COLUMNS = ("product", "vendor", "query", "port", "proto", "country")
+    FLOAT_COLUMNS = ("lat", "lng")
+    VULNERABILITY = "vulnerability"
+    VULNERABILITY_SOURCES = ("shodan_vulnerabilities", "vulners_vulnerabilities")
+
+    def __init__(self, columns: dict):
+        self.columns: dict = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["ip"])
+
+    @staticmethod
+    def _get_column(hosts: list, column: str) -> list:
+        """
+        Values of one host field. Fields of host records are read
+        directly from slots, without per-host Python calls.
+
+        :param hosts (list): processed hosts
+        :param column (str): host field
+        :return list: values in order of hosts
+        """
+        if all(type(host) is HostRecord for host in hosts):
+            return list(map(attrgetter(column), hosts))
+        return [host.get(column) for host in hosts]
+
+    @staticmethod
+    def _encode(values: list) -> (np.ndarray, list):
+        """
+        Dictionary encoding of column, categories are
+        in order of first appearance, None becomes -1
+
+        :param values (list): column values
+        :return tuple: codes and categories
+        """
+        try:
+            unique_values = dict.fromkeys(values)
+        except TypeError:
+            # Unhashable values (lists, etc.) are compared as text
+            values = [
+                value if isinstance(value, Hashable) else str(value)
+                for value in values
+            ]
+            unique_values = dict.fromkeys(values)
+        unique_values.pop(None, None)
+        categories = list(unique_values)
+        categories_index = {value: code for code, value in enumerate(categories)}
+        categories_index[None] = -1
+        codes = np.array(
+            list(map(categories_index.__getitem__, values)), dtype=np.int32
+        )
+        return codes, categories
+
+    @staticmethod
+    def _categories_to_array(categories: list) -> np.ndarray:
+        """
+        Integer and float categories keep their type, any other
+        categories are saved as text
+
+        :param categories (list): unique values of column
+        :return np.ndarray: categories array
+        """
+        if categories and all(
+            isinstance(value, int) and not isinstance(value, bool)
+            for value in categories
+        ):
+            return np.array(categories, dtype=np.int64)
+        if categories and all(
+            isinstance(value, (int, float)) and not isinstance(value, bool)
+            for value in categories
+        ):
+            return np.array(categories, dtype=np.float64)
+        return np.array([str(value) for value in categories], dtype=str)
+
+    @classmethod
+    @exception_handler(expected_exception=GrinderColumnarResultsBuildError)
+    def from_hosts(cls, hosts: Iterable) -> "GrinderColumnarResults":
+        """
+        Build columns from hosts, column by column
+
+        :param hosts (Iterable): processed hosts
+        :return GrinderColumnarResults: host table
+        """
+        hosts = list(hosts)
+        columns = {
+            "ip": np.array(
+                [str(ip) for ip in cls._get_column(hosts, "ip")], dtype=str
+            )
+        }
+        for column in cls.ENCODED_COLUMNS:
+            codes, categories = cls._encode(cls._get_column(hosts, column))
+            columns[f"{column}_codes"] = codes
+            columns[f"{column}_categories"] = cls._categories_to_array(categories)
+        for column in cls.FLOAT_COLUMNS:
+            columns[column] = np.array(
+                cls._get_column(hosts, column), dtype=np.float64
+            )
+
+        vulnerabilities_quantity = np.zeros(len(hosts), dtype=np.int64)
+        all_vulnerabilities: list = []
+        for position, host_vulnerabilities in enumerate(
+            cls._get_column(hosts, "vulnerabilities")
+        ):
+            if not host_vulnerabilities:
+                continue
+            unique_vulnerabilities = {
+                vulnerability
+                for source in cls.VULNERABILITY_SOURCES
+                for vulnerability in (host_vulnerabilities.get(source) or {})
+            }
+            vulnerabilities_quantity[position] = len(unique_vulnerabilities)
+            all_vulnerabilities.extend(sorted(unique_vulnerabilities))
+        codes, categories = cls._encode(all_vulnerabilities)
+        columns[f"{cls.VULNERABILITY}_codes"] = codes
+        columns[f"{cls.VULNERABILITY}_categories"] = cls._categories_to_array(
+            categories
+        )
+        columns[f"{cls.VULNERABILITY}_offsets"] = np.concatenate(
+            ([0], np.cumsum(vulnerabilities_quantity))
+        ).astype(np.int64)
+        return cls(columns)
+
+    @exception_handler(expected_exception=GrinderColumnarResultsSaveError)
+    def save(self, path: str) -> None:
+        """
+        Save all columns to compressed .npz file
+
+        :param path (str): path to file
+        :return None:
+        """
+        np.savez_compressed(path, **self.columns)
+
+    @classmethod
+    @exception_handler(expected_exception=GrinderColumnarResultsLoadError)
+    def load(cls, path: str) -> "GrinderColumnarResults":
+        """
+        Load columns from .npz file
+
+        :param path (str): path to file
+        :return GrinderColumnarResults: host table
+        """
+        with np.load(path, allow_pickle=False) as saved_columns:
+            return cls({name: saved_columns[name] for name in saved_columns.files})
+
+    def mask(self, **filters) -> np.ndarray:
+        """
+        Select hosts by encoded columns, for example:
+        mask(product="Apache", country=["Germany", "France"])
+
+        :param filters (dict): values of encoded columns
+        :return np.ndarray: boolean mask of hosts
+        """
+        selected = np.ones(len(self), dtype=bool)
+        for column, values in filters.items():
+            if column not in self.ENCODED_COLUMNS:
+                raise ValueError(f"Unknown encoded column: {column}")
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            categories = self.columns[f"{column}_categories"].tolist()
+            wanted_codes = [
+                code for code, value in enumerate(categories) if value in values
+            ]
+            selected &= np.isin(self.columns[f"{column}_codes"], wanted_codes)
+        return selected
+
+    @staticmethod
+    def _counts_to_dict(counts: np.ndarray, categories: np.ndarray) -> dict:
+        """
+        Sort counts by quantity, equal quantities stay in order of
+        first appearance, like sorted Counter does
+
+        :param counts (np.ndarray): quantity of every category
+        :param categories (np.ndarray): categories
+        :return dict: {category: quantity}
+        """
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0]
+        return dict(zip(categories[order].tolist(), counts[order].tolist()))
+
+    @exception_handler(expected_exception=GrinderColumnarResultsCountError)
+    def count(
+        self, entity_name: str, mask: np.ndarray = None, keep_empty: bool = False
+    ) -> dict:
+        """
+        Count unique values of entity ("country", "port", etc.,
+        "vulnerability" or "continent") with vectorized group-by.
+        Equal quantities stay in order of first appearance in
+        selected hosts, like Counter over the same values does.
+
+        :param entity_name (str): name of entity
+        :param mask (np.ndarray): count only selected hosts
+        :param keep_empty (bool): count empty values as None, like
+            host by host counting does
+        :return dict: {value: quantity of hosts}, sorted by quantity
+        """
+        if entity_name == self.VULNERABILITY:
+            return self.count_vulnerabilities(mask)
+        if entity_name == "continent":
+            return GrinderContinents.convert_continents(self.count("country", mask))
+        if entity_name not in self.ENCODED_COLUMNS:
+            raise ValueError(f"Unknown encoded column: {entity_name}")
+        codes = self.columns[f"{entity_name}_codes"]
+        categories = self.columns[f"{entity_name}_categories"].tolist()
+        if mask is not None:
+            codes = codes[mask]
+        unique_codes, first_positions, counts = np.unique(
+            codes, return_index=True, return_counts=True
+        )
+        if not keep_empty:
+            not_empty = unique_codes >= 0
+            unique_codes = unique_codes[not_empty]
+            first_positions = first_positions[not_empty]
+            counts = counts[not_empty]
+        appearance_order = np.argsort(first_positions, kind="stable")
+        unique_codes = unique_codes[appearance_order]
+        counts = counts[appearance_order]
+        order = np.argsort(-counts, kind="stable")
+        return {
+            (categories[code] if code >= 0 else None): quantity
+            for code, quantity in zip(
+                unique_codes[order].tolist(), counts[order].tolist()
+            )
+        }
+
+    def count_vulnerabilities(self, mask: np.ndarray = None) -> dict:
+        """
+        Count hosts affected by every vulnerability
+
+        :param mask (np.ndarray): count only selected hosts
+        :return dict: {vulnerability: quantity of hosts}, sorted by quantity
+        """
+        codes = self.columns[f"{self.VULNERABILITY}_codes"]
+        categories = self.columns[f"{self.VULNERABILITY}_categories"]
+        if mask is not None:
+            offsets = self.columns[f"{self.VULNERABILITY}_offsets"]
+            host_of_code = np.repeat(np.arange(len(self)), np.diff(offsets))
+            codes = codes[mask[host_of_code]]
+        counts = np.bincount(codes, minlength=len(categories))
+        return self._counts_to_dict(counts, categories)
@@ -1,38 +1,140 @@
 #!/usr/bin/env python3
 
-from pycountry_convert import country_alpha2_to_continent_code as code_to_continent
-from pycountry_convert import country_name_to_country_alpha2 as country_to_code
-
 from grinder.decorators import exception_handler
 from grinder.errors import GrinderContinentsConvertError
 
+CONTINENT_NAMES = {
+    "AF": "Africa",
+    "AN": "Antarctica",
+    "AS": "Asia",
+    "EU": "Europe",
+    "NA": "North America",
+    "OC": "Oceania",
+    "SA": "South and Central America",
+}
+
+# Country names from Shodan and Censys (GeoIP databases)
+# that are not known by pycountry_convert
+COUNTRY_NAME_VARIANTS = {
+    "Macedonia, the former Yugoslav Republic of": "MK",
+    "Republic of Macedonia": "MK",
+    "Libyan Arab Jamahiriya": "LY",
+    "Burma": "MM",
+    "Vatican City": "VA",
+    "Kosovo": "XK",
+    "Republic of Korea": "KR",
+    "Palestinian Territory": "PS",
+    "Congo Republic": "CG",
+    "DR Congo": "CD",
+    "U.S. Virgin Islands": "VI",
+    "St Kitts and Nevis": "KN",
+    "St Vincent and Grenadines": "VC",
+}
+
+# Countries without continent in pycountry_convert
+COUNTRY_CONTINENT_CODES = {
+    "AQ": "AN",
+    "EH": "AF",
+    "SX": "NA",
+    "TL": "AS",
+    "VA": "EU",
+    "UM": "OC",
+    "PN": "OC",
+    "TF": "AN",
+}
+
 
 class GrinderContinents:
+    # Country name to continent name, built on first use
+    continents_by_country: dict = None
+
+    @staticmethod
+    def _get_continent_by_code(country_code: str) -> str or None:
+        """
+        Get continent name by country alpha-2 code
+
+        :param country_code (str): country alpha-2 code
+        :return str: continent name, None if country has no continent
+        """
+        from pycountry_convert import country_alpha2_to_continent_code
+
+        try:
+            continent_code = country_alpha2_to_continent_code(country_code)
+        except KeyError:
+            continent_code = COUNTRY_CONTINENT_CODES.get(country_code)
+        return CONTINENT_NAMES.get(continent_code)
+
+    @classmethod
+    def get_continents_table(cls) -> dict:
+        """
+        Table of continents for all the known country names and their
+        variants. pycountry_convert data is loaded only here, on first use.
+
+        :return dict: {country name: continent name}
+        """
+        if cls.continents_by_country is not None:
+            return cls.continents_by_country
+        from pycountry_convert import map_countries
+
+        continents_by_country = {}
+        for country, codes in map_countries(cn_name_format="default").items():
+            continent = cls._get_continent_by_code(codes.get("alpha_2"))
+            if continent:
+                continents_by_country[country] = continent
+        for country, country_code in COUNTRY_NAME_VARIANTS.items():
+            continent = cls._get_continent_by_code(country_code)
+            if continent:
+                continents_by_country[country] = continent
+        cls.continents_by_country = continents_by_country
+        return continents_by_country
+
+    @classmethod
+    def get_continent(cls, country: str) -> str or None:
+        """
+        Get continent of country. Names that are not in table
+        are resolved once and remembered, unknown countries
+        stay as they are, like before.
+
+        :param country (str): country name
+        :return str: continent name
+        """
+        if not country:
+            return None
+        continents_by_country = cls.get_continents_table()
+        continent = continents_by_country.get(country)
+        if continent:
+            return continent
+        from pycountry_convert import country_name_to_country_alpha2
+
+        try:
+            continent = cls._get_continent_by_code(
+                country_name_to_country_alpha2(country, cn_name_format="default")
+            )
+        except KeyError:
+            continent = None
+        continent = continent or country
+        continents_by_country[country] = continent
+        return continent
+
+    @classmethod
+    def get_host_continent(cls, host: dict) -> str or None:
+        """
+        Get continent of host by its country
+
+        :param host (dict): host information
+        :return str: continent name
+        """
+        return cls.get_continent(host.get("country"))
+
     @staticmethod
     @exception_handler(expected_exception=GrinderContinentsConvertError)
     def convert_continents(unique_countries: dict) -> dict:
-        full_names = {
-            "AF": "Africa",
-            "AN": "Antarctica",
-            "AS": "Asia",
-            "EU": "Europe",
-            "NA": "North America",
-            "OC": "Oceania",
-            "SA": "South and Central America",
-        }
-
         continents: dict = {}
-        for country in unique_countries.keys():
-            try:
-                cntry_code = country_to_code(country, cn_name_format="default")
-                continent_key = code_to_continent(cntry_code)
-                continent = full_names.get(continent_key)
-            except KeyError:
-                continent = country
-
+        for country, quantity in unique_countries.items():
+            continent = GrinderContinents.get_continent(country)
             if continent not in continents:
-                continents[continent] = unique_countries.get(country)
+                continents[continent] = quantity
             else:
-                continents[continent] += unique_countries.get(country)
+                continents[continent] += quantity
 
         return continents
@@ -4,7 +4,10 @@ Basic core module for grinder. All functions from
 Other modules must be wrapped here for proper usage.
 """
 
-from typing import NamedTuple, List
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter, itemgetter
+from typing import Iterable, List, Iterator
 from termcolor import cprint
 from re import findall
 from time import sleep
@@ -12,6 +15,7 @@ from time import sleep
 # from enforce import runtime_validation
 
 from grinder.censysconnector import CensysConnector
+from grinder.columnar import GrinderColumnarResults
 from grinder.continents import GrinderContinents
 from grinder.dbhandling import GrinderDatabase
 from grinder.decorators import exception_handler, timer
@@ -19,6 +23,10 @@ from grinder.defaultvalues import (
     DefaultValues,
     DefaultNmapScanValues,
     DefaultVulnersScanValues,
+    DefaultProcessManagerValues,
+    DefaultScanCheckpointValues,
+    DefaultTlsScannerValues,
+    DefaultTlsProberValues,
 )
 from grinder.errors import (
     GrinderCoreSearchError,
@@ -28,24 +36,25 @@ from grinder.errors import (
     GrinderCoreUpdateMapMarkersError,
     GrinderCoreSaveResultsError,
     GrinderCoreCountUniqueProductsError,
-    GrinderCoreConvertToContinentsError,
     GrinderCoreCreatePlotError,
     GrinderCoreIsHostExistedError,
     GrinderCoreLoadResultsFromFileError,
     GrinderCoreInitDatabaseCallError,
     GrinderCoreCloseDatabaseError,
-    GrinderCoreUpdateEndTimeDatabaseError,
-    GrinderCoreUpdateResultsCountDatabaseError,
     GrinderFileManagerOpenError,
     GrinderCoreLoadResultsFromDbError,
     GrinderDatabaseLoadResultsError,
     GrinderCoreLoadResultsError,
+    GrinderCoreDiffScansError,
     GrinderCoreHostCensysResultsError,
     GrinderCoreSetCensysMaxResultsError,
     GrinderCoreSetShodanMaxResultsError,
+    GrinderCoreSetSearchWorkersError,
+    GrinderCoreSetRateLimitError,
+    GrinderCoreSetSearchCacheError,
+    GrinderCoreSetLoadFiltersError,
+    GrinderSearchCacheException,
     GrinderCoreAddProductDataToDatabaseError,
-    GrinderCoreShodanSaveToDatabaseError,
-    GrinderCoreCensysSaveToDatabaseError,
     GrinderCoreSaveResultsToDatabaseError,
     GrinderCoreNmapScanError,
     GrinderCoreFilterQueriesError,
@@ -54,37 +63,22 @@ from grinder.errors import (
     GrinderCoreTlsScanner,
 )
 from grinder.filemanager import GrinderFileManager
+from grinder.hostrecord import HostRecord
 from grinder.mapmarkers import MapMarkers
 from grinder.nmapprocessmanager import NmapProcessingManager
 from grinder.plots import GrinderPlots
 from grinder.shodanconnector import ShodanConnector
 from grinder.utils import GrinderUtils
 from grinder.pyscriptexecutor import PyScriptExecutor
+from grinder.ratelimiter import SearchRateLimiters
+from grinder.scancheckpoint import NmapScanCheckpoint
+from grinder.searchcache import GrinderSearchCache
 from grinder.nmapscriptexecutor import NmapScriptExecutor
+from grinder.threadoutput import ThreadOutput
 from grinder.tlsscanner import TlsScanner
 from grinder.tlsparser import TlsParser
 
 
-class HostInfo(NamedTuple):
-    """
-    This class is used to categorize all needed host fields.
-    Here we are describing our scanning template for host.
-    """
-
-    product: str
-    vendor: str
-    query: str
-    port: str
-    proto: str
-    ip: str
-    lat: str
-    lng: str
-    country: str
-    vulnerabilities: dict
-    nmap_scan: dict
-    scripts: dict
-
-
 # @runtime_validation
 class GrinderCore:
     """
@@ -108,6 +102,9 @@ class GrinderCore:
         self.censys_results_limit: int = DefaultValues.CENSYS_DEFAULT_RESULTS_QUANTITY
         self.shodan_results_limit: int = DefaultValues.SHODAN_DEFAULT_RESULTS_QUANTITY
 
+        self.shodan_workers: int = DefaultValues.SHODAN_SEARCH_WORKERS
+        self.censys_workers: int = DefaultValues.CENSYS_SEARCH_WORKERS
+
         self.shodan_api_key = shodan_api_key or DefaultValues.SHODAN_API_KEY
         self.censys_api_id = censys_api_id or DefaultValues.CENSYS_API_ID
         self.censys_api_secret = censys_api_secret or DefaultValues.CENSYS_API_SECRET
@@ -116,9 +113,13 @@ class GrinderCore:
         self.query_confidence: str = ""
         self.vendors: list = []
         self.max_entities: int = 6
+        self.load_filters: dict = {}
+        self.columnar_analytics: bool = False
 
         self.filemanager = GrinderFileManager()
         self.db = GrinderDatabase()
+        self.database_products: list = []
+        self.search_cache = GrinderSearchCache()
 
     @timer
     @exception_handler(expected_exception=GrinderCoreSearchError)
@@ -128,27 +129,109 @@ class GrinderCore:
         module.
 
         :param query (str): search query for shodan
+        :param results_count (int): maximum results quantity
         :return list: raw shodan results in list
         """
+        return list(self.shodan_search_iter(query, results_count))
+
+    def shodan_search_iter(self, query: str, results_count=None) -> Iterator[dict]:
+        """
+        Search in shodan database with ShodanConnector module
+        and yield raw results one by one, without keeping
+        all of them in memory.
+
+        :param query (str): search query for shodan
+        :param results_count (int): maximum results quantity
+        :return Iterator[dict]: raw shodan results
+        """
 
         # Skip default values
         if self.shodan_api_key == "YOUR_DEFAULT_API_KEY":
             print(f"│ Shodan key is not defined. Skip scan.")
             print(f"└ ", end="")
-            return []
+            return
 
         if not results_count:
             results_count = (
                 self.shodan_results_limit
                 or DefaultValues.SHODAN_DEFAULT_RESULTS_QUANTITY
             )
+        cached_results = self.__get_cached_results("shodan", query, results_count)
+        if cached_results is not None:
+            print(f"│ Shodan results loaded from cache: {len(cached_results)}")
+            print(f"└ ", end="")
+            cached_results.reverse()
+            while cached_results:
+                yield cached_results.pop()
+            return
+
         shodan = ShodanConnector(api_key=self.shodan_api_key)
-        shodan.search(query, results_count)
-        shodan_raw_results = shodan.get_results()
+        results_to_cache: list = []
+        for current_host in shodan.search_iter(query, results_count):
+            if self.search_cache.is_writable():
+                results_to_cache.append(self.__get_shodan_cache_fields(current_host))
+            yield current_host
         print(f"│ Shodan results count: {shodan.get_shodan_count()}")
         print(f"│ Real results count: {shodan.get_real_count()}")
         print(f"└ ", end="")
-        return shodan_raw_results
+        if not shodan.is_search_failed():
+            self.__put_cached_results("shodan", query, results_count, results_to_cache)
+
+    @staticmethod
+    def __get_shodan_cache_fields(current_host: dict) -> dict:
+        """
+        Take only the fields of raw Shodan banner that are
+        required to parse host, full banners are too big
+        to keep them in cache.
+
+        :param current_host (dict): raw shodan banner
+        :return dict: banner with required fields only
+        """
+        location = current_host.get("location") or {}
+        return {
+            "ip_str": current_host.get("ip_str"),
+            "port": current_host.get("port"),
+            "_shodan": {"module": (current_host.get("_shodan") or {}).get("module")},
+            "location": {
+                "latitude": location.get("latitude"),
+                "longitude": location.get("longitude"),
+                "country_name": location.get("country_name"),
+            },
+            "vulns": current_host.get("vulns"),
+        }
+
+    def __get_cached_results(
+        self, backend: str, query: str, results_count: int
+    ) -> list or None:
+        """
+        Get results of the same query from cache, if any
+
+        :param backend (str): search backend name
+        :param query (str): search query
+        :param results_count (int): maximum results quantity
+        :return list: cached results or None
+        """
+        try:
+            return self.search_cache.get(backend, query, results_count)
+        except GrinderSearchCacheException as cache_error:
+            print(f"│ Search cache is not available: {cache_error}")
+
+    def __put_cached_results(
+        self, backend: str, query: str, results_count: int, results: list
+    ) -> None:
+        """
+        Save results of query to cache
+
+        :param backend (str): search backend name
+        :param query (str): search query
+        :param results_count (int): maximum results quantity
+        :param results (list): results to save
+        :return None:
+        """
+        try:
+            self.search_cache.put(backend, query, results_count, results)
+        except GrinderSearchCacheException as cache_error:
+            print(f"Search cache is not available: {cache_error}")
 
     @exception_handler(expected_exception=GrinderCoreSetCensysMaxResultsError)
     def set_censys_max_results(self, results_count: int) -> None:
@@ -170,6 +253,107 @@ class GrinderCore:
         """
         self.shodan_results_limit = results_count
 
+    @exception_handler(expected_exception=GrinderCoreSetSearchWorkersError)
+    def set_shodan_workers(self, workers: int) -> None:
+        """
+        Set maximum quantity of concurrent Shodan queries
+
+        :param workers (int): number of concurrent queries
+        :return None:
+        """
+        self.shodan_workers = max(int(workers), 1)
+
+    @exception_handler(expected_exception=GrinderCoreSetSearchWorkersError)
+    def set_censys_workers(self, workers: int) -> None:
+        """
+        Set maximum quantity of concurrent Censys queries
+
+        :param workers (int): number of concurrent queries
+        :return None:
+        """
+        self.censys_workers = max(int(workers), 1)
+
+    @exception_handler(expected_exception=GrinderCoreSetRateLimitError)
+    def set_shodan_rate_limit(self, requests_per_second: float) -> None:
+        """
+        Set maximum quantity of Shodan API requests per second
+
+        :param requests_per_second (float): requests per second
+        :return None:
+        """
+        SearchRateLimiters.SHODAN.set_rate(float(requests_per_second))
+
+    @exception_handler(expected_exception=GrinderCoreSetRateLimitError)
+    def set_censys_rate_limit(self, requests_per_second: float) -> None:
+        """
+        Set maximum quantity of Censys API requests per second
+
+        :param requests_per_second (float): requests per second
+        :return None:
+        """
+        SearchRateLimiters.CENSYS.set_rate(float(requests_per_second))
+
+    @exception_handler(expected_exception=GrinderCoreSetSearchCacheError)
+    def set_search_cache(
+        self, mode: str = None, ttl: int = None, max_size: int = None
+    ) -> None:
+        """
+        Configure cache of search results
+
+        :param mode (str): "enabled" to read and write cache, "refresh"
+            to skip cached results and write new ones, "disabled" to
+            bypass cache at all
+        :param ttl (int): time to live of cached results in seconds
+        :param max_size (int): maximum size of cache in megabytes
+        :return None:
+        """
+        if mode:
+            if mode not in ["enabled", "refresh", "disabled"]:
+                print("Search cache mode is not valid")
+                return
+            self.search_cache.mode = mode
+        if ttl is not None:
+            self.search_cache.ttl = ttl
+        if max_size is not None:
+            self.search_cache.max_size = max_size
+
+    @exception_handler(expected_exception=GrinderCoreSetLoadFiltersError)
+    def set_load_filters(
+        self, vendors: list = None, products: list = None, countries: list = None
+    ) -> None:
+        """
+        Load only some of saved hosts for partial re-analysis
+
+        :param vendors (list): load hosts of these vendors
+        :param products (list): load hosts of these products
+        :param countries (list): load hosts from these countries
+        :return None:
+        """
+        self.load_filters = {
+            field: set(map(str.lower, values))
+            for field, values in [
+                ("vendor", vendors),
+                ("product", products),
+                ("country", countries),
+            ]
+            if values
+        }
+
+    def __filter_loaded_hosts(self, hosts: dict) -> dict:
+        """
+        Apply load filters to hosts loaded from database
+
+        :param hosts (dict): {ip: host}
+        :return dict: only matched hosts
+        """
+        if not self.load_filters or not hosts:
+            return hosts
+        return {
+            ip: host
+            for ip, host in hosts.items()
+            if self.filemanager.is_host_matched(host, self.load_filters)
+        }
+
     @timer
     @exception_handler(expected_exception=GrinderCoreSearchError)
     def censys_search(self, query: str, results_count=None) -> list:
@@ -197,6 +381,12 @@ class GrinderCore:
                 or DefaultValues.CENSYS_DEFAULT_RESULTS_QUANTITY
             )
 
+        cached_results = self.__get_cached_results("censys", query, results_count)
+        if cached_results is not None:
+            print(f"│ Censys results loaded from cache: {len(cached_results)}")
+            print(f"└ ", end="")
+            return cached_results
+
         censys = CensysConnector(
             api_id=self.censys_api_id, api_secret=self.censys_api_secret
         )
@@ -204,6 +394,8 @@ class GrinderCore:
         censys_raw_results = censys.get_results()
         print(f"│ Censys results count: {censys.get_results_count()}")
         print(f"└ ", end="")
+        if not censys.is_search_failed():
+            self.__put_cached_results("censys", query, results_count, censys_raw_results)
         return censys_raw_results
 
     @exception_handler(expected_exception=GrinderCoreUpdateMapMarkersError)
@@ -270,91 +462,29 @@ class GrinderCore:
                 filename=f'limited_{limited_entity.get("entity")}.png',
             )
 
-    @exception_handler(expected_exception=GrinderCoreConvertToContinentsError)
-    def count_continents(self) -> dict:
-        """
-        Count unique continents based on country. This method is custom
-        because we need to convert our countries to continents before
-        we put it in analysis.
-
-        :return dict: dictionary {'country':Count of products in that country}
-        """
-        continents: dict = {}
-        for entity in self.entities_count_all:
-            if not entity.get("entity") == "country":
-                continue
-            continents = GrinderContinents.convert_continents(entity.get("results"))
-        self.entities_count_all.append({"entity": "continent", "results": continents})
-        return continents
-
-    def count_vulnerabilities(self, max_vulnerabilities=10) -> List[str]:
-        """
-        Count unique vulnerabilities from Shodan and Vulners.com API scan
-
-        :return dict: dictionary {'vulnerability': number of affected services}
-        """
-        full_cve_list: list = []
-        for host in self.combined_results.values():
-            shodan_cve_list: list = []
-            vulners_cve_list: list = []
-            host_vulnerabilities: list = []
-
-            vulnerabilities = host.get("vulnerabilities")
-            if not vulnerabilities:
-                continue
-
-            shodan_vulnerabilities = vulnerabilities.get("shodan_vulnerabilities")
-            if shodan_vulnerabilities:
-                shodan_cve_list = list(shodan_vulnerabilities.keys())
-
-            vulners_vulnerabilities = vulnerabilities.get("vulners_vulnerabilities")
-            if vulners_vulnerabilities:
-                vulners_cve_list = list(vulners_vulnerabilities.keys())
-
-            # If nothing was found from Shodan or Vulners for current host
-            if not (shodan_cve_list or vulners_cve_list):
-                continue
-
-            host_vulnerabilities = list(set(shodan_cve_list + vulners_cve_list))
-            if host_vulnerabilities:
-                full_cve_list.extend(host_vulnerabilities)
-
-        utils = GrinderUtils()
-        utils.count_entities(full_cve_list, max_vulnerabilities)
-
-        self.entities_count_all.append(
-            {"entity": "vulnerability", "results": utils.get_all_count_results()}
-        )
-        self.entities_count_limit.append(
-            {
-                "entity": "vulnerability",
-                "results": utils.get_limited_max_count_results(),
-            }
-        )
-        return full_cve_list
-
     @exception_handler(expected_exception=GrinderCoreLoadResultsFromFileError)
     def load_results_from_file(
         self,
         load_dir=DefaultValues.RESULTS_DIRECTORY,
-        load_file=DefaultValues.JSON_RESULTS_FILE,
+        load_file=None,
         load_json_dir=DefaultValues.JSON_RESULTS_DIRECTORY,
     ) -> list:
         """
         Load saved results of latest previous scan from json file
 
         :param load_dir (str): base directory with results
-        :param load_file (str): json results filename
+        :param load_file (str): json or ndjson results filename,
+            the latest saved one if not set
         :param load_json_dir (str): directory with json results to load from
         :return list: processed search results
         """
         try:
-            self.combined_results = self.filemanager.load_data_from_file(
-                load_dir=load_dir, load_file=load_file, load_json_dir=load_json_dir
+            self.combined_results = self.filemanager.load_hosts_from_file(
+                load_dir=load_dir,
+                load_file=load_file,
+                load_json_dir=load_json_dir,
+                filters=self.load_filters,
             )
-            self.combined_results = {
-                host.get("ip"): host for host in self.combined_results
-            }
             print("Results of latest scan was successfully loaded from json file.")
             return self.combined_results
         except GrinderFileManagerOpenError:
@@ -370,14 +500,60 @@ class GrinderCore:
         :return list: processed search results
         """
         try:
-            self.combined_results = self.db.load_last_results()
-            self.shodan_processed_results = self.db.load_last_shodan_results()
-            self.censys_processed_results = self.db.load_last_censys_results()
+            # Create missing tables and migrate results of older versions
+            self.db.create_db()
+            self.combined_results = self.__filter_loaded_hosts(
+                self.db.load_last_results()
+            )
+            self.shodan_processed_results = self.__filter_loaded_hosts(
+                self.db.load_last_shodan_results()
+            )
+            self.censys_processed_results = self.__filter_loaded_hosts(
+                self.db.load_last_censys_results()
+            )
             print("Results of latest scan was successfully loaded from database.")
             return self.combined_results
         except GrinderDatabaseLoadResultsError:
             print("Database empty or latest scan data was not found. Abort.")
 
+    @exception_handler(expected_exception=GrinderCoreDiffScansError)
+    def diff_scans(
+        self,
+        old_scan_id: int,
+        new_scan_id: int,
+        dest_dir: str = DefaultValues.RESULTS_DIRECTORY,
+    ) -> dict:
+        """
+        Compare two scans from database and save hosts
+        that appeared and disappeared between them
+
+        :param old_scan_id (int): id of older scan
+        :param new_scan_id (int): id of newer scan
+        :param dest_dir (str): directory to save results
+        :return dict: {"appeared": [hosts], "disappeared": [hosts]}
+        """
+        self.db.create_db()
+        scans = {scan.get("id"): scan for scan in self.db.get_scans()}
+        for scan_id in [old_scan_id, new_scan_id]:
+            if scan_id not in scans:
+                print(f"Scan {scan_id} was not found in database")
+                return {}
+        difference = self.db.diff_scans(old_scan_id, new_scan_id)
+        cprint(
+            f"Difference between scan {old_scan_id} ({scans[old_scan_id].get('date')}) "
+            f"and scan {new_scan_id} ({scans[new_scan_id].get('date')})",
+            "blue",
+            attrs=["bold"],
+        )
+        print(f"│ Appeared: {len(difference.get('appeared'))}")
+        print(f"└ Disappeared: {len(difference.get('disappeared'))}")
+        self.filemanager.write_results_json(
+            difference,
+            dest_dir=dest_dir,
+            json_file=f"scan_diff_{old_scan_id}_{new_scan_id}.json",
+        )
+        return difference
+
     @exception_handler(expected_exception=GrinderCoreLoadResultsError)
     def load_results(self) -> list:
         """
@@ -388,11 +564,18 @@ class GrinderCore:
         return self.load_results_from_file() or self.load_results_from_db()
 
     @exception_handler(expected_exception=GrinderCoreSaveResultsError)
-    def save_results(self, dest_dir=DefaultValues.RESULTS_DIRECTORY) -> None:
+    def save_results(
+        self,
+        dest_dir=DefaultValues.RESULTS_DIRECTORY,
+        ndjson: bool = False,
+        columnar: bool = False,
+    ) -> None:
         """
         Save all scan results to all formats
 
         :param dest_dir (str): directory to save results
+        :param ndjson (bool): save hosts as NDJSON instead of JSON list
+        :param columnar (bool): also export hosts to columnar NumPy file
         :return None:
         """
         cprint("Save all results...", "blue", attrs=["bold"])
@@ -406,21 +589,12 @@ class GrinderCore:
         if not self.combined_results:
             return
 
-        if self.combined_results:
-            self.filemanager.write_results_json(
-                list(self.combined_results.values()),
-                dest_dir=dest_dir,
-                json_file=DefaultValues.JSON_RESULTS_FILE,
-            )
-            self.filemanager.write_results_csv(
-                list(self.combined_results.values()),
-                dest_dir=dest_dir,
-                csv_file=DefaultValues.CSV_RESULTS_FILE,
-            )
-            self.filemanager.write_results_txt(
-                list(self.combined_results.values()),
-                dest_dir=dest_dir,
-                txt_file=DefaultValues.TXT_RESULTS_FILE,
+        self.filemanager.write_results_all(
+            self.combined_results.values(), dest_dir=dest_dir, ndjson=ndjson
+        )
+        if columnar:
+            self.filemanager.write_results_columnar(
+                self.get_columnar_results(), dest_dir=dest_dir
             )
 
         if self.entities_count_all:
@@ -480,6 +654,26 @@ class GrinderCore:
         """
         self.max_entities = max_entitities
 
+    def set_columnar_analytics(self, enabled: bool = True) -> None:
+        """
+        Count unique entities with vectorized group-by over
+        columnar host table instead of counting host by host
+
+        :param enabled (bool): use columnar analytics
+        :return None:
+        """
+        self.columnar_analytics = enabled
+
+    def get_columnar_results(self) -> GrinderColumnarResults:
+        """
+        Columnar host table of current combined results. Table is
+        built on every call, because hosts are updated in place
+        by scans
+
+        :return GrinderColumnarResults: host table
+        """
+        return GrinderColumnarResults.from_hosts(self.combined_results.values())
+
     @exception_handler(expected_exception=GrinderCoreCountUniqueProductsError)
     def count_unique_entities(
         self, entity_name, search_results=None, max_entities=None
@@ -492,34 +686,119 @@ class GrinderCore:
         :param max_entities (int): max entities in count
         :return None:
         """
-        cprint(f"Count unique {entity_name}...", "blue", attrs=["bold"])
+        self.count_unique_entities_batch(
+            [entity_name], search_results=search_results, max_entities=max_entities
+        )
+
+    @staticmethod
+    def __count_entities_in_one_pass(
+        entity_names: list, search_results: Iterable
+    ) -> dict:
+        """
+        Make histograms of all the entities with one traversal of hosts:
+        all the needed fields of host are taken at once, then every
+        field is counted by Counter
+
+        :param entity_names (list): entities to count, without continents
+        :param search_results (Iterable): hosts to count from
+        :return dict: {entity name: Counter}
+        """
+        fields = [
+            "vulnerabilities" if entity_name == "vulnerability" else entity_name
+            for entity_name in entity_names
+        ]
+        if not fields:
+            return {}
+        try:
+            # Host records keep fields in slots, so they are read without calls
+            rows = list(map(attrgetter(*fields), search_results))
+        except AttributeError:
+            rows = [
+                tuple(host.get(field) for field in fields) for host in search_results
+            ]
+            if len(fields) == 1:
+                rows = [row[0] for row in rows]
+
+        counters = {}
+        for position, entity_name in enumerate(entity_names):
+            values = rows if len(fields) == 1 else map(itemgetter(position), rows)
+            if entity_name != "vulnerability":
+                counters[entity_name] = Counter(values)
+                continue
+            counters[entity_name] = Counter()
+            for vulnerabilities in values:
+                if not vulnerabilities:
+                    continue
+                counters[entity_name].update(
+                    set(vulnerabilities.get("shodan_vulnerabilities") or {})
+                    | set(vulnerabilities.get("vulners_vulnerabilities") or {})
+                )
+        return counters
+
+    @exception_handler(expected_exception=GrinderCoreCountUniqueProductsError)
+    def count_unique_entities_batch(
+        self, entity_names: List[str], search_results=None, max_entities=None
+    ) -> None:
+        """
+        Count all the requested entities (like country, protocol,
+        vulnerability, continent, etc.) with one pass over hosts.
+        Continents are made from country histogram.
+
+        :param entity_names (list): names of entities ('country', 'proto', etc.)
+        :param search_results (list): results to count from
+        :param max_entities (int): max entities in limited count
+        :return None:
+        """
+        cprint(f"Count unique {', '.join(entity_names)}...", "blue", attrs=["bold"])
         if not max_entities:
             max_entities = self.max_entities
-        if entity_name == "vulnerability":
-            self.count_vulnerabilities(max_entities)
-            return
-        if entity_name == "continent":
-            self.count_continents()
-            return
-        if not search_results:
-            search_results = list(self.combined_results.values())
-        list_of_entities = [
-            current_product.get(entity_name) for current_product in search_results
+        counted_names = [
+            entity_name for entity_name in entity_names if entity_name != "continent"
         ]
-        utils = GrinderUtils()
-        utils.count_entities(list_of_entities, max_entities)
+        if "continent" in entity_names and "country" not in counted_names:
+            counted_names.append("country")
+
+        if self.columnar_analytics and not search_results:
+            columnar_results = self.get_columnar_results()
+            counters = {
+                entity_name: Counter(
+                    columnar_results.count(entity_name, keep_empty=True)
+                )
+                for entity_name in counted_names
+            }
+        else:
+            counters = self.__count_entities_in_one_pass(
+                counted_names, list(search_results or self.combined_results.values())
+            )
 
-        self.entities_count_all.append(
-            {"entity": entity_name, "results": utils.get_all_count_results()}
-        )
-        self.entities_count_limit.append(
-            {"entity": entity_name, "results": utils.get_limited_max_count_results()}
-        )
+        for entity_name in entity_names:
+            utils = GrinderUtils()
+            if entity_name == "continent":
+                utils.set_counted_entities(counters["country"], max_entities)
+                self.entities_count_all.append(
+                    {
+                        "entity": "continent",
+                        "results": GrinderContinents.convert_continents(
+                            utils.get_all_count_results()
+                        ),
+                    }
+                )
+                continue
+            utils.set_counted_entities(counters[entity_name], max_entities)
+            self.entities_count_all.append(
+                {"entity": entity_name, "results": utils.get_all_count_results()}
+            )
+            self.entities_count_limit.append(
+                {
+                    "entity": entity_name,
+                    "results": utils.get_limited_max_count_results(),
+                }
+            )
 
     @exception_handler(expected_exception=GrinderCoreHostShodanResultsError)
     def __parse_current_host_shodan_results(
         self, current_host: dict, query: str, product_info: dict
-    ) -> None:
+    ) -> dict or None:
         """
         Parse raw results from shodan. Results were received from
         ShodanConnector module.
@@ -527,14 +806,14 @@ class GrinderCore:
         :param current_host (dict): current host information
         :param query (str): current active query on which we found this host
         :param product_info (dict): information about current product
-        :return None:
+        :return dict: processed host information
         """
         if not (
             current_host.get("location").get("latitude")
             and current_host.get("location").get("longitude")
         ):
             return
-        host_info = HostInfo(
+        host_info = HostRecord(
             product=product_info["product"],
             vendor=product_info["vendor"],
             query=query,
@@ -544,23 +823,19 @@ class GrinderCore:
             lat=current_host.get("location").get("latitude"),
             lng=current_host.get("location").get("longitude"),
             country=current_host.get("location").get("country_name"),
-            vulnerabilities=dict(
-                shodan_vulnerabilities=current_host.get("vulns") or {},
-                vulners_vulnerabilities={},
-            ),
-            nmap_scan={},
-            scripts=dict(py_script=None, nse_script=None),
         )
-        shodan_result_as_dict = dict(host_info._asdict())
-        if not self.__is_host_existed(shodan_result_as_dict.get("ip")):
-            self.shodan_processed_results.update(
-                {shodan_result_as_dict.get("ip"): shodan_result_as_dict}
+        # Scan sub-records are allocated only when they are not empty
+        if current_host.get("vulns"):
+            host_info["vulnerabilities"] = dict(
+                shodan_vulnerabilities=current_host.get("vulns"),
+                vulners_vulnerabilities={},
             )
+        return host_info
 
     @exception_handler(expected_exception=GrinderCoreHostCensysResultsError)
     def __parse_current_host_censys_results(
         self, current_host: dict, query: str, product_info: dict
-    ) -> None:
+    ) -> dict or None:
         """
         Parse raw results from censys. Results were received from
         CensysConnector module.
@@ -568,11 +843,11 @@ class GrinderCore:
         :param current_host (dict): current host information
         :param query (str): current active query on which we found this host
         :param product_info (dict): information about current product
-        :return None:
+        :return dict: processed host information
         """
         if not (current_host.get("lat") and current_host.get("lng")):
             return
-        host_info = HostInfo(
+        return HostRecord(
             product=product_info["product"],
             vendor=product_info["vendor"],
             query=query,
@@ -582,124 +857,114 @@ class GrinderCore:
             lat=current_host.get("lat"),
             lng=current_host.get("lng"),
             country=current_host.get("country"),
-            vulnerabilities=dict(shodan_vulnerabilities={}, vulners_vulnerabilities={}),
-            nmap_scan={},
-            scripts=dict(py_script=None, nse_script=None),
         )
-        censys_result_as_dict = dict(host_info._asdict())
-        if not self.__is_host_existed(censys_result_as_dict.get("ip")):
-            self.censys_processed_results.update(
-                {censys_result_as_dict.get("ip"): censys_result_as_dict}
-            )
 
-    @exception_handler(expected_exception=GrinderCoreInitDatabaseCallError)
-    def __init_database(self) -> None:
+    def __merge_shodan_results(self, hosts: list, query_output: str = "") -> None:
         """
-        Initialize database in case of first-time using. Here we are create
-        database and put basic structures in it.
+        Add processed Shodan hosts to results. First seen
+        host always wins, like in sequential search. Output
+        of query worker is printed here, in queries order.
 
+        :param hosts (list): processed hosts of one query
+        :param query_output (str): collected output of query worker
         :return None:
         """
-        self.db.create_db()
-        self.db.initiate_scan()
+        print(query_output, end="")
+        for host in hosts:
+            if not self.__is_host_existed(host.get("ip")):
+                self.shodan_processed_results.update({host.get("ip"): host})
 
-    @exception_handler(expected_exception=GrinderCoreCloseDatabaseError)
-    def __close_database(self) -> None:
+    def __merge_censys_results(self, hosts: list, query_output: str = "") -> None:
         """
-        Close current database after use
+        Add processed Censys hosts to results. First seen
+        host always wins, like in sequential search. Output
+        of query worker is printed here, in queries order.
 
+        :param hosts (list): processed hosts of one query
+        :param query_output (str): collected output of query worker
         :return None:
         """
-        self.db.close()
+        print(query_output, end="")
+        for host in hosts:
+            if not self.__is_host_existed(host.get("ip")):
+                self.censys_processed_results.update({host.get("ip"): host})
 
-    @exception_handler(expected_exception=GrinderCoreUpdateEndTimeDatabaseError)
-    def __update_end_time_database(self) -> None:
+    @exception_handler(expected_exception=GrinderCoreInitDatabaseCallError)
+    def __init_database(self) -> None:
         """
-        Update time when we finish scan
+        Initialize database in case of first-time using. Here we are create
+        database and put basic structures in it.
 
         :return None:
         """
-        self.db.update_end_time()
+        self.db.create_db()
+        self.db.initiate_scan()
 
-    @exception_handler(expected_exception=GrinderCoreUpdateResultsCountDatabaseError)
-    def __update_results_count(self, total_products: int, total_results: int) -> None:
+    @exception_handler(expected_exception=GrinderCoreCloseDatabaseError)
+    def __close_database(self) -> None:
         """
-        Update all results counters when we finish scan
+        Close current database after use
 
-        :param total_products (int): quantity of all products
-        :param total_results (int): quantity of all results
         :return None:
         """
-        self.db.update_results_count(total_products, total_results)
+        self.db.close()
 
     @exception_handler(expected_exception=GrinderCoreAddProductDataToDatabaseError)
     def __add_product_data_to_database(self, product_info) -> None:
         """
-        Add basic information from json file with queries into database.
+        Mark product as processed, so basic information from json file
+        with queries will be saved into database with all the results.
 
         :return None:
         """
-        self.db.add_basic_scan_data(
-            vendor=product_info.get("vendor"),
-            product=product_info.get("product"),
-            script=product_info.get("script"),
-            vendor_confidence=product_info.get("vendor_confidence"),
-        )
-
-    @exception_handler(expected_exception=GrinderCoreShodanSaveToDatabaseError)
-    def __shodan_save_to_database(self, query: dict) -> None:
-        """
-        Save current query-based results to database
+        self.database_products.append(product_info)
 
-        :param query (str): current search query
-        :return None:
+    @staticmethod
+    def __group_results_by_query(results: dict) -> dict:
         """
-        results_by_query = list(
-            filter(
-                lambda host: host.get("query") == query.get("query"),
-                self.shodan_processed_results.values(),
-            )
-        )
-        results_count = len(results_by_query) if results_by_query else None
-        self.db.add_shodan_scan_data(
-            query=query, results_count=results_count, results=results_by_query
-        )
+        Group hosts by queries they were found with
 
-    @exception_handler(expected_exception=GrinderCoreCensysSaveToDatabaseError)
-    def __censys_save_to_database(self, query: dict) -> None:
+        :param results (dict): processed results {ip: host}
+        :return dict: {query: [hosts]}
         """
-        Save current query-based results to database
-
-        :param query (str): current search query
-        :return None:
-        """
-        results_by_query = list(
-            filter(
-                lambda host: host.get("query") == query.get("query"),
-                self.censys_processed_results.values(),
-            )
-        )
-        results_count = len(results_by_query) if results_by_query else None
-        self.db.add_censys_scan_data(
-            query=query, results_count=results_count, results=results_by_query
-        )
+        results_by_query: dict = {}
+        for host in results.values():
+            results_by_query.setdefault(host.get("query"), []).append(host)
+        return results_by_query
 
     @exception_handler(expected_exception=GrinderCoreSaveResultsToDatabaseError)
     def save_results_to_database(self):
         """
-        Save all results to database
+        Save all results to database in one transaction
 
         :return None:
         """
         cprint("Save all results to database...", "blue", attrs=["bold"])
-        for product_info in self.queries_file:
-            for query in product_info.get("shodan_queries"):
-                self.__shodan_save_to_database(query)
-            for query in product_info.get("censys_queries"):
-                self.__censys_save_to_database(query)
+        shodan_by_query = self.__group_results_by_query(self.shodan_processed_results)
+        censys_by_query = self.__group_results_by_query(self.censys_processed_results)
+        processed_products = {id(product) for product in self.database_products}
 
-        self.__update_end_time_database()
-        self.__update_results_count(
+        products = []
+        for product_info in self.queries_file:
+            products.append(
+                dict(
+                    vendor=product_info.get("vendor"),
+                    product=product_info.get("product"),
+                    script=product_info.get("script"),
+                    vendor_confidence=product_info.get("vendor_confidence"),
+                    is_processed=id(product_info) in processed_products,
+                    shodan=[
+                        (query, shodan_by_query.get(query.get("query"), []))
+                        for query in product_info.get("shodan_queries")
+                    ],
+                    censys=[
+                        (query, censys_by_query.get(query.get("query"), []))
+                        for query in product_info.get("censys_queries")
+                    ],
+                )
+            )
+        self.db.add_scan_results(
+            products,
             total_products=len(self.queries_file),
             total_results=len(self.combined_results),
         )
@@ -739,44 +1004,113 @@ class GrinderCore:
             return True
         return False
 
+    @timer
+    @exception_handler(expected_exception=GrinderCoreSearchError)
+    def __collect_shodan_query_results(self, query: str, product_info: dict) -> list:
+        """
+        Stream raw results of current Shodan query straight into
+        the parser, so every raw banner can be dropped as soon as
+        it was converted to host information.
+
+        :param query (str): current search query
+        :param product_info (dict): information about current product
+        :return list: processed hosts
+        """
+        cprint(f"Current Shodan query is: {query}", "blue", attrs=["bold"])
+        hosts: list = []
+        for current_host in self.shodan_search_iter(query):
+            host = self.__parse_current_host_shodan_results(
+                current_host, query, product_info
+            )
+            if host:
+                hosts.append(host)
+        return hosts
+
+    @exception_handler(expected_exception=GrinderCoreSearchError)
+    def __collect_censys_query_results(self, query: str, product_info: dict) -> list:
+        """
+        Search with current Censys query and parse results
+
+        :param query (str): current search query
+        :param product_info (dict): information about current product
+        :return list: processed hosts
+        """
+        cprint(f"Current Censys query is: {query}", "blue", attrs=["bold"])
+        hosts: list = []
+        for current_host in self.censys_search(query):
+            host = self.__parse_current_host_censys_results(
+                current_host, query, product_info
+            )
+            if host:
+                hosts.append(host)
+        return hosts
+
+    @exception_handler(expected_exception=GrinderCoreProductQueriesError)
+    def __submit_current_product_queries(
+        self,
+        product_info: dict,
+        shodan_pool: ThreadPoolExecutor,
+        censys_pool: ThreadPoolExecutor,
+        output: ThreadOutput,
+    ) -> tuple:
+        """
+        Submit all queries of current product to the search pools.
+        Every backend got its own pool, so concurrency is limited
+        separately for Shodan and Censys. Output of every query
+        is collected and printed later, when results are merged.
+
+        :param product_info (dict): all information about current product
+            including queries, vendor, confidence etc.
+        :param shodan_pool (ThreadPoolExecutor): pool for Shodan queries
+        :param censys_pool (ThreadPoolExecutor): pool for Censys queries
+        :param output (ThreadOutput): collector of query workers output
+        :return tuple: lists of Shodan and Censys futures in queries order
+        """
+        shodan_futures = [
+            shodan_pool.submit(
+                output.collect,
+                self.__collect_shodan_query_results,
+                query_info.get("query"),
+                product_info,
+            )
+            for query_info in product_info.get("shodan_queries")
+            if self.__is_query_confidence_valid(query_info.get("query_confidence"))
+        ]
+        censys_futures = [
+            censys_pool.submit(
+                output.collect,
+                self.__collect_censys_query_results,
+                query_info.get("query"),
+                product_info,
+            )
+            for query_info in product_info.get("censys_queries")
+            if self.__is_query_confidence_valid(query_info.get("query_confidence"))
+        ]
+        return shodan_futures, censys_futures
+
     @exception_handler(expected_exception=GrinderCoreProductQueriesError)
-    def __process_current_product_queries(self, product_info: dict) -> None:
+    def __process_current_product_queries(
+        self, product_info: dict, shodan_futures: list, censys_futures: list
+    ) -> None:
         """
         Process current product information from input json file with
-        queries and other information. This is the basic wrapper for all
-        searches in different backend systems - in this function we
-        adds information about product in database, search hosts
-        with queries and parse them after that.
+        queries and other information. Here we adds information about
+        product in database and merge results of all product queries.
+        Results are merged strictly in queries order, so results are
+        the same as in case of sequential search.
 
         :param product_info (dict): all information about current product 
             including queries, vendor, confidence etc.
+        :param shodan_futures (list): futures of Shodan queries
+        :param censys_futures (list): futures of Censys queries
         :return None:
         """
         self.__add_product_data_to_database(product_info)
 
-        # Shodan queries processor
-        for query_info in product_info.get("shodan_queries"):
-            if not self.__is_query_confidence_valid(query_info.get("query_confidence")):
-                continue
-            query = query_info.get("query")
-            cprint(f"Current Shodan query is: {query}", "blue", attrs=["bold"])
-            shodan_raw_results = self.shodan_search(query)
-            for current_host in shodan_raw_results:
-                self.__parse_current_host_shodan_results(
-                    current_host, query, product_info
-                )
-
-        # Censys queries processor
-        for query_info in product_info.get("censys_queries"):
-            if not self.__is_query_confidence_valid(query_info.get("query_confidence")):
-                continue
-            query = query_info.get("query")
-            cprint(f"Current Censys query is: {query}", "blue", attrs=["bold"])
-            censys_raw_results = self.censys_search(query)
-            for current_host in censys_raw_results:
-                self.__parse_current_host_censys_results(
-                    current_host, query, product_info
-                )
+        for future in shodan_futures:
+            self.__merge_shodan_results(*future.result())
+        for future in censys_futures:
+            self.__merge_censys_results(*future.result())
 
         # Merge all search results into one dictionary
         # This dictionary looks like:
@@ -795,7 +1129,32 @@ class GrinderCore:
         }
 
     @exception_handler(expected_exception=GrinderCoreTlsScanner)
-    def tls_scan(self, scanner_path):
+    def tls_scan(
+        self,
+        scanner_path: str = None,
+        workers: int = DefaultTlsScannerValues.TLS_SCANNER_WORKERS,
+        threads_budget: int = DefaultTlsScannerValues.TLS_SCANNER_THREADS_BUDGET,
+        service: bool = DefaultTlsScannerValues.TLS_SCANNER_SERVICE,
+        stratify_by: str = DefaultTlsScannerValues.PRODUCT_STRATIFY_BY,
+        ping_workers: int = DefaultTlsScannerValues.PING_WORKERS,
+        ping_method: str = DefaultTlsScannerValues.PING_METHOD,
+        detect_method: str = DefaultTlsScannerValues.TLS_DETECTION_METHOD,
+        decode_certificates: bool = DefaultTlsProberValues.DECODE_CERTIFICATES,
+    ):
+        """
+        Initiate TLS configuration scanning with TLS-Scanner
+
+        :param scanner_path (str): path to TLS-Scanner jar file
+        :param workers (int): number of TLS-Scanner processes in parallel
+        :param threads_budget (int): total number of TLS-Scanner threads
+        :param service (bool): run hosts on long-lived TLS-Scanner JVM services
+        :param stratify_by (str): take hosts of every product evenly by "country" or "port"
+        :param ping_workers (int): number of host groups pinged in parallel
+        :param ping_method (str): "nmap" pingscan or unprivileged "tcp" connect probe
+        :param detect_method (str): detect TLS ports with "nmap" or with TLS handshake "probe"
+        :param decode_certificates (bool): decode certificates of probed hosts with private CPython API
+        :return None:
+        """
         cprint("Start TLS scanning", "blue", attrs=["bold"])
         if not self.combined_results:
             if not self.shodan_processed_results:
@@ -814,7 +1173,11 @@ class GrinderCore:
             cprint(
                 "Checking for currently online and alive hosts", "blue", attrs=["bold"]
             )
-            tls_scanner.sort_alive_hosts()
+            tls_scanner.sort_alive_hosts(
+                stratify_by=stratify_by,
+                ping_workers=ping_workers,
+                ping_method=ping_method,
+            )
         except Exception as sort_alive_hosts_err:
             print(
                 f"Error at TLS scanner sort alive hosts method: {sort_alive_hosts_err}"
@@ -826,7 +1189,9 @@ class GrinderCore:
                 "blue",
                 attrs=["bold"],
             )
-            tls_scanner.detect_tls_ports()
+            tls_scanner.detect_tls_ports(
+                detect_method=detect_method, decode_certificates=decode_certificates
+            )
         except Exception as detect_tls_ports_err:
             print(f"Error at detecting of TLS ports method: {detect_tls_ports_err}")
             return
@@ -843,9 +1208,16 @@ class GrinderCore:
         try:
             cprint("Run TLS-Scanner", "blue", attrs=["bold"])
             if scanner_path:
-                tls_scanner.start_tls_scan(scanner_path=scanner_path)
+                tls_scanner.start_tls_scan(
+                    scanner_path=scanner_path,
+                    workers=workers,
+                    threads_budget=threads_budget,
+                    service=service,
+                )
             else:
-                tls_scanner.start_tls_scan()
+                tls_scanner.start_tls_scan(
+                    workers=workers, threads_budget=threads_budget, service=service
+                )
         except Exception as tls_scan_err:
             print(f"Error at TLS scanning: {tls_scan_err}")
             return
@@ -856,6 +1228,20 @@ class GrinderCore:
             print(f"Error at TLS results parsing: {parse_tls_results_err}")
             return
 
+    @staticmethod
+    def __get_nmap_task_timeout(host_timeout: int) -> int:
+        """
+        Get wall-clock timeout for one Nmap task. Nmap stops
+        scanning by itself after host timeout, so here we need
+        some additional time to finish the scripts, etc.
+
+        :param host_timeout (int): Nmap host timeout in seconds
+        :return int: task timeout in seconds
+        """
+        if not host_timeout:
+            return DefaultProcessManagerValues.TASK_TIMEOUT
+        return int(host_timeout) * 2 + 60
+
     @exception_handler(expected_exception=GrinderCoreNmapScanError)
     def nmap_scan(
         self,
@@ -865,6 +1251,8 @@ class GrinderCore:
         host_timeout: int = DefaultNmapScanValues.HOST_TIMEOUT,
         arguments: str = DefaultNmapScanValues.ARGUMENTS,
         workers: int = DefaultNmapScanValues.WORKERS,
+        group_size: int = DefaultNmapScanValues.GROUP_SIZE,
+        resume: bool = False,
     ):
         """
         Initiate Nmap scan on hosts
@@ -874,10 +1262,14 @@ class GrinderCore:
         :param sudo (bool): sudo if needed
         :param arguments (str): Nmap arguments
         :param workers (int): number of Nmap workers
+        :param group_size (int): number of hosts to scan with one Nmap run
+        :param resume (bool): skip hosts that were already scanned before
+            interruption of previous scan
         :return None:
         """
         cprint("Start Nmap scanning", "blue", attrs=["bold"])
         cprint(f"Number of workers: {workers}", "blue", attrs=["bold"])
+        cprint(f"Hosts per Nmap run: {group_size}", "blue", attrs=["bold"])
 
         # Check for top-ports if defined
         if top_ports:
@@ -908,6 +1300,11 @@ class GrinderCore:
             sudo=sudo,
             arguments=arguments,
             workers=workers,
+            group_size=group_size,
+            task_timeout=self.__get_nmap_task_timeout(host_timeout),
+            checkpoint=NmapScanCheckpoint(
+                name=DefaultScanCheckpointValues.NMAP_SCAN_NAME, resume=resume
+            ),
         )
         nmap_scan.start()
         nmap_results = nmap_scan.get_results()
@@ -926,9 +1323,12 @@ class GrinderCore:
         workers: int = DefaultVulnersScanValues.WORKERS,
         host_timeout: int = DefaultVulnersScanValues.HOST_TIMEOUT,
         vulners_path: str = DefaultVulnersScanValues.VULNERS_SCRIPT_PATH,
+        group_size: int = DefaultVulnersScanValues.GROUP_SIZE,
+        resume: bool = False,
     ):
         cprint("Start Vulners API scanning", "blue", attrs=["bold"])
         cprint(f"Number of workers: {workers}", "blue", attrs=["bold"])
+        cprint(f"Hosts per Nmap run: {group_size}", "blue", attrs=["bold"])
         if not self.shodan_processed_results:
             self.shodan_processed_results = self.db.load_last_shodan_results()
         if not self.censys_processed_results:
@@ -959,6 +1359,11 @@ class GrinderCore:
             sudo=sudo,
             arguments=arguments,
             workers=workers,
+            group_size=group_size,
+            task_timeout=self.__get_nmap_task_timeout(host_timeout),
+            checkpoint=NmapScanCheckpoint(
+                name=DefaultScanCheckpointValues.VULNERS_SCAN_NAME, resume=resume
+            ),
         )
         vulners_scan.start()
 
@@ -1193,7 +1598,45 @@ class GrinderCore:
             return self.combined_results
         self.__init_database()
 
-        for product_info in self.queries_file:
-            self.__process_current_product_queries(product_info)
+        cprint(
+            f"Search workers: Shodan - {self.shodan_workers}, Censys - {self.censys_workers}",
+            "blue",
+            attrs=["bold"],
+        )
+        shodan_pool = ThreadPoolExecutor(max_workers=self.shodan_workers)
+        censys_pool = ThreadPoolExecutor(max_workers=self.censys_workers)
+        products_futures: list = []
+        try:
+            with ThreadOutput() as output:
+                for product_info in self.queries_file:
+                    products_futures.append(
+                        (
+                            product_info,
+                            *self.__submit_current_product_queries(
+                                product_info, shodan_pool, censys_pool, output
+                            ),
+                        )
+                    )
+                for product_info, shodan_futures, censys_futures in products_futures:
+                    self.__process_current_product_queries(
+                        product_info, shodan_futures, censys_futures
+                    )
+        except BaseException:
+            # Do not wait for queued API calls on abort: cancel everything
+            # that was not started yet (no cancel_futures= on Python 3.7)
+            for _, shodan_futures, censys_futures in products_futures:
+                for future in [*shodan_futures, *censys_futures]:
+                    future.cancel()
+            shodan_pool.shutdown(wait=False)
+            censys_pool.shutdown(wait=False)
+            raise
+        shodan_pool.shutdown(wait=True)
+        censys_pool.shutdown(wait=True)
+        cprint(
+            f"API throughput: Shodan - {round(SearchRateLimiters.SHODAN.get_throughput(), 2)} req/s, "
+            f"Censys - {round(SearchRateLimiters.CENSYS.get_throughput(), 2)} req/s",
+            "blue",
+            attrs=["bold"],
+        )
 
         return self.combined_results
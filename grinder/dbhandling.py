@@ -17,7 +17,26 @@ from grinder.errors import (
     GrinderDatabaseLoadResultsError,
     GrinderDatabaseUpdateResultsCountError,
     GrinderDatabaseAddBasicScanDataError,
+    GrinderDatabaseMigrateResultsError,
+    GrinderDatabaseFilterHostsError,
+    GrinderDatabaseCountHostsError,
+    GrinderDatabaseAddScanResultsError,
+    GrinderDatabaseDiffScansError,
 )
+from grinder.hostrecord import HostRecord, to_serializable
+
+# Host fields that are saved in separate indexed columns
+HOSTS_COLUMNS = [
+    "ip",
+    "port",
+    "proto",
+    "product",
+    "vendor",
+    "query",
+    "country",
+    "lat",
+    "lng",
+]
 
 
 class GrinderDatabase:
@@ -25,7 +44,15 @@ class GrinderDatabase:
     def __init__(self):
         self.connection = sqlite3.connect(DefaultDatabaseValues.DB_NAME)
         self.connection.execute("PRAGMA foreign_keys = ON")
+        # One fsync per transaction commit is enough for scan results
+        self.connection.execute(
+            f"PRAGMA journal_mode = {DefaultDatabaseValues.JOURNAL_MODE}"
+        )
+        self.connection.execute(
+            f"PRAGMA synchronous = {DefaultDatabaseValues.SYNCHRONOUS}"
+        )
 
+        self.scan_id = None
         self.scan_date = None
         self.scan_start_time = None
         self.scan_end_time = None
@@ -97,6 +124,208 @@ class GrinderDatabase:
                 )
                 """
             )
+            db_connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS
+                hosts(
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scan_information_id INTEGER,
+                    source TEXT,
+                    results_id INTEGER,
+                    ip TEXT,
+                    port TEXT,
+                    proto TEXT,
+                    product TEXT,
+                    vendor TEXT,
+                    query TEXT,
+                    country TEXT,
+                    lat TEXT,
+                    lng TEXT,
+                    data TEXT,
+
+                    FOREIGN KEY (scan_information_id) REFERENCES scan_information(id)
+                )
+                """
+            )
+            for column in [
+                "scan_information_id",
+                "ip",
+                "product",
+                "vendor",
+                "port",
+                "country",
+            ]:
+                db_connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS hosts_{column} ON hosts({column})"
+                )
+            db_connection.execute(
+                """
+                CREATE INDEX IF NOT EXISTS
+                hosts_scan_host ON hosts(scan_information_id, ip, port, product)
+                """
+            )
+            db_connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS
+                host_history(
+                    ip TEXT NOT NULL,
+                    port TEXT NOT NULL,
+                    product TEXT NOT NULL,
+                    first_seen TEXT,
+                    last_seen TEXT,
+                    first_scan_id INTEGER,
+                    last_scan_id INTEGER,
+                    scans_count INTEGER,
+
+                    PRIMARY KEY (ip, port, product)
+                )
+                """
+            )
+            db_connection.execute(
+                """
+                CREATE INDEX IF NOT EXISTS
+                host_history_last_scan_id ON host_history(last_scan_id)
+                """
+            )
+        self.migrate_results()
+        self.migrate_history()
+
+    @staticmethod
+    def _make_hosts_rows(
+        scan_information_id: int, source: str, results_id: int, results: list
+    ) -> list:
+        """
+        Make rows for hosts table from list of hosts
+
+        :param scan_information_id (int): id of scan
+        :param source (str): "shodan" or "censys"
+        :param results_id (int): id of query results row
+        :param results (list): list of hosts
+        :return list: rows for hosts table
+        """
+        return [
+            (
+                scan_information_id,
+                source,
+                results_id,
+                *[
+                    str(host.get(column)) if host.get(column) is not None else None
+                    for column in HOSTS_COLUMNS
+                ],
+                json_dumps(host, default=to_serializable),
+            )
+            for host in results or []
+        ]
+
+    @staticmethod
+    def _insert_hosts(db_connection: sqlite3.Connection, rows: list) -> None:
+        db_connection.executemany(
+            f"""
+            INSERT INTO
+            hosts(
+                scan_information_id,
+                source,
+                results_id,
+                {", ".join(HOSTS_COLUMNS)},
+                data
+            ) VALUES ({", ".join(["?"] * (len(HOSTS_COLUMNS) + 4))})
+            """,
+            rows,
+        )
+
+    @exception_handler(expected_exception=GrinderDatabaseMigrateResultsError)
+    def migrate_results(self) -> None:
+        """
+        Move hosts from json blobs of old "shodan_results" and
+        "censys_results" rows to "hosts" table. Migrated blobs
+        are cleared, so every blob is migrated only once.
+
+        :return None:
+        """
+        with self.connection as db_connection:
+            for source in ["shodan", "censys"]:
+                blobs = db_connection.execute(
+                    f"""
+                    SELECT id, scan_information_id, results FROM {source}_results
+                    WHERE results IS NOT NULL AND results != '[]'
+                    """
+                ).fetchall()
+                for results_id, scan_information_id, results in blobs:
+                    self._insert_hosts(
+                        db_connection,
+                        self._make_hosts_rows(
+                            scan_information_id,
+                            source,
+                            results_id,
+                            json_loads(results),
+                        ),
+                    )
+                db_connection.execute(
+                    f"""
+                    UPDATE {source}_results SET results = NULL
+                    WHERE results IS NOT NULL
+                    """
+                )
+
+    @exception_handler(expected_exception=GrinderDatabaseMigrateResultsError)
+    def migrate_history(self) -> None:
+        """
+        Build host history from all the saved scans, if
+        history is empty (database from older version)
+
+        :return None:
+        """
+        with self.connection as db_connection:
+            if db_connection.execute("SELECT 1 FROM host_history LIMIT 1").fetchone():
+                return
+            for (scan_id,) in db_connection.execute(
+                "SELECT DISTINCT scan_information_id FROM hosts ORDER BY 1"
+            ).fetchall():
+                self._update_host_history(db_connection, scan_id)
+
+    @staticmethod
+    def _update_host_history(db_connection: sqlite3.Connection, scan_id: int) -> None:
+        """
+        Update first and last appearance of every (ip, port, product)
+        of scan. Scans must be added in order of their ids.
+
+        :param db_connection (sqlite3.Connection): database connection
+        :param scan_id (int): id of scan
+        :return None:
+        """
+        db_connection.execute(
+            """
+            INSERT INTO
+            host_history(
+                ip,
+                port,
+                product,
+                first_seen,
+                last_seen,
+                first_scan_id,
+                last_scan_id,
+                scans_count
+            )
+            SELECT DISTINCT
+                ifnull(hosts.ip, ''),
+                ifnull(hosts.port, ''),
+                ifnull(hosts.product, ''),
+                scan_information.scan_date,
+                scan_information.scan_date,
+                scan_information.id,
+                scan_information.id,
+                1
+            FROM hosts JOIN scan_information
+                ON scan_information.id = hosts.scan_information_id
+            WHERE hosts.scan_information_id = ?
+            ON CONFLICT(ip, port, product) DO UPDATE SET
+                last_seen = excluded.last_seen,
+                last_scan_id = excluded.last_scan_id,
+                scans_count = scans_count + 1
+            WHERE last_scan_id < excluded.last_scan_id
+            """,
+            (scan_id,),
+        )
 
     @exception_handler(expected_exception=GrinderDatabaseInitialScanError)
     def initiate_scan(self) -> None:
@@ -104,7 +333,7 @@ class GrinderDatabase:
         self.scan_start_time = datetime.now()
 
         with self.connection as db_connection:
-            db_connection.execute(
+            self.scan_id = db_connection.execute(
                 """
                 INSERT OR REPLACE INTO
                 scan_information(
@@ -116,18 +345,30 @@ class GrinderDatabase:
                     str(self.scan_date),
                     str(self.scan_start_time.time().strftime("%H:%M:%S")),
                 ),
-            )
+            ).lastrowid
+
+    def _get_current_scan_id(self, db_connection: sqlite3.Connection) -> int:
+        """
+        Get id of current scan, it is known after scan was
+        initiated, otherwise the last scan is used
+
+        :param db_connection (sqlite3.Connection): database connection
+        :return int: id of current scan
+        """
+        if self.scan_id is not None:
+            return self.scan_id
+        return db_connection.execute(
+            """
+            SELECT max(id) FROM scan_information
+            """
+        ).fetchone()[0]
 
     @exception_handler(expected_exception=GrinderDatabaseUpdateTimeError)
     def update_end_time(self) -> None:
         self.scan_end_time = datetime.now()
         self.scan_duration = self.scan_end_time - self.scan_start_time
         with self.connection as db_connection:
-            current_scan_id = db_connection.execute(
-                """
-                SELECT max(id) FROM scan_information
-                """
-            ).fetchone()[0]
+            current_scan_id = self._get_current_scan_id(db_connection)
             db_connection.execute(
                 """
                 UPDATE scan_information
@@ -145,11 +386,7 @@ class GrinderDatabase:
     @exception_handler(expected_exception=GrinderDatabaseUpdateResultsCountError)
     def update_results_count(self, total_products: int, total_results: int) -> None:
         with self.connection as db_connection:
-            current_scan_id = db_connection.execute(
-                """
-                SELECT max(id) FROM scan_information
-                """
-            ).fetchone()[0]
+            current_scan_id = self._get_current_scan_id(db_connection)
             db_connection.execute(
                 """
                 UPDATE scan_information
@@ -163,14 +400,10 @@ class GrinderDatabase:
     @exception_handler(expected_exception=GrinderDatabaseAddBasicScanDataError)
     def add_basic_scan_data(
         self, vendor: str, product: str, script: str, vendor_confidence: str
-    ) -> None:
+    ) -> int:
         with self.connection as db_connection:
-            current_scan_id = db_connection.execute(
-                """
-                SELECT max(id) FROM scan_information
-                """
-            ).fetchone()[0]
-            db_connection.execute(
+            current_scan_id = self._get_current_scan_id(db_connection)
+            return db_connection.execute(
                 """
                 INSERT OR REPLACE INTO
                 scan_data(
@@ -182,24 +415,20 @@ class GrinderDatabase:
                 ) VALUES (?, ?, ?, ?, ?)
                 """,
                 (current_scan_id, vendor, product, script, vendor_confidence),
-            )
+            ).lastrowid
 
     @exception_handler(expected_exception=GrinderDatabaseAddScanDataError)
     def add_shodan_scan_data(
-        self, query: str, results_count: int, results: dict
+        self, query: str, results_count: int, results: dict, scan_data_id: int = None
     ) -> None:
         with self.connection as db_connection:
-            current_scan_id = db_connection.execute(
-                """
-                SELECT max(id) FROM scan_information
-                """
-            ).fetchone()[0]
-            current_scan_data_id = db_connection.execute(
+            current_scan_id = self._get_current_scan_id(db_connection)
+            current_scan_data_id = scan_data_id or db_connection.execute(
                 """
                 SELECT max(id) FROM scan_data
                 """
             ).fetchone()[0]
-            db_connection.execute(
+            query_results = db_connection.execute(
                 """
                 INSERT OR REPLACE INTO
                 shodan_results(
@@ -207,9 +436,8 @@ class GrinderDatabase:
                     scan_information_id,
                     query,
                     query_confidence,
-                    results_count,
-                    results
-                ) VALUES (?, ?, ?, ?, ?, ?)
+                    results_count
+                ) VALUES (?, ?, ?, ?, ?)
                 """,
                 (
                     current_scan_data_id,
@@ -217,26 +445,28 @@ class GrinderDatabase:
                     query.get("query"),
                     query.get("query_confidence"),
                     results_count,
-                    json_dumps(results),
                 ),
             )
+            self._insert_hosts(
+                db_connection,
+                self._make_hosts_rows(
+                    current_scan_id, "shodan", query_results.lastrowid, results
+                ),
+            )
+            self._update_host_history(db_connection, current_scan_id)
 
     @exception_handler(expected_exception=GrinderDatabaseAddScanDataError)
     def add_censys_scan_data(
-        self, query: str, results_count: int, results: dict
+        self, query: str, results_count: int, results: dict, scan_data_id: int = None
     ) -> None:
         with self.connection as db_connection:
-            current_scan_id = db_connection.execute(
-                """
-                SELECT max(id) FROM scan_information
-                """
-            ).fetchone()[0]
-            current_scan_data_id = db_connection.execute(
+            current_scan_id = self._get_current_scan_id(db_connection)
+            current_scan_data_id = scan_data_id or db_connection.execute(
                 """
                 SELECT max(id) FROM scan_data
                 """
             ).fetchone()[0]
-            db_connection.execute(
+            query_results = db_connection.execute(
                 """
                 INSERT OR REPLACE INTO
                 censys_results(
@@ -244,9 +474,8 @@ class GrinderDatabase:
                     scan_information_id,
                     query,
                     query_confidence,
-                    results_count,
-                    results
-                ) VALUES (?, ?, ?, ?, ?, ?)
+                    results_count
+                ) VALUES (?, ?, ?, ?, ?)
                 """,
                 (
                     current_scan_data_id,
@@ -254,72 +483,318 @@ class GrinderDatabase:
                     query.get("query"),
                     query.get("query_confidence"),
                     results_count,
-                    json_dumps(results),
                 ),
             )
+            self._insert_hosts(
+                db_connection,
+                self._make_hosts_rows(
+                    current_scan_id, "censys", query_results.lastrowid, results
+                ),
+            )
+            self._update_host_history(db_connection, current_scan_id)
 
-    @exception_handler(expected_exception=GrinderDatabaseLoadResultsError)
-    def load_last_results(self):
+    @exception_handler(expected_exception=GrinderDatabaseAddScanResultsError)
+    def add_scan_results(
+        self, products: list, total_products: int, total_results: int
+    ) -> None:
+        """
+        Save all the results of current scan in one transaction: products,
+        their queries with hosts, end time and results counters. Every
+        query is linked with its own product by id of inserted row.
+
+        :param products (list): list of dictionaries with product info
+            (vendor, product, script, vendor_confidence, is_processed) and
+            "shodan"/"censys" lists of (query, results) pairs
+        :param total_products (int): quantity of all products
+        :param total_results (int): quantity of all results
+        :return None:
+        """
+        self.scan_end_time = datetime.now()
+        self.scan_duration = self.scan_end_time - self.scan_start_time
         with self.connection as db_connection:
-            sql_results = db_connection.execute(
+            current_scan_id = self._get_current_scan_id(db_connection)
+            hosts_rows = []
+            for product in products:
+                scan_data_id = None
+                if product.get("is_processed"):
+                    scan_data_id = db_connection.execute(
+                        """
+                        INSERT INTO
+                        scan_data(
+                            scan_information_id,
+                            vendor,
+                            product,
+                            script,
+                            vendor_confidence
+                        ) VALUES (?, ?, ?, ?, ?)
+                        """,
+                        (
+                            current_scan_id,
+                            product.get("vendor"),
+                            product.get("product"),
+                            product.get("script"),
+                            product.get("vendor_confidence"),
+                        ),
+                    ).lastrowid
+                for source in ["shodan", "censys"]:
+                    for query, results in product.get(source) or []:
+                        results_id = db_connection.execute(
+                            f"""
+                            INSERT INTO
+                            {source}_results(
+                                scan_data_id,
+                                scan_information_id,
+                                query,
+                                query_confidence,
+                                results_count
+                            ) VALUES (?, ?, ?, ?, ?)
+                            """,
+                            (
+                                scan_data_id,
+                                current_scan_id,
+                                query.get("query"),
+                                query.get("query_confidence"),
+                                len(results) if results else None,
+                            ),
+                        ).lastrowid
+                        hosts_rows.extend(
+                            self._make_hosts_rows(
+                                current_scan_id, source, results_id, results
+                            )
+                        )
+            self._insert_hosts(db_connection, hosts_rows)
+            self._update_host_history(db_connection, current_scan_id)
+            db_connection.execute(
                 """
-                SELECT results FROM shodan_results
-                WHERE scan_information_id = (
-                    SELECT max(id) FROM scan_information
-                    WHERE scan_total_results != 0
-                    )
-                AND results != '[]'
-                UNION SELECT results FROM censys_results
-                WHERE scan_information_id = (
+                UPDATE scan_information
+                    SET scan_end_time = ?,
+                        scan_duration = ?,
+                        scan_total_products = ?,
+                        scan_total_results = ?
+                    WHERE id = ?
+                """,
+                (
+                    str(self.scan_end_time.time().strftime("%H:%M:%S")),
+                    str(self.scan_duration),
+                    total_products,
+                    total_results,
+                    current_scan_id,
+                ),
+            )
+
+    @staticmethod
+    def _get_hosts_filter(
+        scan_id: int = None, source: str = None, **filters
+    ) -> (str, list):
+        """
+        Make WHERE clause for hosts table
+
+        :param scan_id (int): id of scan, last scan with results if not set
+        :param source (str): "shodan" or "censys", all sources if not set
+        :param filters (dict): values of host columns (ip, port, product, etc.)
+        :return tuple: WHERE clause and its parameters
+        """
+        if scan_id is None:
+            conditions = [
+                """
+                scan_information_id = (
                     SELECT max(id) FROM scan_information
                     WHERE scan_total_results != 0
-                    )
-                AND results != '[]'
+                )
                 """
-            ).fetchall()
-            results_parsed = [json_loads(item[0]) for item in sql_results]
-            results_combined = [
-                result for query_result in results_parsed for result in query_result
             ]
-            return {host.get("ip"): host for host in results_combined}
+            parameters = []
+        else:
+            conditions = ["scan_information_id = ?"]
+            parameters = [scan_id]
+        if source:
+            conditions.append("source = ?")
+            parameters.append(source)
+        for column, value in filters.items():
+            if column not in HOSTS_COLUMNS:
+                raise ValueError(f"Unknown host column: {column}")
+            if value is None:
+                continue
+            conditions.append(f"{column} = ?")
+            parameters.append(str(value))
+        return " AND ".join(conditions), parameters
+
+    def _load_hosts(self, source: str = None) -> dict:
+        """
+        Load hosts of the last scan with results
+
+        :param source (str): "shodan" or "censys", all sources if not set
+        :return dict: {ip: host}
+        """
+        where, parameters = self._get_hosts_filter(source=source)
+        with self.connection as db_connection:
+            # Censys results replace Shodan results for the same ip
+            sql_results = db_connection.execute(
+                f"""
+                SELECT data FROM hosts WHERE {where}
+                ORDER BY source = 'censys', id
+                """,
+                parameters,
+            )
+            # Same compact records as hosts loaded from results file
+            hosts = (HostRecord.from_dict(json_loads(data)) for data, in sql_results)
+            return {host.get("ip"): host for host in hosts}
+
+    @exception_handler(expected_exception=GrinderDatabaseLoadResultsError)
+    def load_last_results(self):
+        return self._load_hosts()
 
     @exception_handler(expected_exception=GrinderDatabaseLoadResultsError)
     def load_last_shodan_results(self):
+        return self._load_hosts(source="shodan")
+
+    @exception_handler(expected_exception=GrinderDatabaseLoadResultsError)
+    def load_last_censys_results(self):
+        return self._load_hosts(source="censys")
+
+    @exception_handler(expected_exception=GrinderDatabaseFilterHostsError)
+    def filter_hosts(
+        self, scan_id: int = None, source: str = None, limit: int = None, **filters
+    ) -> list:
+        """
+        Find hosts by indexed columns, for example:
+        filter_hosts(product="Apache", country="Germany")
+
+        :param scan_id (int): id of scan, last scan with results if not set
+        :param source (str): "shodan" or "censys", all sources if not set
+        :param limit (int): maximum quantity of hosts
+        :param filters (dict): values of host columns (ip, port, product, etc.)
+        :return list: list of hosts
+        """
+        where, parameters = self._get_hosts_filter(
+            scan_id=scan_id, source=source, **filters
+        )
+        sql = f"SELECT data FROM hosts WHERE {where} ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            parameters.append(limit)
         with self.connection as db_connection:
-            sql_results = db_connection.execute(
-                """
-                SELECT results FROM shodan_results
-                WHERE scan_information_id = (
-                    SELECT max(id) FROM scan_information
-                    WHERE scan_total_results != 0
-                    )
-                AND results != '[]'
-                """
-            ).fetchall()
-            results_parsed = [json_loads(item[0]) for item in sql_results]
-            results_combined = [
-                result for query_result in results_parsed for result in query_result
+            return [
+                json_loads(data) for data, in db_connection.execute(sql, parameters)
             ]
-            return {host.get("ip"): host for host in results_combined}
+
+    @exception_handler(expected_exception=GrinderDatabaseCountHostsError)
+    def count_hosts(
+        self, group_by: str, scan_id: int = None, source: str = None, **filters
+    ) -> dict:
+        """
+        Count unique hosts by some column, for example:
+        count_hosts("country", product="Apache")
+
+        :param group_by (str): host column to group by (product, country, etc.)
+        :param scan_id (int): id of scan, last scan with results if not set
+        :param source (str): "shodan" or "censys", all sources if not set
+        :param filters (dict): values of host columns (ip, port, product, etc.)
+        :return dict: {value: quantity of unique ips}, sorted by quantity
+        """
+        if group_by not in HOSTS_COLUMNS:
+            raise ValueError(f"Unknown host column: {group_by}")
+        where, parameters = self._get_hosts_filter(
+            scan_id=scan_id, source=source, **filters
+        )
+        with self.connection as db_connection:
+            return dict(
+                db_connection.execute(
+                    f"""
+                    SELECT {group_by}, count(DISTINCT ip) AS quantity FROM hosts
+                    WHERE {where}
+                    GROUP BY {group_by}
+                    ORDER BY quantity DESC
+                    """,
+                    parameters,
+                ).fetchall()
+            )
 
     @exception_handler(expected_exception=GrinderDatabaseLoadResultsError)
-    def load_last_censys_results(self):
+    def get_scans(self) -> list:
+        """
+        Get information about all the scans
+
+        :return list: list of scans with id, date and results count
+        """
         with self.connection as db_connection:
-            sql_results = db_connection.execute(
-                """
-                SELECT results FROM censys_results
-                WHERE scan_information_id = (
-                    SELECT max(id) FROM scan_information
-                    WHERE scan_total_results != 0
+            return [
+                dict(id=scan_id, date=scan_date, time=scan_time, total_results=total)
+                for scan_id, scan_date, scan_time, total in db_connection.execute(
+                    """
+                    SELECT id, scan_date, scan_start_time, scan_total_results
+                    FROM scan_information ORDER BY id
+                    """
+                )
+            ]
+
+    @exception_handler(expected_exception=GrinderDatabaseDiffScansError)
+    def diff_scans(self, old_scan_id: int, new_scan_id: int) -> dict:
+        """
+        Find hosts that appeared and disappeared between two scans.
+        Hosts are compared by (ip, port, product).
+
+        :param old_scan_id (int): id of older scan
+        :param new_scan_id (int): id of newer scan
+        :return dict: {"appeared": [hosts], "disappeared": [hosts]}
+        """
+        difference = """
+            SELECT ip, port, product FROM hosts WHERE scan_information_id = ?
+            EXCEPT
+            SELECT ip, port, product FROM hosts WHERE scan_information_id = ?
+        """
+        with self.connection as db_connection:
+            return {
+                name: [
+                    dict(ip=ip, port=port, product=product)
+                    for ip, port, product in db_connection.execute(
+                        difference + " ORDER BY ip, port, product", scan_ids
                     )
-                AND results != '[]'
-                """
-            ).fetchall()
-            results_parsed = [json_loads(item[0]) for item in sql_results]
-            results_combined = [
-                result for query_result in results_parsed for result in query_result
+                ]
+                for name, scan_ids in [
+                    ("appeared", (new_scan_id, old_scan_id)),
+                    ("disappeared", (old_scan_id, new_scan_id)),
+                ]
+            }
+
+    @exception_handler(expected_exception=GrinderDatabaseLoadResultsError)
+    def get_host_history(self, ip: str) -> list:
+        """
+        Get first and last appearance of all services of host
+
+        :param ip (str): host ip
+        :return list: history of every (port, product) of host
+        """
+        with self.connection as db_connection:
+            return [
+                dict(
+                    ip=ip,
+                    port=port,
+                    product=product,
+                    first_seen=first_seen,
+                    last_seen=last_seen,
+                    first_scan_id=first_scan_id,
+                    last_scan_id=last_scan_id,
+                    scans_count=scans_count,
+                )
+                for (
+                    port,
+                    product,
+                    first_seen,
+                    last_seen,
+                    first_scan_id,
+                    last_scan_id,
+                    scans_count,
+                ) in db_connection.execute(
+                    """
+                    SELECT port, product, first_seen, last_seen,
+                        first_scan_id, last_scan_id, scans_count
+                    FROM host_history WHERE ip = ?
+                    ORDER BY first_scan_id, port, product
+                    """,
+                    (ip,),
+                )
             ]
-            return {host.get("ip"): host for host in results_combined}
 
     @exception_handler(expected_exception=GrinderDatabaseCloseError)
     def close(self):
@@ -10,17 +10,25 @@ class DefaultValues:
     CENSYS_FREE_PLAN_RESULTS_QUANTITY: int = 1000
     SHODAN_DEFAULT_RESULTS_QUANTITY: int = 100000
 
+    SHODAN_SEARCH_WORKERS: int = 1
+    CENSYS_SEARCH_WORKERS: int = 1
+
     QUERIES_FILE: str = "queries_test.json"
     MARKERS_DIRECTORY: str = "map"
 
     RESULTS_DIRECTORY: str = "results"
     JSON_RESULTS_DIRECTORY: str = "json"
     JSON_RESULTS_FILE: str = "all_results.json"
+    NDJSON_RESULTS_FILE: str = "all_results.ndjson"
+    LOAD_CHUNK_SIZE: int = 1 << 20
     CSV_RESULTS_DIRECTORY: str = "csv"
     CSV_RESULTS_FILE: str = "all_results.csv"
     TXT_RESULTS_DIRECTORY: str = "txt"
     TXT_RESULTS_FILE: str = "all_results.txt"
 
+    COLUMNAR_RESULTS_DIRECTORY: str = "columnar"
+    COLUMNAR_RESULTS_FILE: str = "all_results.npz"
+
     CUSTOM_SCRIPTS_DIRECTORY: str = "custom_scripts"
     PY_SCRIPTS_DIRECTORY: str = "py_scripts"
     NSE_SCRIPTS_DIRECTORY: str = "nse_scripts"
@@ -34,8 +42,31 @@ class DefaultValues:
     PNG_LIMITED_RESULTS_DIRECTORY: str = "limited_results"
 
 
+class DefaultRateLimiterValues:
+    SHODAN_REQUESTS_PER_SECOND: float = 1.0
+    CENSYS_REQUESTS_PER_SECOND: float = 0.4
+    # One request in 10 minutes, slower limits look like a hang
+    MIN_REQUESTS_PER_SECOND: float = 1 / 600
+    BURST: float = 1.0
+    MAX_RETRIES: int = 5
+    BACKOFF_BASE: float = 1.0
+    BACKOFF_MAX: float = 60.0
+    THROUGHPUT_WINDOW: float = 60.0
+
+
+class DefaultSearchCacheValues:
+    CACHE_DIRECTORY: str = "cache"
+    CACHE_FILE: str = "search_cache.db"
+    TTL: int = 86400
+    MAX_SIZE_MB: int = 512
+    MODE: str = "enabled"
+
+
 class DefaultTlsParserValues:
     PARSED_RESULTS_DIR = "tls_processed_data"
+    PARSE_WORKERS = None
+    PARSE_CHUNK_SIZE = 64
+    PARALLEL_PARSE_THRESHOLD = 256
 
     FULL_RESULTS_JSON = "tls_scanner_results.json"
     UNIQUE_ATTACKS_JSON = "tls_scanner_attacks.json"
@@ -50,18 +81,48 @@ class DefaultTlsParserValues:
     UNIQUE_GROUPPED_PRODUCTS_RESULTS_CSV = "tls_scanner_groupped.csv"
 
 
+class DefaultTlsReportIndexValues:
+    INDEX_FILE = "tls_reports_index.db"
+
+
+class DefaultTcpProberValues:
+    PORTS = [443, 8443, 80, 22]
+    TIMEOUT = 3.0
+    CONCURRENCY = 500
+
+
+class DefaultTlsProberValues:
+    PORTS = [443, 8443, 4443, 9443, 10443, 465, 636, 993, 995, 5061, 8883]
+    ALPN_PROTOCOLS = ["h2", "http/1.1"]
+    TIMEOUT = 5.0
+    CONCURRENCY = 500
+    # Decoding uses private CPython API, so it is enabled explicitly
+    DECODE_CERTIFICATES = False
+
+
 class DefaultTlsScannerValues:
     PRODUCT_LIMIT = 50
+    PRODUCT_STRATIFY_BY = None
     LENGTH_OF_HOSTS_SUBGROUPS = 100
     NMAP_PING_SCAN_ARGS = "-n -sP"
+    PING_WORKERS = 1
+    PING_METHOD = "nmap"
     TLS_DETECTION_HOST_TIMEOUT = 180
     TLS_NMAP_WORKERS = 10
+    TLS_DETECTION_METHOD = "nmap"
     TLS_SCANNER_REPORT_DETAIL = "NORMAL"
     TLS_SCANNER_SCAN_DETAIL = "NORMAL"
     TLS_SCANNER_PATH = "./TLS-Scanner/apps/TLS-Scanner.jar"
     TLS_SCANNER_THREADS = 4
+    TLS_SCANNER_WORKERS = 1
+    TLS_SCANNER_THREADS_BUDGET = None
     TLS_SCANNER_RESULTS_DIR = "tls"
     TLS_SCANNER_TIMEOUT = 1200
+    TLS_SCANNER_SERVICE = False
+    TLS_SCANNER_SERVICE_DIR = "./grinder/java"
+    TLS_SCANNER_SERVICE_CLASS = "GrinderTlsScannerService"
+    TLS_SCANNER_SERVICE_END_MARKER = "<<<GRINDER_TLS_SCANNER_END>>>"
+    TLS_SCANNER_SERVICE_STOP_TIMEOUT = 10
 
 
 class DefaultVulnersScanValues:
@@ -71,6 +132,7 @@ class DefaultVulnersScanValues:
     WORKERS = 10
     HOST_TIMEOUT = 120
     VULNERS_SCRIPT_PATH = "/plugins/vulners.nse"
+    GROUP_SIZE = 1
 
 
 class DefaultNmapScanValues:
@@ -80,6 +142,7 @@ class DefaultNmapScanValues:
     HOST_TIMEOUT = 30
     ARGUMENTS = "-Pn -T4 -A"
     WORKERS = 10
+    GROUP_SIZE = 1
 
 
 class DefaultProcessManagerValues:
@@ -87,6 +150,14 @@ class DefaultProcessManagerValues:
     SUDO = False
     ARGUMENTS = "-Pn -A"
     WORKERS = 10
+    GROUP_SIZE = 1
+    TASK_TIMEOUT = 900
+
+
+class DefaultScanCheckpointValues:
+    CHECKPOINT_DIRECTORY = "checkpoints"
+    NMAP_SCAN_NAME = "nmap_scan"
+    VULNERS_SCAN_NAME = "vulners_scan"
 
 
 class DefaultPlotValues:
@@ -98,3 +169,5 @@ class DefaultPlotValues:
 
 class DefaultDatabaseValues:
     DB_NAME = "database.db"
+    JOURNAL_MODE = "WAL"
+    SYNCHRONOUS = "NORMAL"
@@ -93,6 +93,51 @@ class GrinderDatabaseException(Exception):
         return f"Error occured in Grinder Database module: {self.error_args}"
 
 
+class GrinderSearchCacheException(Exception):
+    def __init__(self, error_args: Exception):
+        super().__init__(self)
+        self.error_args = error_args
+
+    def __str__(self):
+        return f"Error occured in Grinder Search Cache module: {self.error_args}"
+
+
+class GrinderScanCheckpointException(Exception):
+    def __init__(self, error_args: Exception):
+        super().__init__(self)
+        self.error_args = error_args
+
+    def __str__(self):
+        return f"Error occured in Grinder Scan Checkpoint module: {self.error_args}"
+
+
+class GrinderTlsScannerServiceException(Exception):
+    def __init__(self, error_args: Exception):
+        super().__init__(self)
+        self.error_args = error_args
+
+    def __str__(self):
+        return f"Error occured in Grinder TLS-Scanner Service module: {self.error_args}"
+
+
+class GrinderTlsReportIndexException(Exception):
+    def __init__(self, error_args: Exception):
+        super().__init__(self)
+        self.error_args = error_args
+
+    def __str__(self):
+        return f"Error occured in Grinder TLS Report Index module: {self.error_args}"
+
+
+class GrinderColumnarResultsException(Exception):
+    def __init__(self, error_args: Exception):
+        super().__init__(self)
+        self.error_args = error_args
+
+    def __str__(self):
+        return f"Error occured in Grinder Columnar Results module: {self.error_args}"
+
+
 class GrinderScriptExecutor(Exception):
     def __init__(self, error_args: Exception):
         super().__init__(self)
@@ -242,6 +287,11 @@ class GrinderCoreLoadResultsError(GrinderCoreException):
         super().__init__(error_args)
 
 
+class GrinderCoreDiffScansError(GrinderCoreException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
 class GrinderCoreInitDatabaseCallError(GrinderCoreException):
     def __init__(self, error_args: Exception):
         super().__init__(error_args)
@@ -272,6 +322,26 @@ class GrinderCoreSetShodanMaxResultsError(GrinderCoreException):
         super().__init__(error_args)
 
 
+class GrinderCoreSetSearchWorkersError(GrinderCoreException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderCoreSetRateLimitError(GrinderCoreException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderCoreSetSearchCacheError(GrinderCoreException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderCoreSetLoadFiltersError(GrinderCoreException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
 class GrinderCoreAddProductDataToDatabaseError(GrinderCoreException):
     def __init__(self, error_args: Exception):
         super().__init__(error_args)
@@ -390,3 +460,118 @@ class GrinderDatabaseUpdateResultsCountError(GrinderDatabaseException):
 class GrinderDatabaseAddBasicScanDataError(GrinderDatabaseException):
     def __init__(self, error_args: Exception):
         super().__init__(error_args)
+
+
+class GrinderDatabaseMigrateResultsError(GrinderDatabaseException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderDatabaseFilterHostsError(GrinderDatabaseException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderDatabaseCountHostsError(GrinderDatabaseException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderDatabaseAddScanResultsError(GrinderDatabaseException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderDatabaseDiffScansError(GrinderDatabaseException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderSearchCacheOpenError(GrinderSearchCacheException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderSearchCacheGetError(GrinderSearchCacheException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderSearchCachePutError(GrinderSearchCacheException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderSearchCacheCloseError(GrinderSearchCacheException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderScanCheckpointLoadError(GrinderScanCheckpointException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderScanCheckpointAddError(GrinderScanCheckpointException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderScanCheckpointCloseError(GrinderScanCheckpointException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderTlsScannerServiceStartError(GrinderTlsScannerServiceException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderTlsScannerServiceScanError(GrinderTlsScannerServiceException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderTlsScannerServiceCloseError(GrinderTlsScannerServiceException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderTlsReportIndexOpenError(GrinderTlsReportIndexException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderTlsReportIndexGetError(GrinderTlsReportIndexException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderTlsReportIndexPutError(GrinderTlsReportIndexException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderTlsReportIndexCloseError(GrinderTlsReportIndexException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderColumnarResultsBuildError(GrinderColumnarResultsException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderColumnarResultsSaveError(GrinderColumnarResultsException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderColumnarResultsLoadError(GrinderColumnarResultsException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
+
+
+class GrinderColumnarResultsCountError(GrinderColumnarResultsException):
+    def __init__(self, error_args: Exception):
+        super().__init__(error_args)
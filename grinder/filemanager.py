@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 
-from csv import DictWriter
-from json import loads, dumps
+from csv import DictWriter, reader, writer
+from json import loads, dumps, JSONDecoder, JSONDecodeError
+from os import path
+from re import compile
+from tempfile import TemporaryFile
+from typing import Iterable, Iterator
 
 from grinder.decorators import (
     exception_handler,
@@ -10,6 +14,11 @@ from grinder.decorators import (
 )
 from grinder.defaultvalues import DefaultValues
 from grinder.errors import GrinderFileManagerOpenError
+from grinder.hostrecord import HostRecord, to_serializable
+
+# Whitespace and commas between items of JSON list
+JSON_LIST_SEPARATORS = compile(r"[\s,]*")
+JSON_LIST_ITEM_ENDS = " \t\r\n,]"
 
 
 class GrinderFileManager:
@@ -31,6 +40,148 @@ class GrinderFileManager:
         with open(f"{load_dir}/{load_json_dir}/{load_file}", mode="r") as saved_results:
             return loads(saved_results.read())
 
+    @staticmethod
+    def iter_json_list(
+        json_file, chunk_size: int = DefaultValues.LOAD_CHUNK_SIZE
+    ) -> Iterator:
+        """
+        Decode items of JSON list one by one, file is read by
+        chunks, so whole text and whole list are never in memory
+
+        :param json_file (file): opened JSON file with list
+        :param chunk_size (int): size of one read
+        :return Iterator: items of list
+        """
+        decoder = JSONDecoder()
+        buffer = ""
+        position = 0
+        list_started = False
+        end_of_file = False
+        while True:
+            position = JSON_LIST_SEPARATORS.match(buffer, position).end()
+            item_ready = position < len(buffer)
+            if item_ready and not list_started:
+                if buffer[position] != "[":
+                    raise ValueError("Results file does not contain JSON list")
+                list_started = True
+                position += 1
+                continue
+            if item_ready and buffer[position] == "]":
+                return
+            if item_ready:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                    # Number can be cut by chunk, so item is complete only
+                    # if separator or end of list is already in buffer
+                    item_ready = end_of_file or (
+                        end < len(buffer) and buffer[end] in JSON_LIST_ITEM_ENDS
+                    )
+                except JSONDecodeError:
+                    if end_of_file:
+                        raise
+                    item_ready = False
+            if item_ready:
+                position = end
+                yield item
+                continue
+            if end_of_file:
+                if list_started:
+                    raise ValueError("Results file ends in the middle of JSON list")
+                return
+            chunk = json_file.read(chunk_size)
+            end_of_file = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+    @staticmethod
+    def iter_ndjson(ndjson_file) -> Iterator:
+        """
+        Decode NDJSON file line by line
+
+        :param ndjson_file (file): opened NDJSON file
+        :return Iterator: items of file
+        """
+        for line in ndjson_file:
+            if line.strip():
+                yield loads(line)
+
+    @staticmethod
+    def get_results_file(
+        load_dir=DefaultValues.RESULTS_DIRECTORY,
+        load_json_dir=DefaultValues.JSON_RESULTS_DIRECTORY,
+    ) -> str:
+        """
+        Choose the latest saved results file: JSON list or NDJSON
+
+        :param load_dir (str): base directory with results
+        :param load_json_dir (str): directory with json results
+        :return str: name of results file
+        """
+        saved_files = [
+            results_file
+            for results_file in (
+                DefaultValues.JSON_RESULTS_FILE,
+                DefaultValues.NDJSON_RESULTS_FILE,
+            )
+            if path.exists(f"{load_dir}/{load_json_dir}/{results_file}")
+        ]
+        if not saved_files:
+            return DefaultValues.JSON_RESULTS_FILE
+        return max(
+            saved_files,
+            key=lambda results_file: path.getmtime(
+                f"{load_dir}/{load_json_dir}/{results_file}"
+            ),
+        )
+
+    @staticmethod
+    def is_host_matched(host: dict, filters: dict) -> bool:
+        """
+        Check host fields against filters, case insensitive
+
+        :param host (dict): host information
+        :param filters (dict): {field: set of lowercase values}
+        :return bool: host matches all the filters
+        """
+        return all(
+            str(host.get(field) or "").lower() in values
+            for field, values in filters.items()
+            if values
+        )
+
+    @exception_handler(expected_exception=GrinderFileManagerOpenError)
+    def load_hosts_from_file(
+        self,
+        load_dir=DefaultValues.RESULTS_DIRECTORY,
+        load_file=None,
+        load_json_dir=DefaultValues.JSON_RESULTS_DIRECTORY,
+        filters: dict = None,
+    ) -> dict:
+        """
+        Load saved hosts incrementally right into ip index.
+        JSON list and NDJSON files are supported, the latest
+        of them is loaded if file is not set.
+
+        :param load_dir (str): base directory with results
+        :param load_file (str): results filename
+        :param load_json_dir (str): directory with json results
+        :param filters (dict): load only hosts with these
+        {"vendor"/"product"/"country": set of lowercase values}
+        :return dict: {ip: host record}
+        """
+        load_file = load_file or self.get_results_file(load_dir, load_json_dir)
+        filters = filters or {}
+        with open(f"{load_dir}/{load_json_dir}/{load_file}", mode="r") as saved_results:
+            if load_file.endswith(".ndjson"):
+                hosts = self.iter_ndjson(saved_results)
+            else:
+                hosts = self.iter_json_list(saved_results)
+            return {
+                host.get("ip"): HostRecord.from_dict(host)
+                for host in hosts
+                if not filters or self.is_host_matched(host, filters)
+            }
+
     @staticmethod
     def csv_dict_fix(results_to_write: dict, field_name: str) -> list:
         dict_to_list_dictpairs: list = []
@@ -53,7 +204,9 @@ class GrinderFileManager:
         if not results_to_write:
             return
         with open(f"{dest_dir}/{json_dir}/{json_file}", mode="w") as result_json_file:
-            result_json_file.write(dumps(results_to_write, indent=4))
+            result_json_file.write(
+                dumps(results_to_write, indent=4, default=to_serializable)
+            )
 
     @exception_handler(expected_exception=GrinderFileManagerOpenError)
     @create_results_directory()
@@ -96,7 +249,107 @@ class GrinderFileManager:
                 for item in results_to_write:
                     result_txt_file.write(f"{item}\n")
             if isinstance(results_to_write, dict):
-                result_txt_file.write(dumps(results_to_write))
+                result_txt_file.write(dumps(results_to_write, default=to_serializable))
+
+    @exception_handler(expected_exception=GrinderFileManagerOpenError)
+    @create_results_directory()
+    @create_subdirectory(subdirectory=DefaultValues.JSON_RESULTS_DIRECTORY)
+    @create_subdirectory(subdirectory=DefaultValues.CSV_RESULTS_DIRECTORY)
+    @create_subdirectory(subdirectory=DefaultValues.TXT_RESULTS_DIRECTORY)
+    def write_results_all(
+        self,
+        results_to_write: Iterable,
+        dest_dir: str,
+        json_file: str = DefaultValues.JSON_RESULTS_FILE,
+        csv_file: str = DefaultValues.CSV_RESULTS_FILE,
+        txt_file: str = DefaultValues.TXT_RESULTS_FILE,
+        ndjson: bool = False,
+        ndjson_file: str = DefaultValues.NDJSON_RESULTS_FILE,
+    ) -> None:
+        """
+        Write hosts to JSON (or NDJSON), CSV and TXT files in one
+        pass over results. Every host is encoded and written
+        separately, so whole output is never kept in memory.
+        JSON file is the same as dumps(results, indent=4) makes.
+        CSV columns are union of keys of all the hosts in order of
+        appearance, so CSV rows are kept in temporary file until
+        all the columns are known.
+
+        :param results_to_write (Iterable): hosts, iterated once,
+        so generators are fine too
+        :param dest_dir (str): directory to save results
+        :param json_file (str): name of JSON file
+        :param csv_file (str): name of CSV file
+        :param txt_file (str): name of TXT file
+        :param ndjson (bool): write one host per line instead of JSON list
+        :param ndjson_file (str): name of NDJSON file
+        :return None:
+        """
+        if isinstance(results_to_write, (list, dict)) and not results_to_write:
+            return
+        json_path = (
+            f"{dest_dir}/{DefaultValues.JSON_RESULTS_DIRECTORY}/"
+            f"{ndjson_file if ndjson else json_file}"
+        )
+        with open(json_path, mode="w") as result_json_file, open(
+            f"{dest_dir}/{DefaultValues.CSV_RESULTS_DIRECTORY}/{csv_file}", mode="w"
+        ) as result_csv_file, open(
+            f"{dest_dir}/{DefaultValues.TXT_RESULTS_DIRECTORY}/{txt_file}", mode="w"
+        ) as result_txt_file, TemporaryFile(
+            mode="w+", newline=""
+        ) as csv_rows_file:
+            fieldnames: dict = {}
+            csv_rows_writer = writer(csv_rows_file)
+            separator = "\n    "
+            if not ndjson:
+                result_json_file.write("[")
+            for row in results_to_write:
+                if ndjson:
+                    result_json_file.write(dumps(row, default=to_serializable))
+                    result_json_file.write("\n")
+                else:
+                    # Strings in JSON can not contain raw newlines,
+                    # so nested indentation is shifted safely
+                    result_json_file.write(separator)
+                    result_json_file.write(
+                        dumps(row, indent=4, default=to_serializable).replace(
+                            "\n", "\n    "
+                        )
+                    )
+                    separator = ",\n    "
+                for key in row:
+                    fieldnames.setdefault(key, None)
+                csv_rows_writer.writerow(
+                    [row.get(key, "") for key in fieldnames]
+                )
+                result_txt_file.write(f"{row}\n")
+            if not ndjson:
+                # Empty list is "[]", like dumps makes it
+                result_json_file.write("]" if separator == "\n    " else "\n]")
+
+            # Rows written before new columns appeared are padded
+            csv_writer = DictWriter(result_csv_file, fieldnames=list(fieldnames))
+            csv_writer.writeheader()
+            rows_writer = writer(result_csv_file)
+            csv_rows_file.seek(0)
+            for csv_row in reader(csv_rows_file):
+                rows_writer.writerow(
+                    csv_row + [""] * (len(fieldnames) - len(csv_row))
+                )
+
+    @exception_handler(expected_exception=GrinderFileManagerOpenError)
+    @create_results_directory()
+    @create_subdirectory(subdirectory=DefaultValues.COLUMNAR_RESULTS_DIRECTORY)
+    def write_results_columnar(
+        self,
+        columnar_results,
+        dest_dir: str,
+        columnar_file: str = DefaultValues.COLUMNAR_RESULTS_FILE,
+        columnar_dir=DefaultValues.COLUMNAR_RESULTS_DIRECTORY,
+    ) -> None:
+        if not columnar_results:
+            return
+        columnar_results.save(f"{dest_dir}/{columnar_dir}/{columnar_file}")
 
     @exception_handler(expected_exception=GrinderFileManagerOpenError)
     @create_results_directory()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Compact host record for processed search results.
+Behaves like the host dictionary made from HostInfo, but
+keeps fields in slots, interns repeated strings and
+allocates scan sub-records only when they are really used.
+"""
+
+from collections.abc import MutableMapping
+from sys import intern
+
+from grinder.continents import GrinderContinents
+
+
+def _default_vulnerabilities() -> dict:
+    return dict(shodan_vulnerabilities={}, vulners_vulnerabilities={})
+
+
+def _default_nmap_scan() -> dict:
+    return {}
+
+
+def _default_scripts() -> dict:
+    return dict(py_script=None, nse_script=None)
+
+
+class HostRecord(MutableMapping):
+    """
+    Host fields in the same order as HostInfo. Scan sub-records
+    (vulnerabilities, nmap_scan, scripts) are None until first
+    item access or assignment, and additional keys (TLS status,
+    ports, etc.) are kept in separate lazily created dictionary.
+    """
+
+    BASIC_FIELDS = (
+        "product",
+        "vendor",
+        "query",
+        "port",
+        "proto",
+        "ip",
+        "lat",
+        "lng",
+        "country",
+    )
+    INTERNED_FIELDS = ("product", "vendor", "query", "proto", "country")
+    LAZY_FIELDS = {
+        "vulnerabilities": _default_vulnerabilities,
+        "nmap_scan": _default_nmap_scan,
+        "scripts": _default_scripts,
+    }
+    # Only for comparison, never given away
+    LAZY_DEFAULTS = {field: make() for field, make in LAZY_FIELDS.items()}
+    FIELDS = BASIC_FIELDS + tuple(LAZY_FIELDS)
+
+    __slots__ = BASIC_FIELDS + tuple(LAZY_FIELDS) + ("_extra",)
+
+    def __init__(self, **fields):
+        for field in self.FIELDS:
+            setattr(self, field, None)
+        self._extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, host: dict) -> "HostRecord":
+        """
+        Make record from saved host dictionary. Sub-records that
+        are equal to defaults are not allocated.
+
+        :param host (dict): host information
+        :return HostRecord: host record
+        """
+        record = cls.__new__(cls)
+        for field in cls.BASIC_FIELDS:
+            value = host.get(field)
+            if field in cls.INTERNED_FIELDS and type(value) is str:
+                value = intern(value)
+            setattr(record, field, value)
+        for field, default in cls.LAZY_DEFAULTS.items():
+            value = host.get(field)
+            setattr(record, field, None if value == default else value)
+        # Extra keys can be present even if some of basic fields are missing
+        extra = {key: value for key, value in host.items() if key not in cls.FIELDS}
+        record._extra = extra or None
+        return record
+
+    @property
+    def continent(self) -> str or None:
+        """
+        Continent of host, derived from country,
+        so it is not a key and it is never saved
+        """
+        return GrinderContinents.get_continent(self.country)
+
+    def __getitem__(self, key):
+        if key in self.LAZY_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                # Somebody wants to change sub-record, so allocate it
+                value = self.LAZY_FIELDS[key]()
+                setattr(self, key, value)
+            return value
+        if key in self.BASIC_FIELDS:
+            return getattr(self, key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value) -> None:
+        if key in self.BASIC_FIELDS or key in self.LAZY_FIELDS:
+            if key in self.INTERNED_FIELDS and type(value) is str:
+                value = intern(value)
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key) -> None:
+        if key in self.FIELDS:
+            raise KeyError(f"Basic host field {key} can not be removed")
+        if self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self):
+        yield from self.FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + len(self._extra or ())
+
+    def __contains__(self, key) -> bool:
+        return key in self.FIELDS or bool(self._extra and key in self._extra)
+
+    def get(self, key, default=None):
+        """
+        Read-only access, unlike item access it does not allocate
+        sub-records: default sub-record is returned instead
+        """
+        if key in self.LAZY_FIELDS:
+            value = getattr(self, key)
+            return value if value is not None else self.LAZY_FIELDS[key]()
+        if key in self.BASIC_FIELDS:
+            return getattr(self, key)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def items(self):
+        return self.to_dict().items()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def to_dict(self) -> dict:
+        """
+        Convert record to the same dictionary as HostInfo._asdict()
+
+        :return dict: host information
+        """
+        host = {field: self.get(field) for field in self.FIELDS}
+        if self._extra:
+            host.update(self._extra)
+        return host
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, HostRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def __getstate__(self) -> dict:
+        return self.to_dict()
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(**state)
+
+
+def to_serializable(obj):
+    """
+    Hook for json "default" argument, so host records
+    are saved exactly as host dictionaries before
+
+    :param obj (any): object that json can not serialize itself
+    :return dict: host information
+    """
+    if isinstance(obj, HostRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 
-from argparse import ArgumentParser, Namespace
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from math import isfinite
 from os import environ
 from sys import version_info, argv, exit
 
 from grinder.decorators import exception_handler
-from grinder.defaultvalues import DefaultValues
+from grinder.defaultvalues import DefaultValues, DefaultRateLimiterValues
 from grinder.errors import (
     GrinderInterfaceLoadEnvironmentKeyError,
     GrinderInterfaceParseArgsError,
@@ -13,6 +14,26 @@ from grinder.errors import (
 )
 
 
+def requests_rate(value: str) -> float:
+    """
+    Check rate limit from command line
+
+    :param value (str): requests per second
+    :return float: requests per second
+    """
+    try:
+        rate = float(value)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid rate: {value}")
+    min_rate = DefaultRateLimiterValues.MIN_REQUESTS_PER_SECOND
+    if not (isfinite(rate) and rate >= min_rate):
+        raise ArgumentTypeError(
+            f"rate must be at least {round(min_rate, 4)} requests per second, "
+            f"got {value}"
+        )
+    return rate
+
+
 class GrinderInterface:
     def __init__(self):
         self.args: list = []
@@ -60,6 +81,16 @@ class GrinderInterface:
         parser.add_argument(
             "-sk", "--shodan-key", action="store", default=None, help="Shodan API key"
         )
+        parser.add_argument(
+            "-ds",
+            "--diff-scans",
+            action="store",
+            type=int,
+            nargs=2,
+            metavar=("OLD_SCAN_ID", "NEW_SCAN_ID"),
+            default=None,
+            help="Compare two scans from database: hosts that appeared and disappeared",
+        )
         parser.add_argument(
             "-cu",
             "--count-unique",
@@ -74,6 +105,20 @@ class GrinderInterface:
             default=False,
             help="Create graphic plots",
         )
+        parser.add_argument(
+            "-nd",
+            "--ndjson",
+            action="store_true",
+            default=False,
+            help="Save hosts as NDJSON (one host per line) instead of JSON list",
+        )
+        parser.add_argument(
+            "-col",
+            "--columnar",
+            action="store_true",
+            default=False,
+            help="Count entities over columnar host table and export it to .npz file",
+        )
         parser.add_argument(
             "-ci", "--censys-id", action="store", default=None, help="Censys API ID key"
         )
@@ -100,6 +145,68 @@ class GrinderInterface:
             default=None,
             help="Shodan default maximum results quantity. ",
         )
+        parser.add_argument(
+            "-sw",
+            "--shodan-workers",
+            action="store",
+            type=int,
+            default=None,
+            help="Number of concurrent Shodan queries",
+        )
+        parser.add_argument(
+            "-cw",
+            "--censys-workers",
+            action="store",
+            type=int,
+            default=None,
+            help="Number of concurrent Censys queries",
+        )
+        parser.add_argument(
+            "-sr",
+            "--shodan-rate",
+            action="store",
+            type=requests_rate,
+            default=None,
+            help="Maximum number of Shodan API requests per second",
+        )
+        parser.add_argument(
+            "-cr",
+            "--censys-rate",
+            action="store",
+            type=requests_rate,
+            default=None,
+            help="Maximum number of Censys API requests per second",
+        )
+        parser.add_argument(
+            "-nc",
+            "--no-cache",
+            action="store_true",
+            default=False,
+            help="Bypass cache of search results",
+        )
+        parser.add_argument(
+            "-rc",
+            "--refresh-cache",
+            action="store_true",
+            default=False,
+            help="Ignore cached search results and refresh them",
+        )
+        parser.add_argument(
+            "-ct",
+            "--cache-ttl",
+            action="store",
+            type=int,
+            default=None,
+            help="Time to live of cached search results in seconds",
+        )
+        parser.add_argument(
+            "-cms",
+            "--cache-max-size",
+            action="store",
+            type=int,
+            default=None,
+            help="Maximum size of search results cache in megabytes",
+        )
         parser.add_argument(
             "-nm",
             "--nmap-scan",
@@ -130,6 +237,21 @@ class GrinderInterface:
             default=10,
             help="Number of Vulners workers to scan",
         )
+        parser.add_argument(
+            "-gs",
+            "--group-size",
+            action="store",
+            type=int,
+            default=1,
+            help="Number of hosts with the same ports to scan with one Nmap run (Nmap and Vulners scans)",
+        )
+        parser.add_argument(
+            "-rs",
+            "--resume",
+            action="store_true",
+            default=False,
+            help="Resume interrupted Nmap and Vulners scans from checkpoint",
+        )
         parser.add_argument(
             "-ht",
             "--host-timeout",
@@ -174,6 +296,27 @@ class GrinderInterface:
             default=[],
             help="Set list of vendors to search from queries file",
         )
+        parser.add_argument(
+            "-lv",
+            "--load-vendors",
+            nargs="*",
+            default=[],
+            help="Load only saved hosts of these vendors",
+        )
+        parser.add_argument(
+            "-lp",
+            "--load-products",
+            nargs="*",
+            default=[],
+            help="Load only saved hosts of these products",
+        )
+        parser.add_argument(
+            "-lc",
+            "--load-countries",
+            nargs="*",
+            default=[],
+            help="Load only saved hosts from these countries",
+        )
         parser.add_argument(
             "-ml",
             "--max-limit",
@@ -203,6 +346,68 @@ class GrinderInterface:
             default=None,
             help="Path to TLS-Scanner.jar (if TLS-Scanner directory not in Grinder root, else not required)"
         )
+        parser.add_argument(
+            "-tw",
+            "--tls-workers",
+            action="store",
+            type=int,
+            default=1,
+            help="Number of TLS-Scanner processes running in parallel",
+        )
+        parser.add_argument(
+            "-ttb",
+            "--tls-threads-budget",
+            action="store",
+            type=int,
+            default=None,
+            help="Total number of TLS-Scanner threads, divided between all TLS-Scanner processes",
+        )
+        parser.add_argument(
+            "-tsv",
+            "--tls-service",
+            action="store_true",
+            default=False,
+            help="Run TLS-Scanner as long-lived JVM services instead of new JVM for every host",
+        )
+        parser.add_argument(
+            "-tst",
+            "--tls-stratify",
+            action="store",
+            choices=["country", "port"],
+            default=None,
+            help="Take hosts of every product evenly from all countries or ports for TLS scan",
+        )
+        parser.add_argument(
+            "-tpw",
+            "--tls-ping-workers",
+            action="store",
+            type=int,
+            default=1,
+            help="Number of host groups pinged in parallel before TLS scan",
+        )
+        parser.add_argument(
+            "-tpm",
+            "--tls-ping-method",
+            action="store",
+            choices=["nmap", "tcp"],
+            default="nmap",
+            help="Liveness check before TLS scan: nmap pingscan or unprivileged TCP connect probe",
+        )
+        parser.add_argument(
+            "-tdm",
+            "--tls-detect-method",
+            action="store",
+            choices=["nmap", "probe"],
+            default="nmap",
+            help="Detect TLS ports with Nmap scripts or with direct TLS handshakes (Nmap is used only for ambiguous hosts)",
+        )
+        parser.add_argument(
+            "-tdc",
+            "--tls-decode-certificates",
+            action="store_true",
+            default=False,
+            help="Decode certificates found by TLS handshakes (uses private CPython API, PEM certificates are saved anyway)",
+        )
 
         self.args = parser.parse_args()
         if not self.args.shodan_key:
@@ -234,6 +439,12 @@ class GrinderInterface:
             print(f"Vendors to scan: {vendors_list}")
             print(f"Shodan max results quantity: {self.args.shodan_max}")
             print(f"Censys max results quantity: {self.args.censys_max}")
+            print(f"Shodan search workers: {self.args.shodan_workers}")
+            print(f"Censys search workers: {self.args.censys_workers}")
+            print(f"Shodan API rate limit: {self.args.shodan_rate}")
+            print(f"Censys API rate limit: {self.args.censys_rate}")
+            print(f"Bypass search cache: {self.args.no_cache}")
+            print(f"Refresh search cache: {self.args.refresh_cache}")
         return self.args
 
     @exception_handler(expected_exception=GrinderInterfaceGetShodanKeyError)
@@ -0,0 +1,107 @@
+import java.io.BufferedReader;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.lang.reflect.Constructor;
+import java.lang.reflect.Method;
+import java.nio.charset.StandardCharsets;
+
+/**
+ * Long-lived TLS-Scanner worker for Grinder.
+ *
+ * Reads one job per line from stdin, where job is a list of TLS-Scanner
+ * command line arguments separated by tabs. For every job the full report
+ * is written to stdout, followed by the end marker line with job status
+ * ("OK" or "ERROR"). JVM and TLS-Scanner classes are loaded only once.
+ *
+ * Compile (TLS-Scanner is resolved with reflection, so only JDK is required):
+ *     javac -d grinder/java grinder/java/GrinderTlsScannerService.java
+ * Run:
+ *     java -cp TLS-Scanner.jar:grinder/java GrinderTlsScannerService
+ */
+public class GrinderTlsScannerService {
+    private static final String END_MARKER = "<<<GRINDER_TLS_SCANNER_END>>>";
+
+    /* Package of TLS-Scanner was changed between versions */
+    private static final String[] SCANNER_PACKAGES = {
+        "de.rub.nds.tlsscanner.serverscanner", "de.rub.nds.tlsscanner"
+    };
+
+    private static Class<?> configClass;
+    private static Class<?> scannerClass;
+    private static Class<?> generalDelegateClass;
+    private static Class<?> jcommanderClass;
+
+    public static void main(String[] args) throws Exception {
+        /* Only reports and markers are allowed in stdout, all the
+         * TLS-Scanner and TLS-Attacker logging is moved to stderr */
+        PrintStream protocolOut = new PrintStream(
+            new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        System.setOut(System.err);
+        loadClasses();
+
+        BufferedReader jobs = new BufferedReader(
+            new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String job;
+        while ((job = jobs.readLine()) != null) {
+            if (job.isEmpty()) {
+                continue;
+            }
+            String status = "OK";
+            try {
+                protocolOut.println(scan(job.split("\t")));
+            } catch (Throwable scanError) {
+                scanError.printStackTrace();
+                status = "ERROR";
+            }
+            protocolOut.println(END_MARKER + " " + status);
+            protocolOut.flush();
+        }
+    }
+
+    private static void loadClasses() throws ClassNotFoundException {
+        for (String scannerPackage : SCANNER_PACKAGES) {
+            try {
+                configClass = Class.forName(scannerPackage + ".config.ScannerConfig");
+                scannerClass = Class.forName(scannerPackage + ".TlsScanner");
+                break;
+            } catch (ClassNotFoundException ignored) {
+            }
+        }
+        if (configClass == null || scannerClass == null) {
+            throw new ClassNotFoundException("TLS-Scanner classes not found in classpath");
+        }
+        generalDelegateClass = Class.forName(
+            "de.rub.nds.tlsattacker.core.config.delegate.GeneralDelegate");
+        jcommanderClass = Class.forName("com.beust.jcommander.JCommander");
+    }
+
+    /* Same steps as TLS-Scanner Main: parse arguments, scan, print report */
+    private static String scan(String[] scanArgs) throws Exception {
+        Object generalDelegate = generalDelegateClass.getConstructor().newInstance();
+        Object config = configClass
+            .getConstructor(generalDelegateClass)
+            .newInstance(generalDelegate);
+        Object commander = jcommanderClass.getConstructor(Object.class).newInstance(config);
+        jcommanderClass.getMethod("parse", String[].class).invoke(commander, (Object) scanArgs);
+
+        Constructor<?> scannerConstructor = scannerClass.getConstructor(configClass);
+        Object scanner = scannerConstructor.newInstance(config);
+        Object report = scannerClass.getMethod("scan").invoke(scanner);
+
+        Object reportDetail = configClass.getMethod("getReportDetail").invoke(config);
+        for (Method method : report.getClass().getMethods()) {
+            if (!method.getName().equals("getFullReport")) {
+                continue;
+            }
+            if (method.getParameterCount() == 2) {
+                return (String) method.invoke(report, reportDetail, false);
+            }
+            if (method.getParameterCount() == 1) {
+                return (String) method.invoke(report, reportDetail);
+            }
+        }
+        return report.toString();
+    }
+}
@@ -3,6 +3,7 @@
 from json import dump
 
 from grinder.defaultvalues import DefaultValues
+from grinder.hostrecord import to_serializable
 from pathlib import Path
 
 
@@ -16,4 +17,4 @@ class MapMarkers:
         path_to_save = Path(".").joinpath(map_directory).joinpath("static").joinpath("data")
         path_to_save.mkdir(parents=True, exist_ok=True)
         with open(path_to_save.joinpath("markers.json"), mode="w") as json_markers:
-            dump(results, json_markers, indent=4)
\ No newline at end of file
+            dump(results, json_markers, indent=4, default=to_serializable)
\ No newline at end of file
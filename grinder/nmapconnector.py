@@ -26,29 +26,41 @@ class NmapConnector:
     def scan(
         self, host: str, arguments: str = "", ports: str = "", sudo: bool = False
     ) -> None:
+        self.scan_hosts(hosts=[host], arguments=arguments, ports=ports, sudo=sudo)
+
+    @exception_handler(expected_exception=NmapConnectorScanError)
+    def scan_hosts(
+        self, hosts: list, arguments: str = "", ports: str = "", sudo: bool = False
+    ) -> None:
+        # Scan group of hosts with one Nmap run, so all of the
+        # hosts in group must be of the same IP version
+        hosts_in_nmap_format = " ".join(hosts)
+
         # Add special Nmap key to scan ipv6 hosts
-        if self.check_ip_v6(host):
+        if hosts and self.check_ip_v6(hosts[0]):
             arguments += " -6"
 
         # If user wants to scan for top-ports,
         # let's remove other ports from nmap scan
         if "top-ports" in arguments:
-            self.nm.scan(hosts=host, arguments=arguments, sudo=sudo)
+            self.nm.scan(hosts=hosts_in_nmap_format, arguments=arguments, sudo=sudo)
 
         # Else if user doesn't want scan for top-ports,
         # let's scan with defined ports
         elif arguments and ports:
-            self.nm.scan(hosts=host, arguments=arguments, ports=ports, sudo=sudo)
+            self.nm.scan(
+                hosts=hosts_in_nmap_format, arguments=arguments, ports=ports, sudo=sudo
+            )
 
         # Else if ports are not defined, let's
         # scan with default ports
         elif arguments:
-            self.nm.scan(hosts=host, arguments=arguments, sudo=sudo)
+            self.nm.scan(hosts=hosts_in_nmap_format, arguments=arguments, sudo=sudo)
 
         # If arguments are not setted too, make
         # simple scan
         else:
-            self.nm.scan(hosts=host, sudo=sudo)
+            self.nm.scan(hosts=hosts_in_nmap_format, sudo=sudo)
         self.results = {host: self.nm[host] for host in self.nm.all_hosts()}
 
     @exception_handler(expected_exception=NmapConnectorGetResultsError)
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 
-from multiprocessing import Process, JoinableQueue, Manager
-from os import system
+from ipaddress import ip_address
+from multiprocessing import Process, Queue, Pipe
+from multiprocessing.connection import Connection, wait
+from os import system, setpgid, killpg
+from signal import SIGKILL
 from datetime import datetime
+from time import monotonic
 
 from grinder.decorators import exception_handler
 from grinder.errors import (
@@ -11,50 +15,85 @@ from grinder.errors import (
 )
 from grinder.nmapconnector import NmapConnector
 from grinder.defaultvalues import DefaultProcessManagerValues
-
-
-class NmapProcessingResults:
-    RESULTS = Manager().dict({})
+from grinder.scancheckpoint import NmapScanCheckpoint
 
 
 class NmapProcessing(Process):
-    def __init__(self, queue: JoinableQueue, arguments: str, ports: str, sudo: bool):
+    def __init__(
+        self,
+        worker_id: int,
+        queue: Queue,
+        results_connection: Connection,
+        arguments: str,
+        ports: str,
+        sudo: bool,
+    ):
         Process.__init__(self)
+        self.worker_id = worker_id
         self.queue = queue
+        self.results_connection = results_connection
         self.arguments = arguments
         self.ports = ports
         self.sudo = sudo
 
+    def _scan(self, index: int, tasks_quantity: int, hosts: list) -> dict:
+        hosts_ip = [host.get("ip") for host in hosts]
+        # All hosts in group share the same port specification
+        host_port = str(hosts[0].get("port"))
+
+        port_postfix = "Default"
+        if not self.ports and host_port:
+            port_postfix = host_port
+        if self.ports:
+            port_postfix = str(self.ports)
+        current_time = datetime.now().strftime("%H:%M:%S")
+        if len(hosts_ip) == 1:
+            print(
+                f"⭕ Current scan host ({index}/{tasks_quantity}): {hosts_ip[0]}:{port_postfix} (started at: {str(current_time)})"
+            )
+        else:
+            print(
+                f"⭕ Current scan group ({index}/{tasks_quantity}): {len(hosts_ip)} hosts, port {port_postfix} (started at: {str(current_time)})"
+            )
+        nm = NmapConnector()
+        nm.scan_hosts(
+            hosts=hosts_ip,
+            arguments=self.arguments,
+            ports=(self.ports or host_port),
+            sudo=self.sudo,
+        )
+        return nm.get_results()
+
     @exception_handler(expected_exception=NmapProcessingRunError)
     def run(self):
+        # Own process group, so Nmap processes of this worker
+        # can be killed together with worker in case of timeout
+        setpgid(0, 0)
         while True:
-            index, hosts_quantity, host = self.queue.get()
-            host_ip = host.get("ip")
-            host_port = str(host.get("port"))
-
-            port_postfix = "Default"
-            if not self.ports and host_port:
-                port_postfix = host_port
-            if self.ports:
-                port_postfix = str(self.ports)
-            current_time = datetime.now().strftime("%H:%M:%S")
-            print(
-                f"⭕ Current scan host ({index}/{hosts_quantity}): {host_ip}:{port_postfix} (started at: {str(current_time)})"
+            task = self.queue.get()
+            # Empty task is a signal to stop the worker
+            if task is None:
+                return
+            index, tasks_quantity, hosts = task
+            # Results are sent over worker's own pipe synchronously,
+            # so they are not lost even if worker dies right after
+            self.results_connection.send(("started", index, None))
+            started_at = monotonic()
+            try:
+                results = self._scan(index, tasks_quantity, hosts)
+            except Exception as scan_error:
+                print(f"Nmap scan error ({index}/{tasks_quantity}): {scan_error}")
+                results = {}
+            # Every host must be answered, even if there is nothing to send,
+            # and worker must stay alive after empty or failed scans
+            for host in hosts:
+                host_ip = host.get("ip")
+                self.results_connection.send(
+                    ("result", index, (host_ip, results.get(host_ip)))
+                )
+            self.results_connection.send(
+                ("done", index, (len(hosts), monotonic() - started_at))
             )
-            nm = NmapConnector()
-            nm.scan(
-                host=host_ip,
-                arguments=self.arguments,
-                ports=(self.ports or host_port),
-                sudo=self.sudo,
-            )
-            results = nm.get_results()
-            if not results.get(host_ip):
-                self.queue.task_done()
-                return {}
-            if results.get(host_ip).values():
-                NmapProcessingResults.RESULTS.update({host_ip: results.get(host_ip)})
-            self.queue.task_done()
 
 
 class NmapProcessingManager:
@@ -65,33 +104,264 @@ class NmapProcessingManager:
         sudo=DefaultProcessManagerValues.SUDO,
         arguments=DefaultProcessManagerValues.ARGUMENTS,
         workers=DefaultProcessManagerValues.WORKERS,
+        group_size=DefaultProcessManagerValues.GROUP_SIZE,
+        task_timeout=DefaultProcessManagerValues.TASK_TIMEOUT,
+        checkpoint: NmapScanCheckpoint = None,
     ):
         self.hosts = hosts
         self.workers = workers
         self.arguments = arguments
         self.ports = ports
         self.sudo = sudo
+        self.group_size = max(int(group_size or 1), 1)
+        self.task_timeout = task_timeout
+        self.checkpoint = checkpoint
+        self.results: dict = {}
+        self.workers_stats: dict = {}
+
+    @staticmethod
+    def _is_ip_v6(host_ip: str) -> bool:
+        try:
+            return ip_address(host_ip).version == 6
+        except ValueError:
+            return False
+
+    def _get_checkpoint_key(self, host: dict) -> tuple:
+        arguments = self.arguments
+        if self.ports:
+            arguments = f"{arguments} -p {self.ports}"
+        return NmapScanCheckpoint.make_key(host.get("ip"), host.get("port"), arguments)
+
+    def _load_checkpoint(self) -> list:
+        """
+        Load results of hosts that were already scanned with
+        the same port and arguments from checkpoint
+
+        :return list: hosts that still need to be scanned
+        """
+        if not self.checkpoint:
+            return self.hosts
+        scanned = self.checkpoint.load()
+        if not scanned:
+            return self.hosts
+        hosts_to_scan: list = []
+        for host in self.hosts:
+            checkpoint_key = self._get_checkpoint_key(host)
+            if checkpoint_key not in scanned:
+                hosts_to_scan.append(host)
+                continue
+            if scanned[checkpoint_key]:
+                self.results.update({host.get("ip"): scanned[checkpoint_key]})
+        print(
+            f"Resume scan: {len(self.hosts) - len(hosts_to_scan)} hosts were already scanned"
+        )
+        return hosts_to_scan
+
+    def _save_checkpoint(self, host_ip: str, group: list, host_results: dict) -> None:
+        if not self.checkpoint:
+            return
+        for host in group:
+            if host.get("ip") == host_ip:
+                ip, port, arguments = self._get_checkpoint_key(host)
+                self.checkpoint.add(ip, port, arguments, host_results)
+                return
+
+    def _make_groups(self, hosts: list) -> list:
+        """
+        Make groups of hosts that can be scanned with one Nmap run:
+        hosts in one group share the same port specification and
+        IP version. Hosts order inside groups is the same as
+        in original hosts list.
+
+        :param hosts (list): hosts to scan
+        :return list: list of hosts groups
+        """
+        if self.group_size == 1:
+            return [[host] for host in hosts]
+
+        groups_by_spec: dict = {}
+        for host in hosts:
+            if self.ports or "top-ports" in self.arguments:
+                port_spec = self.ports
+            else:
+                port_spec = str(host.get("port"))
+            spec = (port_spec, self._is_ip_v6(host.get("ip")))
+            groups_by_spec.setdefault(spec, []).append(host)
+
+        groups: list = []
+        for spec_hosts in groups_by_spec.values():
+            for index in range(0, len(spec_hosts), self.group_size):
+                groups.append(spec_hosts[index : index + self.group_size])
+        return groups
+
+    def _start_worker(self, queue: Queue, arguments: str) -> tuple:
+        # Every started worker got unique id and own pipe, so
+        # late messages from killed worker can't be mixed up
+        # with its successor
+        worker_id = len(self.workers_stats)
+        results_receiver, results_sender = Pipe(duplex=False)
+        process = NmapProcessing(
+            worker_id, queue, results_sender, arguments, self.ports, self.sudo
+        )
+        process.daemon = True
+        process.start()
+        results_sender.close()
+        self.workers_stats[worker_id] = {
+            "tasks": 0,
+            "hosts": 0,
+            "busy_time": 0.0,
+            "started_at": monotonic(),
+            "stopped_at": None,
+        }
+        return process, results_receiver
+
+    @staticmethod
+    def _kill_worker(process: NmapProcessing) -> None:
+        """
+        Kill worker with all of the Nmap processes started by it
+
+        :param process (NmapProcessing): worker to kill
+        :return None:
+        """
+        try:
+            killpg(process.pid, SIGKILL)
+        except (ProcessLookupError, PermissionError, TypeError):
+            process.terminate()
+        process.join(timeout=5)
+
+    def _get_task_timeout(self, task_hosts: list) -> float or None:
+        if not self.task_timeout:
+            return None
+        # Nmap scans hosts of one group in parallel, but give
+        # bigger groups some more time to finish
+        return self.task_timeout * (1 + len(task_hosts) // 10)
+
+    def _print_workers_stats(self) -> None:
+        for worker_id, stats in self.workers_stats.items():
+            elapsed = (stats.get("stopped_at") or monotonic()) - stats["started_at"]
+            hosts_per_minute = round(stats["hosts"] / max(elapsed, 1e-6) * 60, 2)
+            print(
+                f"Nmap worker {worker_id}: {stats['tasks']} tasks, {stats['hosts']} hosts, "
+                f"busy {round(stats['busy_time'], 2)}s of {round(elapsed, 2)}s, "
+                f"{hosts_per_minute} hosts/min"
+            )
 
     @exception_handler(expected_exception=NmapProcessingManagerOrganizeProcessesError)
     def organize_processes(self):
-        queue = JoinableQueue()
-        for _ in range(self.workers):
-            process = NmapProcessing(queue, self.arguments, self.ports, self.sudo)
-            process.daemon = True
-            process.start()
-        hosts_quantity = len(self.hosts)
-        for index, host in enumerate(self.hosts):
-            queue.put((index, hosts_quantity, host))
-        queue.join()
+        arguments = self.arguments
+        # Let Nmap scan all the hosts of group in parallel
+        if self.group_size > 1 and "--min-hostgroup" not in arguments:
+            arguments = f"{arguments} --min-hostgroup {self.group_size}"
+
+        groups = self._make_groups(self._load_checkpoint())
+        tasks_quantity = len(groups)
+        if not tasks_quantity:
+            return
+
+        queue = Queue()
+        for index, group in enumerate(groups):
+            queue.put((index, tasks_quantity, group))
+
+        workers_quantity = max(min(self.workers, tasks_quantity), 1)
+        # worker_id: (worker process, results pipe)
+        processes: dict = {}
+        for _ in range(workers_quantity):
+            process, results_receiver = self._start_worker(queue, arguments)
+            processes[process.worker_id] = (process, results_receiver)
+        # worker_id: (task index, time when task was started)
+        current_tasks: dict = {}
+        pending_tasks = set(range(tasks_quantity))
+        closed_workers = set()
+        idle_checks = 0
+
+        try:
+            while pending_tasks:
+                receivers = {
+                    results_receiver: worker_id
+                    for worker_id, (_, results_receiver) in processes.items()
+                }
+                ready_receivers = wait(list(receivers.keys()), timeout=1)
+                idle_checks = 0 if ready_receivers else idle_checks + 1
+                for results_receiver in ready_receivers:
+                    worker_id = receivers[results_receiver]
+                    try:
+                        message, index, payload = results_receiver.recv()
+                    except (EOFError, OSError):
+                        # Worker is dead, it will be restarted below
+                        closed_workers.add(worker_id)
+                        continue
+                    if message == "started":
+                        current_tasks[worker_id] = (index, monotonic())
+                    elif message == "result":
+                        host_ip, host_results = payload
+                        self._save_checkpoint(host_ip, groups[index], host_results)
+                        if host_results:
+                            self.results.update({host_ip: host_results})
+                    elif message == "done":
+                        pending_tasks.discard(index)
+                        current_tasks.pop(worker_id, None)
+                        hosts_quantity, busy_time = payload
+                        stats = self.workers_stats[worker_id]
+                        stats["tasks"] += 1
+                        stats["hosts"] += hosts_quantity
+                        stats["busy_time"] += busy_time
+
+                # Supervise workers: respawn crashed workers and
+                # kill workers that got stuck on current task
+                for worker_id, (process, results_receiver) in list(processes.items()):
+                    task = current_tasks.get(worker_id)
+                    timeout = self._get_task_timeout(groups[task[0]]) if task else None
+                    is_timed_out = timeout and monotonic() - task[1] > timeout
+                    if process.is_alive() and not is_timed_out:
+                        continue
+                    # Read all the messages that dead worker sent before
+                    if not (is_timed_out or worker_id in closed_workers):
+                        if results_receiver.poll():
+                            continue
+                    if is_timed_out:
+                        print(
+                            f"Nmap worker {worker_id} timeout on task {task[0]}/{tasks_quantity}, restart worker"
+                        )
+                        self._kill_worker(process)
+                    else:
+                        print(f"Nmap worker {worker_id} died, restart worker")
+                    self.workers_stats[worker_id]["stopped_at"] = monotonic()
+                    results_receiver.close()
+                    processes.pop(worker_id)
+                    if task:
+                        current_tasks.pop(worker_id, None)
+                        pending_tasks.discard(task[0])
+                    if not pending_tasks:
+                        continue
+                    process, results_receiver = self._start_worker(queue, arguments)
+                    processes[process.worker_id] = (process, results_receiver)
+
+                # Tasks of workers that died before they reported
+                # about the task can't be finished anymore
+                if idle_checks >= 5 and not current_tasks and queue.empty():
+                    print(f"Nmap tasks were lost: {len(pending_tasks)}")
+                    pending_tasks.clear()
+        finally:
+            for _ in processes:
+                queue.put(None)
+            for worker_id, (process, results_receiver) in processes.items():
+                process.join(timeout=1)
+                if process.is_alive():
+                    self._kill_worker(process)
+                results_receiver.close()
+                self.workers_stats[worker_id]["stopped_at"] = monotonic()
+            if self.checkpoint:
+                self.checkpoint.close()
+        self._print_workers_stats()
 
     def start(self):
         self.organize_processes()
 
     def get_results(self) -> dict:
-        return NmapProcessingResults.RESULTS
+        return self.results
 
     def get_results_count(self) -> int:
-        return len(NmapProcessingResults.RESULTS)
+        return len(self.results)
 
     def __del__(self):
         system("stty sane")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+from collections import deque
+from math import isfinite
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep
+
+from grinder.defaultvalues import DefaultRateLimiterValues
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated_at: float = monotonic()
+        self.lock = Lock()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def acquire(self) -> None:
+        """
+        Take one token from bucket, wait until it will be available
+
+        :return None:
+        """
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            sleep(wait_time)
+
+    def drain(self) -> None:
+        """
+        Remove all tokens from bucket, so all the callers
+        must wait for the next refill
+
+        :return None:
+        """
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = DefaultRateLimiterValues.BURST,
+        max_retries: int = DefaultRateLimiterValues.MAX_RETRIES,
+        backoff_base: float = DefaultRateLimiterValues.BACKOFF_BASE,
+        backoff_max: float = DefaultRateLimiterValues.BACKOFF_MAX,
+        throughput_window: float = DefaultRateLimiterValues.THROUGHPUT_WINDOW,
+    ):
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.throughput_window: float = throughput_window
+        self.buckets: dict = {}
+        self.calls: dict = {}
+        self.lock = Lock()
+
+    def _get_bucket(self, key: str) -> TokenBucket:
+        with self.lock:
+            if key not in self.buckets:
+                self.buckets[key] = TokenBucket(self.rate, self.capacity)
+                self.calls[key] = deque()
+            return self.buckets[key]
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Set allowed requests per second for all keys
+
+        :param rate (float): requests per second
+        :return None:
+        """
+        rate = float(rate)
+        min_rate = DefaultRateLimiterValues.MIN_REQUESTS_PER_SECOND
+        if not (isfinite(rate) and rate >= min_rate):
+            raise ValueError(
+                f"Rate limit must be at least {round(min_rate, 4)} requests "
+                f"per second, got {rate}"
+            )
+        with self.lock:
+            self.rate = rate
+            for bucket in self.buckets.values():
+                bucket.rate = rate
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter
+
+        :param attempt (int): number of current retry
+        :return float: delay in seconds
+        """
+        return uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _register_call(self, key: str) -> None:
+        now = monotonic()
+        with self.lock:
+            calls = self.calls[key]
+            calls.append(now)
+            while calls and now - calls[0] > self.throughput_window:
+                calls.popleft()
+
+    def call(self, key: str, function, *args, retry_if=None, **kwargs):
+        """
+        Call function when token for current key is available. In case
+        of expected error (like rate limit) retry call with jittered
+        exponential backoff, after the last retry error is raised.
+
+        :param key (str): key of token bucket (API backend, API key)
+        :param function (callable): function to call
+        :param retry_if (callable): check if exception is worth retrying
+        :return: result of function call
+        """
+        bucket = self._get_bucket(key)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as call_error:
+                if not (retry_if and retry_if(call_error)):
+                    raise
+                if attempt >= self.max_retries:
+                    raise
+                # Other threads with the same key must wait too
+                bucket.drain()
+                delay = self._backoff_delay(attempt)
+                print(f"│ Rate limit hit ({call_error}), retry in {round(delay, 2)}s")
+                sleep(delay)
+                attempt += 1
+                continue
+            self._register_call(key)
+            return result
+
+    def get_throughput(self, key: str = None) -> float:
+        """
+        Get current throughput in requests per second, measured
+        in the sliding window, for one key or for all of them
+
+        :param key (str): key of token bucket, all keys if not set
+        :return float: requests per second
+        """
+        now = monotonic()
+        with self.lock:
+            keys = [key] if key else list(self.calls.keys())
+            calls_count = sum(
+                1
+                for current_key in keys
+                for call_time in self.calls.get(current_key, [])
+                if now - call_time <= self.throughput_window
+            )
+        return calls_count / self.throughput_window
+
+
+class SearchRateLimiters:
+    SHODAN = RateLimiter(rate=DefaultRateLimiterValues.SHODAN_REQUESTS_PER_SECOND)
+    CENSYS = RateLimiter(rate=DefaultRateLimiterValues.CENSYS_REQUESTS_PER_SECOND)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+from json import dumps, loads, JSONDecodeError
+from pathlib import Path
+
+from grinder.decorators import exception_handler
+from grinder.defaultvalues import DefaultScanCheckpointValues, DefaultValues
+from grinder.errors import (
+    GrinderScanCheckpointLoadError,
+    GrinderScanCheckpointAddError,
+    GrinderScanCheckpointCloseError,
+)
+
+
+class NmapScanCheckpoint:
+    """
+    Append-only checkpoint of per-host scan results. Every line of
+    checkpoint file is one json record, written as soon as host
+    scan is finished, so interrupted scan can be resumed later.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        resume: bool = False,
+        dest_dir: str = DefaultValues.RESULTS_DIRECTORY,
+    ):
+        self.resume: bool = resume
+        self.checkpoint_path = (
+            Path(".")
+            .joinpath(dest_dir)
+            .joinpath(DefaultScanCheckpointValues.CHECKPOINT_DIRECTORY)
+            .joinpath(f"{name}.ndjson")
+        )
+        self.checkpoint_file = None
+
+    @staticmethod
+    def make_key(ip: str, port: str, arguments: str) -> tuple:
+        return str(ip), str(port), str(arguments)
+
+    @exception_handler(expected_exception=GrinderScanCheckpointLoadError)
+    def load(self) -> dict:
+        """
+        Load results of already scanned hosts. If scan is not
+        resumed, previous checkpoint is removed.
+
+        :return dict: {(ip, port, arguments): results}
+        """
+        scanned: dict = {}
+        if not self.resume:
+            if self.checkpoint_path.exists():
+                self.checkpoint_path.unlink()
+            return scanned
+        if not self.checkpoint_path.exists():
+            return scanned
+        with open(self.checkpoint_path, mode="r") as checkpoint_file:
+            for line in checkpoint_file:
+                try:
+                    record = loads(line)
+                except JSONDecodeError:
+                    # Last line can be broken if scan was interrupted
+                    continue
+                key = self.make_key(
+                    record.get("ip"), record.get("port"), record.get("arguments")
+                )
+                scanned[key] = record.get("results")
+        return scanned
+
+    @exception_handler(expected_exception=GrinderScanCheckpointAddError)
+    def add(self, ip: str, port: str, arguments: str, results: dict or None) -> None:
+        """
+        Append results of scanned host to checkpoint
+
+        :param ip (str): host ip
+        :param port (str): host port
+        :param arguments (str): scan arguments
+        :param results (dict): scan results, None if nothing was found
+        :return None:
+        """
+        if not self.checkpoint_file:
+            self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            self.checkpoint_file = open(self.checkpoint_path, mode="a")
+        self.checkpoint_file.write(
+            dumps(
+                {
+                    "ip": str(ip),
+                    "port": str(port),
+                    "arguments": str(arguments),
+                    "results": results,
+                }
+            )
+            + "\n"
+        )
+        self.checkpoint_file.flush()
+
+    @exception_handler(expected_exception=GrinderScanCheckpointCloseError)
+    def close(self) -> None:
+        if self.checkpoint_file:
+            self.checkpoint_file.close()
+            self.checkpoint_file = None
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+
+import sqlite3
+from hashlib import sha256
+from json import dumps as json_dumps
+from json import loads as json_loads
+from pathlib import Path
+from threading import Lock
+from time import time
+
+from grinder.decorators import exception_handler
+from grinder.defaultvalues import DefaultSearchCacheValues, DefaultValues
+from grinder.errors import (
+    GrinderSearchCacheOpenError,
+    GrinderSearchCacheGetError,
+    GrinderSearchCachePutError,
+    GrinderSearchCacheCloseError,
+)
+
+
+class GrinderSearchCache:
+    """
+    Persistent cache of search results, keyed by
+    (backend, query, max_records) with TTL and
+    size-bounded LRU eviction
+    """
+
+    def __init__(
+        self,
+        ttl: int = DefaultSearchCacheValues.TTL,
+        max_size: int = DefaultSearchCacheValues.MAX_SIZE_MB,
+        mode: str = DefaultSearchCacheValues.MODE,
+        dest_dir: str = DefaultValues.RESULTS_DIRECTORY,
+    ):
+        self.ttl: int = ttl
+        self.max_size: int = max_size
+        self.mode: str = mode
+        self.cache_path = (
+            Path(".")
+            .joinpath(dest_dir)
+            .joinpath(DefaultSearchCacheValues.CACHE_DIRECTORY)
+            .joinpath(DefaultSearchCacheValues.CACHE_FILE)
+        )
+        self.connection = None
+        self.lock = Lock()
+
+    @exception_handler(expected_exception=GrinderSearchCacheOpenError)
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open cache database on first use only, so runs
+        without search do not touch the cache at all
+
+        :return sqlite3.Connection: cache database connection
+        """
+        if self.connection:
+            return self.connection
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(
+            str(self.cache_path), check_same_thread=False
+        )
+        with self.connection as db_connection:
+            db_connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS
+                search_cache(
+                    cache_key TEXT PRIMARY KEY,
+                    backend TEXT,
+                    query TEXT,
+                    max_records INTEGER,
+                    created_at REAL,
+                    accessed_at REAL,
+                    size INTEGER,
+                    results TEXT
+                )
+                """
+            )
+            db_connection.execute(
+                """
+                CREATE INDEX IF NOT EXISTS
+                search_cache_accessed_at ON search_cache(accessed_at)
+                """
+            )
+        return self.connection
+
+    @staticmethod
+    def _make_key(backend: str, query: str, max_records: int) -> str:
+        return sha256(json_dumps([backend, query, max_records]).encode()).hexdigest()
+
+    def is_readable(self) -> bool:
+        return self.mode == "enabled"
+
+    def is_writable(self) -> bool:
+        return self.mode in ["enabled", "refresh"]
+
+    @exception_handler(expected_exception=GrinderSearchCacheGetError)
+    def get(self, backend: str, query: str, max_records: int) -> list or None:
+        """
+        Get cached results if they are not expired yet
+
+        :param backend (str): search backend name ("shodan", "censys")
+        :param query (str): search query
+        :param max_records (int): maximum results quantity
+        :return list: cached results or None if nothing was found
+        """
+        if not self.is_readable():
+            return None
+        cache_key = self._make_key(backend, query, max_records)
+        with self.lock:
+            connection = self._connect()
+            with connection as db_connection:
+                cached = db_connection.execute(
+                    """
+                    SELECT created_at, results FROM search_cache
+                    WHERE cache_key = ?
+                    """,
+                    (cache_key,),
+                ).fetchone()
+                if not cached:
+                    return None
+                created_at, results = cached
+                if self.ttl and time() - created_at > self.ttl:
+                    db_connection.execute(
+                        "DELETE FROM search_cache WHERE cache_key = ?", (cache_key,)
+                    )
+                    return None
+                db_connection.execute(
+                    "UPDATE search_cache SET accessed_at = ? WHERE cache_key = ?",
+                    (time(), cache_key),
+                )
+        return json_loads(results)
+
+    @exception_handler(expected_exception=GrinderSearchCachePutError)
+    def put(self, backend: str, query: str, max_records: int, results: list) -> None:
+        """
+        Save results to cache and evict least recently
+        used results if cache is too big
+
+        :param backend (str): search backend name ("shodan", "censys")
+        :param query (str): search query
+        :param max_records (int): maximum results quantity
+        :param results (list): results to save
+        :return None:
+        """
+        if not self.is_writable():
+            return
+        results_json = json_dumps(results)
+        now = time()
+        with self.lock:
+            connection = self._connect()
+            with connection as db_connection:
+                db_connection.execute(
+                    """
+                    INSERT OR REPLACE INTO
+                    search_cache(
+                        cache_key,
+                        backend,
+                        query,
+                        max_records,
+                        created_at,
+                        accessed_at,
+                        size,
+                        results
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        self._make_key(backend, query, max_records),
+                        backend,
+                        query,
+                        max_records,
+                        now,
+                        now,
+                        len(results_json),
+                        results_json,
+                    ),
+                )
+                self._evict(db_connection)
+
+    def _evict(self, db_connection: sqlite3.Connection) -> None:
+        """
+        Remove expired results and least recently used results
+        until total size of cache fits into maximum size
+
+        :param db_connection (sqlite3.Connection): cache database connection
+        :return None:
+        """
+        if self.ttl:
+            db_connection.execute(
+                "DELETE FROM search_cache WHERE created_at < ?", (time() - self.ttl,)
+            )
+        if not self.max_size:
+            return
+        max_size_bytes = self.max_size * 1024 * 1024
+        total_size = db_connection.execute(
+            "SELECT coalesce(sum(size), 0) FROM search_cache"
+        ).fetchone()[0]
+        if total_size <= max_size_bytes:
+            return
+        keys_to_evict: list = []
+        for cache_key, size in db_connection.execute(
+            "SELECT cache_key, size FROM search_cache ORDER BY accessed_at"
+        ).fetchall():
+            if total_size <= max_size_bytes:
+                break
+            keys_to_evict.append((cache_key,))
+            total_size -= size
+        db_connection.executemany(
+            "DELETE FROM search_cache WHERE cache_key = ?", keys_to_evict
+        )
+
+    @exception_handler(expected_exception=GrinderSearchCacheCloseError)
+    def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
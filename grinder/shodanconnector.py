@@ -1,35 +1,89 @@
 #!/usr/bin/env python3
 
+from typing import Iterator
+
 from shodan import Shodan
 from shodan.exception import APIError, APITimeout
 
 from grinder.decorators import exception_handler
 from grinder.defaultvalues import DefaultValues
 from grinder.errors import ShodanConnectorInitError, ShodanConnectorSearchError
+from grinder.ratelimiter import SearchRateLimiters
 
 
 class ShodanConnector:
     @exception_handler(expected_exception=ShodanConnectorInitError)
     def __init__(self, api_key=DefaultValues.SHODAN_API_KEY):
         self.api = Shodan(api_key)
+        self.rate_limiter_key = f"shodan:{api_key}"
         self.results: list = []
         self.shodan_results_count: int = 0
         self.real_results_count: int = 0
+        self.search_failed: bool = False
 
     @exception_handler(expected_exception=ShodanConnectorSearchError)
     def search(
         self, query: str, max_records=DefaultValues.SHODAN_DEFAULT_RESULTS_QUANTITY
     ) -> None:
+        self.results = list(self.search_iter(query, max_records))
+        self.real_results_count = len(self.results)
+
+    def search_iter(
+        self, query: str, max_records=DefaultValues.SHODAN_DEFAULT_RESULTS_QUANTITY
+    ) -> Iterator[dict]:
+        """
+        Page through Shodan results lazily and yield banners one by one.
+        Paging stops as soon as max_records banners were yielded, and the
+        total count is taken from the first page instead of separate
+        count request.
+
+        :param query (str): search query for shodan
+        :param max_records (int): maximum results quantity
+        :return Iterator[dict]: raw shodan banners
+        """
+        self.shodan_results_count = 0
+        self.real_results_count = 0
+        self.search_failed = False
+        page = 1
         try:
-            self.results = list(self.api.search_cursor(query))[:max_records]
-            self.shodan_results_count = self.api.count(query).get("total")
+            while self.real_results_count < max_records:
+                results_page = SearchRateLimiters.SHODAN.call(
+                    self.rate_limiter_key,
+                    self.api.search,
+                    query,
+                    page=page,
+                    retry_if=self.is_retryable_error,
+                )
+                if page == 1:
+                    self.shodan_results_count = results_page.get("total") or 0
+                matches = results_page.get("matches")
+                if not matches:
+                    break
+                # Pop banners from the page to drop every raw banner
+                # as soon as it was processed by the caller
+                matches.reverse()
+                while matches and self.real_results_count < max_records:
+                    self.real_results_count += 1
+                    yield matches.pop()
+                if self.real_results_count >= self.shodan_results_count:
+                    break
+                page += 1
         except (APIError, APITimeout) as api_error:
             print(f"Shodan API error: {api_error}")
-        self.real_results_count = len(list(self.results))
+            self.search_failed = True
+
+    @staticmethod
+    def is_retryable_error(api_error: Exception) -> bool:
+        if isinstance(api_error, APITimeout):
+            return True
+        return isinstance(api_error, APIError) and "rate limit" in str(api_error).lower()
 
     def get_results(self) -> list:
         return self.results
 
+    def is_search_failed(self) -> bool:
+        return self.search_failed
+
     def get_shodan_count(self) -> int:
         return self.shodan_results_count
 
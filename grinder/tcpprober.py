@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import asyncio
+
+from grinder.defaultvalues import DefaultTcpProberValues
+
+
+class TcpConnectProber:
+    """
+    Unprivileged liveness check with plain TCP connect. Host is
+    alive if any of the ports accepted or actively refused
+    connection, silent ports (timeouts) mean nothing.
+    """
+
+    def __init__(
+        self,
+        ports: list = None,
+        timeout: float = DefaultTcpProberValues.TIMEOUT,
+        concurrency: int = DefaultTcpProberValues.CONCURRENCY,
+    ):
+        self.ports: list = ports or DefaultTcpProberValues.PORTS
+        self.timeout: float = timeout
+        self.concurrency: int = concurrency
+
+    async def _probe_port(
+        self, semaphore: asyncio.Semaphore, host: str, port: int
+    ) -> bool:
+        """
+        Try to connect to one port of host
+
+        :param semaphore (asyncio.Semaphore): limit of connections at once
+        :param host (str): host ip
+        :param port (int): port to connect
+        :return bool: host answered on this port
+        """
+        async with semaphore:
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port), timeout=self.timeout
+                )
+            except ConnectionRefusedError:
+                # RST from host, so host is up
+                return True
+            except (asyncio.TimeoutError, OSError):
+                return False
+            writer.close()
+            return True
+
+    async def _probe_host(self, semaphore: asyncio.Semaphore, host: str) -> bool:
+        """
+        Check all the ports of host, one answer is enough
+
+        :param semaphore (asyncio.Semaphore): limit of connections at once
+        :param host (str): host ip
+        :return bool: host is alive
+        """
+        results = await asyncio.gather(
+            *[self._probe_port(semaphore, host, port) for port in self.ports]
+        )
+        return any(results)
+
+    async def _probe_hosts(self, hosts: list) -> list:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *[self._probe_host(semaphore, host) for host in hosts]
+        )
+        return [host for host, is_alive in zip(hosts, results) if is_alive]
+
+    def probe(self, hosts: list) -> list:
+        """
+        Check liveness of all hosts
+
+        :param hosts (list): list of host ips
+        :return list: alive hosts, in the same order
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self._probe_hosts(hosts))
+        finally:
+            loop.close()
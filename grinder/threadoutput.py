@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import sys
+from io import StringIO
+from threading import local
+
+
+class ThreadOutput:
+    """
+    Stdout proxy for worker threads. Output of every job that runs
+    with "collect" is kept in its own buffer and returned together
+    with result, so main thread can print it later in order,
+    without interleaving of concurrent jobs. Output of all the
+    other threads goes straight to real stdout.
+    """
+
+    def __init__(self):
+        self.stdout = sys.stdout
+        self.buffers = local()
+
+    def __enter__(self) -> "ThreadOutput":
+        self.stdout = sys.stdout
+        sys.stdout = self
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        sys.stdout = self.stdout
+
+    def _get_buffer(self) -> StringIO or None:
+        return getattr(self.buffers, "buffer", None)
+
+    def write(self, text: str) -> int:
+        buffer = self._get_buffer()
+        if buffer is None:
+            return self.stdout.write(text)
+        return buffer.write(text)
+
+    def flush(self) -> None:
+        if self._get_buffer() is None:
+            self.stdout.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stdout, name)
+
+    def collect(self, function, *args, **kwargs) -> tuple:
+        """
+        Run job and collect all of its output
+
+        :param function (callable): job to run
+        :return tuple: result of job and its output
+        """
+        self.buffers.buffer = StringIO()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException:
+            # Do not lose output of failed job
+            self.stdout.write(self.buffers.buffer.getvalue())
+            raise
+        finally:
+            output = self.buffers.buffer.getvalue()
+            self.buffers.buffer = None
+        return result, output
@@ -1,16 +1,19 @@
 #!/usr/bin/env python3
 from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from csv import DictWriter
 from json import dump
-from os import listdir
+from os import listdir, stat
 from pathlib import Path
-from re import findall
+from re import compile, sub
+from typing import Iterable
 
 from grinder.defaultvalues import (
     DefaultValues,
     DefaultTlsScannerValues,
     DefaultTlsParserValues,
 )
+from grinder.tlsreportindex import TlsReportIndex
 
 # Possible list of attacks from TLS-Scanner
 LIST_OF_ATTACKS = [
@@ -51,6 +54,131 @@ LIST_OF_BUGS = [
 ]
 
 
+# Lines that mean that TLS-Scanner did not scan the host at all
+LIST_OF_ERRORS = [
+    "Cannot reach the Server",
+    "Server does not seem to support SSL",
+]
+
+# Certificate fields to save from "Certificate Chain" section
+LIST_OF_CERTIFICATE_FIELDS = [
+    "Fingerprint",
+    "Subject",
+    "CommonNames",
+    "AltNames",
+    "Valid From",
+    "Valid Till",
+    "PublicKey",
+    "Signature Algorithm",
+    "Hash Algorithm",
+    "Issuer",
+]
+
+# Names in lists above are regex-escaped, report contains them unescaped
+_ENTITY_BY_NAME = {
+    **{sub(r"\\(.)", r"\1", attack): ("attacks", attack) for attack in LIST_OF_ATTACKS},
+    **{sub(r"\\(.)", r"\1", bug): ("bugs", bug) for bug in LIST_OF_BUGS},
+}
+_CERTIFICATE_FIELDS = set(LIST_OF_CERTIFICATE_FIELDS)
+_ENTITY_VALUE_PATTERN = compile(r" (\w+)")
+_PROTOCOL_VERSION_PATTERN = compile(r"(?:SSL|TLS|DTLS)\s?\d\.\d")
+_FILENAME_PATTERN = compile(r"(\d+.\d+.\d+.\d+)-(\d+)-(\w+)-(.+).txt")
+
+
+def parse_tls_report(lines: Iterable[str]) -> dict or None:
+    """
+    Parse TLS-Scanner report in one pass, line by line. Every
+    "name : value" line is split once and dispatched by name,
+    so report is not rescanned for every attack and bug.
+    :param lines: lines of report (file object is fine)
+    :return: dictionary with attacks, bugs, protocol versions,
+    cipher suites and certificates, or None if host was not scanned
+    """
+    attacks = {}
+    bugs = {}
+    versions = []
+    cipher_suites = []
+    certificates = []
+    current_certificate = {}
+    seen_entities = set()
+
+    in_versions = in_cipher_suites = in_certificates = False
+    section_expected = False
+    for line in lines:
+        if line.startswith("----------"):
+            section_expected = True
+            continue
+        if section_expected:
+            # Title of section comes right after separator
+            section = line.strip()
+            if section:
+                in_versions = "Versions" in section
+                in_cipher_suites = "Ciphersuites" in section
+                in_certificates = section.startswith("Certificate")
+                section_expected = False
+            continue
+
+        key, colon, value = line.partition(":")
+        if not colon:
+            if in_cipher_suites:
+                cipher_suite = line.strip()
+                if cipher_suite.startswith(("TLS_", "SSL_")):
+                    cipher_suite = cipher_suite.split()[0]
+                    if cipher_suite not in cipher_suites:
+                        cipher_suites.append(cipher_suite)
+                continue
+            for error in LIST_OF_ERRORS:
+                if error in line:
+                    return None
+            continue
+
+        name = key.strip()
+        entity = _ENTITY_BY_NAME.get(name)
+        if entity:
+            # Only the first result for every entity is used
+            if entity in seen_entities or not key[-1:].isspace():
+                continue
+            entity_value = _ENTITY_VALUE_PATTERN.match(value)
+            if not entity_value:
+                continue
+            seen_entities.add(entity)
+            if entity_value.group(1) == "true":
+                ent_type, ent_name = entity
+                found = attacks if ent_type == "attacks" else bugs
+                found[ent_name] = True
+        elif in_versions:
+            if _PROTOCOL_VERSION_PATTERN.fullmatch(name):
+                if value.strip().startswith("true") and name not in versions:
+                    versions.append(name)
+        elif in_certificates:
+            if name in _CERTIFICATE_FIELDS:
+                # Repeated field means that next certificate of chain is started
+                if name in current_certificate:
+                    certificates.append(current_certificate)
+                    current_certificate = {}
+                current_certificate[name] = value.strip()
+
+    if current_certificate:
+        certificates.append(current_certificate)
+    return dict(
+        attacks=attacks,
+        bugs=bugs,
+        versions=versions,
+        cipher_suites=cipher_suites,
+        certificates=certificates,
+    )
+
+
+def parse_tls_report_file(path: str) -> dict or None:
+    """
+    Parse TLS-Scanner report file, used by parsing processes pool
+    :param path: path to report
+    :return: parsed report or None if host was not scanned
+    """
+    with open(path, mode="r") as host_tls_results:
+        return parse_tls_report(host_tls_results)
+
+
 class TlsParser:
     def __init__(self, hosts: dict) -> None:
         self.hosts: dict = hosts
@@ -61,33 +189,13 @@ class TlsParser:
         :param results: results for some host
         :return: dictionaries with attacks and bugs
         """
+        report = parse_tls_report(results.splitlines())
 
         # Return tuple with errors in case when
         # Some error was happened during TLS-Scanning
-        if "Cannot reach the Server" in results:
+        if report is None:
             return "error", "error"
-        if "Server does not seem to support SSL" in results:
-            return "error", "error"
-
-        # Parse attacks from results
-        attacks = {}
-        for attack in LIST_OF_ATTACKS:
-            attack_res = findall(r"{attack}\s+: (\w+)".format(attack=attack), results)
-            if not attack_res:
-                continue
-            if attack_res[0] == "true":
-                attacks.update({attack: True})
-
-        # Parse bugs from results
-        bugs = {}
-        for bug in LIST_OF_BUGS:
-            bug_res = findall(r"{bug}\s+: (\w+)".format(bug=bug), results)
-            if not bug_res:
-                continue
-            if bug_res[0] == "true":
-                bugs.update({bug: True})
-
-        return attacks, bugs
+        return report.get("attacks"), report.get("bugs")
 
     def _search_vulnerabilities(self, host_ip: str) -> list:
         """
@@ -108,6 +216,68 @@ class TlsParser:
             vulners_vulns = list(vulners_vulns.keys())
         return list(set(list(shodan_vulns + vulners_vulns)))
 
+    def _load_parsed_reports(
+        self,
+        full_path: Path,
+        workers: int = DefaultTlsParserValues.PARSE_WORKERS,
+    ) -> dict:
+        """
+        Get parsed reports for all the files in TLS results directory.
+        Reports that were parsed on previous runs are taken from index,
+        new or changed reports are parsed with pool of processes.
+        :param full_path: directory with TLS results
+        :param workers: quantity of parsing processes
+        :return: dictionary {filename: parsed report}
+        """
+        files_stats = {}
+        for file in listdir(full_path):
+            if not _FILENAME_PATTERN.findall(file):
+                continue
+            file_stat = stat(full_path.joinpath(file))
+            files_stats[file] = (file_stat.st_mtime, file_stat.st_size)
+
+        report_index = TlsReportIndex(dest_dir=str(full_path.parent))
+        try:
+            indexed_reports = report_index.get_all()
+            reports = {}
+            files_to_parse = []
+            for file, file_stat in files_stats.items():
+                indexed = indexed_reports.get(file)
+                if indexed and indexed[:2] == file_stat:
+                    reports[file] = indexed[2]
+                else:
+                    files_to_parse.append(file)
+
+            paths = [str(full_path.joinpath(file)) for file in files_to_parse]
+            if len(paths) < DefaultTlsParserValues.PARALLEL_PARSE_THRESHOLD:
+                parsed_reports = map(parse_tls_report_file, paths)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as parse_pool:
+                    parsed_reports = list(
+                        parse_pool.map(
+                            parse_tls_report_file,
+                            paths,
+                            chunksize=DefaultTlsParserValues.PARSE_CHUNK_SIZE,
+                        )
+                    )
+            new_reports = []
+            for file, report in zip(files_to_parse, parsed_reports):
+                reports[file] = report
+                new_reports.append((file, *files_stats[file], report))
+
+            print(
+                f"TLS reports: {len(files_stats)} total, "
+                f"{len(files_to_parse)} parsed, "
+                f"{len(files_stats) - len(files_to_parse)} from index"
+            )
+            report_index.put_many(new_reports)
+            report_index.remove_many(
+                [file for file in indexed_reports.keys() if file not in files_stats]
+            )
+        finally:
+            report_index.close()
+        return reports
+
     def load_tls_scan_results(
         self,
         dest_dir: str = DefaultValues.RESULTS_DIRECTORY,
@@ -121,44 +291,45 @@ class TlsParser:
         """
         all_results = {}
         full_path = Path(".").joinpath(dest_dir).joinpath(tls_dir)
+        reports = self._load_parsed_reports(full_path)
 
         for file in listdir(full_path):
-            with open(full_path.joinpath(file), mode="r") as host_tls_results:
-                results = host_tls_results.read()
-
-                attacks, bugs = self._parse_attacks(results)
-                if attacks == "error" and bugs == "error":
-                    continue
-
-                search_pattern = findall(
-                    r"(\d+.\d+.\d+.\d+)-(\d+)-(\w+)-(.+).txt", file
+            search_pattern = _FILENAME_PATTERN.findall(file)
+            if not search_pattern:
+                continue
+            report = reports.get(file)
+            if report is None:
+                continue
+            attacks = report.get("attacks")
+            bugs = report.get("bugs")
+
+            ip, port, vendor, product = search_pattern[0]
+            vendor = vendor.replace("_", " ")
+            product = product.replace("_", " ")
+            vulnerabilities = self._search_vulnerabilities(host_ip=ip)
+
+            if not all_results.get(ip):
+                all_results.update(
+                    {
+                        ip: dict(
+                            vendor=vendor,
+                            product=product,
+                            port=port,
+                            attacks=attacks,
+                            bugs=bugs,
+                            vulnerabilities=vulnerabilities,
+                            versions=report.get("versions"),
+                            cipher_suites=report.get("cipher_suites"),
+                            certificates=report.get("certificates"),
+                        )
+                    }
                 )
-                if not search_pattern:
-                    continue
-                ip, port, vendor, product = search_pattern[0]
-                vendor = vendor.replace("_", " ")
-                product = product.replace("_", " ")
-                vulnerabilities = self._search_vulnerabilities(host_ip=ip)
-
-                if not all_results.get(ip):
-                    all_results.update(
-                        {
-                            ip: dict(
-                                vendor=vendor,
-                                product=product,
-                                port=port,
-                                attacks=attacks,
-                                bugs=bugs,
-                                vulnerabilities=vulnerabilities,
-                            )
-                        }
-                    )
 
-                if self.hosts.get(ip):
-                    if attacks:
-                        self.hosts[ip].update(dict(attacks=attacks))
-                    if bugs:
-                        self.hosts[ip].update(dict(bugs=bugs))
+            if self.hosts.get(ip):
+                if attacks:
+                    self.hosts[ip].update(dict(attacks=attacks))
+                if bugs:
+                    self.hosts[ip].update(dict(bugs=bugs))
 
         unique_attacks = self.count_unique_entities(all_results, ent_type="attacks")
         unique_bugs = self.count_unique_entities(all_results, ent_type="bugs")
@@ -234,7 +405,18 @@ class TlsParser:
             full_path = Path(".").joinpath(dest_dir).joinpath(sub_dir)
             full_path.mkdir(parents=True, exist_ok=True)
             full_path = full_path.joinpath(filename)
-            csv_columns = ["ip", "vendor", "product", "port", "attacks", "bugs", "vulnerabilities"]
+            csv_columns = [
+                "ip",
+                "vendor",
+                "product",
+                "port",
+                "attacks",
+                "bugs",
+                "vulnerabilities",
+                "versions",
+                "cipher_suites",
+                "certificates",
+            ]
 
             with open(full_path, "w") as csv_file:
                 writer = DictWriter(csv_file, fieldnames=csv_columns)
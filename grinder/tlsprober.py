@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+
+import asyncio
+import ssl
+from os import remove
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+from grinder.defaultvalues import DefaultTlsProberValues
+
+
+class TlsProbeResult:
+    """
+    Possible results of TLS handshake on one port
+    """
+
+    TLS = "tls"
+    NOT_TLS = "not_tls"
+    CLOSED = "closed"
+    AMBIGUOUS = "ambiguous"
+
+
+_decode_warning_lock = Lock()
+_decode_warning_shown = False
+
+
+def _warn_decode_unavailable() -> None:
+    """
+    Tell once that certificates can not be decoded
+
+    :return None:
+    """
+    global _decode_warning_shown
+    with _decode_warning_lock:
+        if _decode_warning_shown:
+            return
+        _decode_warning_shown = True
+    print(
+        "[TlsProber: Warning] Certificate decoding is not available in this "
+        "Python build, only PEM certificates will be saved"
+    )
+
+
+def decode_certificate(der_certificate: bytes) -> dict or None:
+    """
+    Decode DER certificate to the same dictionary as
+    SSLSocket.getpeercert() returns for verified peers.
+    There is no public API for it, so private CPython function
+    is used, and it can decode certificates only from file.
+    That is why decoding must be enabled explicitly, and it is
+    blocking call that must be run outside of event loop.
+
+    :param der_certificate (bytes): certificate in DER
+    :return dict: decoded certificate, None if it can not be decoded
+    """
+    decode = getattr(getattr(ssl, "_ssl", None), "_test_decode_cert", None)
+    if not decode:
+        _warn_decode_unavailable()
+        return None
+    with NamedTemporaryFile(mode="w", suffix=".pem", delete=False) as pem_file:
+        pem_file.write(ssl.DER_cert_to_PEM_cert(der_certificate))
+    try:
+        return decode(pem_file.name)
+    except Exception:
+        return None
+    finally:
+        remove(pem_file.name)
+
+
+def format_certificate(certificate: dict) -> str:
+    """
+    Make text description of decoded certificate
+    in the same way as Nmap "ssl-cert" script does
+
+    :param certificate (dict): decoded certificate
+    :return str: certificate description
+    """
+
+    def format_name(name: tuple) -> str:
+        return "/".join(
+            f"{key}={value}" for relative_name in name for key, value in relative_name
+        )
+
+    lines = []
+    if certificate.get("subject"):
+        lines.append(f"Subject: {format_name(certificate['subject'])}")
+    if certificate.get("subjectAltName"):
+        alt_names = ", ".join(
+            f"{kind}:{value}" for kind, value in certificate["subjectAltName"]
+        )
+        lines.append(f"Subject Alternative Name: {alt_names}")
+    if certificate.get("issuer"):
+        lines.append(f"Issuer: {format_name(certificate['issuer'])}")
+    if certificate.get("notBefore"):
+        lines.append(f"Not valid before: {certificate['notBefore']}")
+    if certificate.get("notAfter"):
+        lines.append(f"Not valid after:  {certificate['notAfter']}")
+    return "\n".join(lines)
+
+
+class TlsHandshakeProber:
+    """
+    Find TLS ports with real TLS handshakes instead of Nmap
+    version and script scan. Certificates and negotiated
+    parameters are saved for every TLS port.
+    """
+
+    def __init__(
+        self,
+        ports: list = None,
+        timeout: float = DefaultTlsProberValues.TIMEOUT,
+        concurrency: int = DefaultTlsProberValues.CONCURRENCY,
+        decode_certificates: bool = DefaultTlsProberValues.DECODE_CERTIFICATES,
+    ):
+        self.ports: list = ports or DefaultTlsProberValues.PORTS
+        self.timeout: float = timeout
+        self.concurrency: int = max(int(concurrency), 1)
+        self.decode_certificates: bool = decode_certificates
+
+    @staticmethod
+    def _make_context() -> ssl.SSLContext:
+        """
+        Context that accepts any certificate, because
+        only handshake and certificate itself are needed
+
+        :return ssl.SSLContext: client TLS context
+        """
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        context.set_alpn_protocols(DefaultTlsProberValues.ALPN_PROTOCOLS)
+        return context
+
+    @staticmethod
+    def _convert_chain(der_chain: list, decode: bool = False) -> list:
+        """
+        Convert all the certificates of chain to PEM
+        and decode them if decoding is enabled
+
+        :param der_chain (list): certificates in DER
+        :param decode (bool): decode certificates too
+        :return list: PEM and decoded form of every certificate
+        """
+        return [
+            {
+                "pem": ssl.DER_cert_to_PEM_cert(der_certificate),
+                "decoded": decode_certificate(der_certificate) if decode else None,
+            }
+            for der_certificate in der_chain
+        ]
+
+    @staticmethod
+    def _get_handshake_info(ssl_object: ssl.SSLObject) -> (dict, list):
+        """
+        Get negotiated parameters and certificates of connection
+
+        :param ssl_object (ssl.SSLObject): established TLS connection
+        :return tuple: version, cipher and ALPN, certificates in DER
+        """
+        # Full chain is available since Python 3.13 only
+        get_chain = getattr(ssl_object, "get_unverified_chain", None)
+        if get_chain:
+            der_chain = list(get_chain() or [])
+        else:
+            leaf = ssl_object.getpeercert(binary_form=True)
+            der_chain = [leaf] if leaf else []
+
+        cipher = ssl_object.cipher()
+        handshake_info = {
+            "version": ssl_object.version(),
+            "cipher": cipher[0] if cipher else None,
+            "alpn": ssl_object.selected_alpn_protocol(),
+        }
+        return handshake_info, der_chain
+
+    async def _probe_port(
+        self, context: ssl.SSLContext, host: str, port: int
+    ) -> (str, dict or None):
+        """
+        Try TLS handshake on one port of host
+
+        :param context (ssl.SSLContext): client TLS context
+        :param host (str): host ip
+        :param port (int): port to check
+        :return tuple: result of probe and handshake info for TLS ports
+        """
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=context),
+                timeout=self.timeout,
+            )
+        except ConnectionRefusedError:
+            return TlsProbeResult.CLOSED, None
+        except ssl.SSLError:
+            # Port is open, but there is no TLS on it
+            return TlsProbeResult.NOT_TLS, None
+        except ConnectionResetError:
+            return TlsProbeResult.NOT_TLS, None
+        except (asyncio.TimeoutError, OSError):
+            # Filtered port or stalled handshake, only Nmap can tell
+            return TlsProbeResult.AMBIGUOUS, None
+        try:
+            handshake_info, der_chain = self._get_handshake_info(
+                writer.get_extra_info("ssl_object")
+            )
+        finally:
+            writer.close()
+            try:
+                await asyncio.wait_for(writer.wait_closed(), timeout=self.timeout)
+            except (asyncio.TimeoutError, OSError, ssl.SSLError):
+                pass
+        if self.decode_certificates:
+            # Decoding writes temporary files, so it must not block event loop
+            loop = asyncio.get_running_loop()
+            handshake_info["certificates"] = await loop.run_in_executor(
+                None, self._convert_chain, der_chain, True
+            )
+        else:
+            handshake_info["certificates"] = self._convert_chain(der_chain)
+        return TlsProbeResult.TLS, handshake_info
+
+    async def _probe_worker(
+        self, context: ssl.SSLContext, jobs: asyncio.Queue, probes: dict
+    ) -> None:
+        """
+        Take jobs from queue until stop marker (None) is received
+
+        :param context (ssl.SSLContext): client TLS context
+        :param jobs (asyncio.Queue): queue of (host, port) jobs
+        :param probes (dict): results {ip: {port: probe}}
+        :return None:
+        """
+        while True:
+            job = await jobs.get()
+            if job is None:
+                return
+            host, port = job
+            try:
+                probes[host][port] = await self._probe_port(context, host, port)
+            except Exception:
+                # Unexpected error on this port, let Nmap decide
+                probes[host][port] = TlsProbeResult.AMBIGUOUS, None
+
+    async def _probe_hosts(self, hosts: dict) -> dict:
+        """
+        Probe all the ports of hosts with fixed number of worker
+        tasks, jobs are fed through bounded queue, so only
+        "concurrency" jobs are in memory at once
+
+        :param hosts (dict): ports of hosts {ip: [ports]}
+        :return dict: {ip: {port: (probe result, handshake info)}}
+        """
+        context = self._make_context()
+        # Results keep the order of hosts and ports
+        probes: dict = {host: dict.fromkeys(ports) for host, ports in hosts.items()}
+        jobs: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        jobs_quantity = sum(len(ports) for ports in hosts.values())
+        workers = [
+            asyncio.ensure_future(self._probe_worker(context, jobs, probes))
+            for _ in range(max(min(self.concurrency, jobs_quantity), 1))
+        ]
+        try:
+            for host, ports in hosts.items():
+                for port in ports:
+                    await jobs.put((host, port))
+            for _ in workers:
+                await jobs.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        return probes
+
+    def probe(self, hosts: list, extra_ports: dict = None) -> dict:
+        """
+        Try TLS handshakes on all the candidate ports of hosts
+
+        :param hosts (list): list of host ips
+        :param extra_ports (dict): additional ports for hosts {ip: [ports]}
+        :return dict: {ip: {port: (probe result, handshake info)}}
+        """
+        extra_ports = extra_ports or {}
+        hosts_ports = {}
+        for host in hosts:
+            ports = list(self.ports)
+            for port in extra_ports.get(host) or []:
+                if str(port).isdigit() and int(port) not in ports:
+                    ports.append(int(port))
+            hosts_ports[host] = ports
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self._probe_hosts(hosts_ports))
+        finally:
+            loop.close()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import sqlite3
+from json import dumps as json_dumps
+from json import loads as json_loads
+from pathlib import Path
+
+from grinder.decorators import exception_handler
+from grinder.defaultvalues import (
+    DefaultTlsParserValues,
+    DefaultTlsReportIndexValues,
+    DefaultValues,
+)
+from grinder.errors import (
+    GrinderTlsReportIndexOpenError,
+    GrinderTlsReportIndexGetError,
+    GrinderTlsReportIndexPutError,
+    GrinderTlsReportIndexCloseError,
+)
+
+
+class TlsReportIndex:
+    """
+    Index of already parsed TLS-Scanner reports, keyed by
+    filename and checked by mtime and size of report, so
+    only new or changed reports must be parsed again
+    """
+
+    def __init__(
+        self,
+        dest_dir: str = DefaultValues.RESULTS_DIRECTORY,
+        sub_dir: str = DefaultTlsParserValues.PARSED_RESULTS_DIR,
+    ):
+        self.index_path = (
+            Path(".")
+            .joinpath(dest_dir)
+            .joinpath(sub_dir)
+            .joinpath(DefaultTlsReportIndexValues.INDEX_FILE)
+        )
+        self.connection = None
+
+    @exception_handler(expected_exception=GrinderTlsReportIndexOpenError)
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open index database, create it if needed
+
+        :return sqlite3.Connection: index database connection
+        """
+        if self.connection:
+            return self.connection
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.index_path))
+        with self.connection as db_connection:
+            db_connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS
+                tls_reports(
+                    filename TEXT PRIMARY KEY,
+                    mtime REAL,
+                    size INTEGER,
+                    report TEXT
+                )
+                """
+            )
+        return self.connection
+
+    @exception_handler(expected_exception=GrinderTlsReportIndexGetError)
+    def get_all(self) -> dict:
+        """
+        Get all the parsed reports from index
+
+        :return dict: {filename: (mtime, size, report)}
+        """
+        connection = self._connect()
+        return {
+            filename: (mtime, size, json_loads(report))
+            for filename, mtime, size, report in connection.execute(
+                "SELECT filename, mtime, size, report FROM tls_reports"
+            )
+        }
+
+    @exception_handler(expected_exception=GrinderTlsReportIndexPutError)
+    def put_many(self, reports: list) -> None:
+        """
+        Save parsed reports to index in one transaction
+
+        :param reports (list): [(filename, mtime, size, report)], report
+        is None if TLS-Scanner did not scan the host
+        :return None:
+        """
+        connection = self._connect()
+        with connection as db_connection:
+            db_connection.executemany(
+                """
+                INSERT OR REPLACE INTO
+                tls_reports(filename, mtime, size, report)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (filename, mtime, size, json_dumps(report))
+                    for filename, mtime, size, report in reports
+                ],
+            )
+
+    @exception_handler(expected_exception=GrinderTlsReportIndexPutError)
+    def remove_many(self, filenames: list) -> None:
+        """
+        Remove reports that are not in results directory anymore
+
+        :param filenames (list): names of report files to remove
+        :return None:
+        """
+        connection = self._connect()
+        with connection as db_connection:
+            db_connection.executemany(
+                "DELETE FROM tls_reports WHERE filename = ?",
+                [(filename,) for filename in filenames],
+            )
+
+    @exception_handler(expected_exception=GrinderTlsReportIndexCloseError)
+    def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
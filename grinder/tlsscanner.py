@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from itertools import zip_longest
 from os import listdir
 from pathlib import Path
@@ -12,9 +12,16 @@ from nmap import PortScanner
 from termcolor import cprint
 
 from grinder.decorators import create_results_directory, create_subdirectory, timer, exception_handler
-from grinder.defaultvalues import DefaultTlsScannerValues, DefaultValues
+from grinder.defaultvalues import (
+    DefaultTlsProberValues,
+    DefaultTlsScannerValues,
+    DefaultValues,
+)
 from grinder.errors import GrinderCoreTlsScanner
 from grinder.nmapprocessmanager import NmapProcessingManager
+from grinder.tcpprober import TcpConnectProber
+from grinder.tlsprober import TlsHandshakeProber, TlsProbeResult, format_certificate
+from grinder.tlsscannerservice import TlsScannerServicePool
 
 
 class TlsScanner:
@@ -27,6 +34,7 @@ class TlsScanner:
         self.all_ports: dict = {}
         self.alive_hosts_with_ports: dict = {}
         self.n: int = n
+        self.scanned_results: set or None = None
 
     def _grouper(self, n: int, iterable: Iterable, padding=None) -> Iterator:
         """
@@ -50,7 +58,10 @@ class TlsScanner:
                 host_info.update({"tls_status": "offline"})
 
     def sort_hosts_by_product(
-        self, hosts: dict, product_limit: int = DefaultTlsScannerValues.PRODUCT_LIMIT
+        self,
+        hosts: dict,
+        product_limit: int = DefaultTlsScannerValues.PRODUCT_LIMIT,
+        stratify_by: str = DefaultTlsScannerValues.PRODUCT_STRATIFY_BY,
     ) -> dict:
         """
         Sort hosts by unique products in limited quantity
@@ -58,24 +69,42 @@ class TlsScanner:
         better to divide it into parts)
         :param hosts: dictionary with hosts
         :param product_limit: limit of products for separating
+        :param stratify_by: host field ("country", "port") to take hosts
+        of every product evenly from, first hosts are taken if not set
         :return: hosts in limited quantity that was set in product_limit
         """
         if not product_limit:
             return hosts
 
+        # Group hosts by products (and strata) in one pass
+        products: dict = {}
+        for ip, host in hosts.items():
+            strata = products.setdefault(host.get("product"), {})
+            stratum = host.get(stratify_by) if stratify_by else None
+            strata.setdefault(stratum, []).append(ip)
+
         # Take all unique products and print it
-        unique_products = list(set([host.get("product") for host in hosts.values()]))
-        print("Unique products:", str(unique_products))
-
-        # Add hosts until product limit
-        fixed_hosts = {}
-        for product in unique_products:
-            current_product_quantity = 0
-            for ip, host in hosts.items():
-                if host.get("product") == product and current_product_quantity < product_limit:
-                    fixed_hosts.update({ip: host})
-                    current_product_quantity += 1
-        return fixed_hosts
+        print("Unique products:", str(list(products.keys())))
+
+        # Take hosts round-robin from strata until product limit
+        fixed_ips = set()
+        for strata in products.values():
+            strata_ips = list(strata.values())
+            taken = 0
+            depth = 0
+            while taken < product_limit and strata_ips:
+                for stratum_ips in strata_ips:
+                    if taken >= product_limit:
+                        break
+                    fixed_ips.add(stratum_ips[depth])
+                    taken += 1
+                depth += 1
+                strata_ips = [
+                    stratum_ips for stratum_ips in strata_ips if len(stratum_ips) > depth
+                ]
+
+        # Keep original order of hosts
+        return {ip: host for ip, host in hosts.items() if ip in fixed_ips}
 
     def _remove_already_scanned_hosts(self, hosts: dict) -> dict:
         """
@@ -84,8 +113,8 @@ class TlsScanner:
         :param hosts: dictionary with hosts
         :return: hosts
         """
-        copy_hosts = deepcopy(hosts)
-        for ip, info in copy_hosts.items():
+        hosts_quantity = len(hosts)
+        for ip, info in list(hosts.items()):
             vendor = info.get("vendor")
             product = info.get("product")
             port = info.get("port")
@@ -97,39 +126,64 @@ class TlsScanner:
                 if self._is_host_already_scanned(name_of_file):
                     hosts.pop(ip)
                     break
-        difference = len(list(copy_hosts.keys())) - len(list(hosts.keys()))
+        difference = hosts_quantity - len(hosts)
         # Return number of already scanned hosts
         print(f"Remove already scanned hosts: {str(difference)}")
         return hosts
 
-    def sort_alive_hosts(self) -> None:
+    def _ping_group(self, group_ips: list) -> list:
+        """
+        Make pingscan for one group of hosts. Every call
+        has own PortScanner, so groups can be scanned
+        from different threads at the same time
+        :param group_ips: list of hosts ips
+        :return: list of alive hosts
+        """
+        nm = PortScanner()
+        nm.scan(
+            hosts=" ".join(group_ips),
+            arguments=DefaultTlsScannerValues.NMAP_PING_SCAN_ARGS,
+        )
+        return [ip for ip in nm.all_hosts() if nm[ip]["status"]["state"] == "up"]
+
+    def sort_alive_hosts(
+        self,
+        stratify_by: str = DefaultTlsScannerValues.PRODUCT_STRATIFY_BY,
+        ping_workers: int = DefaultTlsScannerValues.PING_WORKERS,
+        ping_method: str = DefaultTlsScannerValues.PING_METHOD,
+    ) -> None:
         """
         Make fast pingscan for all hosts to check
         if it needed to be scanned with TLS-Scanner
         (reject all offline hosts)
+        :param stratify_by: host field to take hosts of every product evenly from
+        :param ping_workers: quantity of groups pinged at the same time
+        :param ping_method: "nmap" for nmap pingscan, "tcp" for TCP connect probe
+        that does not require any privileges
         :return: None
         """
-        nm = PortScanner()
         self.hosts = self._remove_already_scanned_hosts(self.hosts)
-        self.hosts = self.sort_hosts_by_product(self.hosts)
+        self.hosts = self.sort_hosts_by_product(self.hosts, stratify_by=stratify_by)
         hosts_ip = list(self.hosts.keys())
+
+        if ping_method == "tcp":
+            print(f"│ Do TCP connect probe for {len(hosts_ip)} hosts")
+            self.alive_hosts = TcpConnectProber().probe(hosts_ip)
+            print(f"└ Done TCP connect probe for {len(hosts_ip)} hosts")
+            self._set_ping_status()
+            return
+
         groups = self._grouper(self.n, hosts_ip)
-        groups = [list(group) for group in groups]
+        groups = [[ip for ip in group if ip] for group in groups]
         groups_len = len(groups)
 
-        for index, group in enumerate(groups):
+        def ping_group(index: int, group_ips: list) -> list:
             print(f"│ Do pingscan for {self.n} hosts ({index}/{groups_len})")
-            group_ips = [ip for ip in group if ip]
-            hosts_in_nmap_format = " ".join(group_ips)
-            nm.scan(
-                hosts=hosts_in_nmap_format,
-                arguments=DefaultTlsScannerValues.NMAP_PING_SCAN_ARGS,
-            )
-            results = nm.all_hosts()
-            alive_hosts_group = [
-                ip for ip in results if nm[ip]["status"]["state"] == "up"
-            ]
-            groups[index] = alive_hosts_group
+            return self._ping_group(group_ips)
+
+        # Results are returned in order of groups, as for sequential scan
+        with ThreadPoolExecutor(max_workers=max(ping_workers or 1, 1)) as ping_pool:
+            groups = list(ping_pool.map(ping_group, range(groups_len), groups))
 
         print(f"└ Done pingscan for {len(hosts_ip)} hosts")
         groups_flat = [host for group in groups for host in group]
@@ -140,6 +194,87 @@ class TlsScanner:
         self,
         host_timeout: int = DefaultTlsScannerValues.TLS_DETECTION_HOST_TIMEOUT,
         tls_workers: int = DefaultTlsScannerValues.TLS_NMAP_WORKERS,
+        detect_method: str = DefaultTlsScannerValues.TLS_DETECTION_METHOD,
+        decode_certificates: bool = DefaultTlsProberValues.DECODE_CERTIFICATES,
+    ) -> None:
+        """
+        Detect all SSL/TLS ports of alive hosts. With "nmap" method
+        all the hosts are scanned with Nmap, with "probe" method TLS
+        handshakes are made directly, and only hosts with ambiguous
+        results (no answer in time) are scanned with Nmap after that.
+        :param host_timeout: host timeout for scanning
+        :param tls_workers: quantity of TLS/Nmap workers
+        :param detect_method: "nmap" or "probe"
+        :param decode_certificates: save "ssl_cert" of probed hosts,
+        decoding is done with private CPython API
+        :return:
+        """
+        if detect_method != "probe":
+            self._detect_tls_ports_nmap(
+                self.alive_hosts, host_timeout=host_timeout, tls_workers=tls_workers
+            )
+            return
+
+        probes = TlsHandshakeProber(decode_certificates=decode_certificates).probe(
+            self.alive_hosts,
+            extra_ports={
+                host: [self.hosts[host].get("port")]
+                for host in self.alive_hosts
+                if self.hosts.get(host)
+            },
+        )
+        ambiguous_hosts = []
+        for host, ports in probes.items():
+            handshakes = {}
+            for port, probe in ports.items():
+                probe_result, handshake = probe
+                if probe_result in [TlsProbeResult.TLS, TlsProbeResult.NOT_TLS]:
+                    self.all_ports.setdefault(host, []).append(port)
+                if probe_result == TlsProbeResult.TLS:
+                    handshakes[port] = handshake
+            if not handshakes:
+                if TlsProbeResult.AMBIGUOUS in [result for result, _ in ports.values()]:
+                    ambiguous_hosts.append(host)
+                continue
+            self.tls_ports[host] = list(handshakes.keys())
+            self.hosts[host].update({"tls_ports": self.tls_ports[host]})
+            self.hosts[host].update(
+                {
+                    "tls_handshakes": {
+                        str(port): {
+                            "version": handshake.get("version"),
+                            "cipher": handshake.get("cipher"),
+                            "alpn": handshake.get("alpn"),
+                            "certificates": [
+                                certificate.get("pem")
+                                for certificate in handshake.get("certificates")
+                            ],
+                        }
+                        for port, handshake in handshakes.items()
+                    }
+                }
+            )
+            # Certificate of the first TLS port, as Nmap "ssl-cert" does
+            certificates = list(handshakes.values())[0].get("certificates")
+            if certificates and certificates[0].get("decoded"):
+                self.hosts[host].update(
+                    {"ssl_cert": format_certificate(certificates[0].get("decoded"))}
+                )
+
+        print(
+            f"│ TLS handshakes: {len(self.tls_ports)} hosts with TLS, "
+            f"{len(ambiguous_hosts)} ambiguous hosts left for Nmap"
+        )
+        if ambiguous_hosts:
+            self._detect_tls_ports_nmap(
+                ambiguous_hosts, host_timeout=host_timeout, tls_workers=tls_workers
+            )
+
+    def _detect_tls_ports_nmap(
+        self,
+        hosts: list,
+        host_timeout: int = DefaultTlsScannerValues.TLS_DETECTION_HOST_TIMEOUT,
+        tls_workers: int = DefaultTlsScannerValues.TLS_NMAP_WORKERS,
     ) -> None:
         """
         This function tries to detect all SSL/TLS ports
@@ -148,11 +283,12 @@ class TlsScanner:
         define if current service/port got SSL cert or something
         like this. If we got this information, we can assume
         that this is TLS/SSL port/service.
+        :param hosts: list of hosts to scan
         :param host_timeout: host timeout for scanning
         :param tls_workers: quantity of TLS/Nmap workers
         :return:
         """
-        hosts_in_nmap_format = [{"ip": ip, "port": ""} for ip in self.alive_hosts]
+        hosts_in_nmap_format = [{"ip": ip, "port": ""} for ip in hosts]
         ssl_scan = NmapProcessingManager(
             hosts=hosts_in_nmap_format,
             arguments=f"-Pn -T4 -A -sT --top-ports 50 --host-timeout={host_timeout}s",
@@ -204,31 +340,24 @@ class TlsScanner:
             else:
                 self.alive_hosts_with_ports[host] = 443
 
-    @timer
-    @exception_handler(expected_exception=GrinderCoreTlsScanner)
-    def _run_tls_on_host(
-        self,
-        scanner_path: Path or str,
+    @staticmethod
+    def _get_tls_scanner_arguments(
         host: str,
         port: int or str,
         report_detail: str,
         scan_detail: str,
-        threads: int or str
-    ) -> str or None:
+        threads: int or str,
+    ) -> list:
         """
-        Call TLS-Scanner module to scan TLS configuration, attacks and bugs
-        :param scanner_path: path to TLS-Scanner jar file
+        Make list of TLS-Scanner command line arguments for host
         :param host: host URL or ip
         :param port: port to scan (443, 8443, etc.)
         :param report_detail: details of reports ("NORMAL" by default)
         :param scan_detail: details of scanning ("NORMAL" by default)
-        :param threads: quantity of scanning threads (overallThreads, parallelProbes - 4/4 by default)
-        :return: results of tls scanning or nothing in case of fail/error
+        :param threads: quantity of scanning threads
+        :return: list of arguments
         """
-        command = [
-            "java",
-            "-jar",
-            scanner_path,
+        return [
             "-connect",
             str(host) + ":" + str(port),
             "-noColor",
@@ -242,16 +371,55 @@ class TlsScanner:
             "-parallelProbes",
             str(threads),
         ]
-        try:
-            tls_scanner_res = check_output(
-                command,
-                universal_newlines=True,
-                timeout=DefaultTlsScannerValues.TLS_SCANNER_TIMEOUT,
-                stderr=DEVNULL,
+
+    @timer
+    @exception_handler(expected_exception=GrinderCoreTlsScanner)
+    def _run_tls_on_host(
+        self,
+        scanner_path: Path or str,
+        host: str,
+        port: int or str,
+        report_detail: str,
+        scan_detail: str,
+        threads: int or str,
+        service_pool: TlsScannerServicePool = None,
+    ) -> str or None:
+        """
+        Call TLS-Scanner module to scan TLS configuration, attacks and bugs
+        :param scanner_path: path to TLS-Scanner jar file
+        :param host: host URL or ip
+        :param port: port to scan (443, 8443, etc.)
+        :param report_detail: details of reports ("NORMAL" by default)
+        :param scan_detail: details of scanning ("NORMAL" by default)
+        :param threads: quantity of scanning threads (overallThreads, parallelProbes - 4/4 by default)
+        :param service_pool: pool of long-lived TLS-Scanner services, if not set - new JVM is started for host
+        :return: results of tls scanning or nothing in case of fail/error
+        """
+        arguments = self._get_tls_scanner_arguments(
+            host=host,
+            port=port,
+            report_detail=report_detail,
+            scan_detail=scan_detail,
+            threads=threads,
+        )
+        if service_pool:
+            tls_scanner_res = service_pool.scan(
+                arguments, timeout=DefaultTlsScannerValues.TLS_SCANNER_TIMEOUT
             )
-        except TimeoutExpired:
-            print(f"└ Timeout expired: ", end="")
-            return
+            if not tls_scanner_res:
+                return
+        else:
+            command = ["java", "-jar", scanner_path] + arguments
+            try:
+                tls_scanner_res = check_output(
+                    command,
+                    universal_newlines=True,
+                    timeout=DefaultTlsScannerValues.TLS_SCANNER_TIMEOUT,
+                    stderr=DEVNULL,
+                )
+            except TimeoutExpired:
+                print(f"└ Timeout expired: ", end="")
+                return
 
         # Some kind of dirty hack to remove all the stupid ANSI console symbols
         ansi_escape = compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
@@ -259,21 +427,88 @@ class TlsScanner:
         print(f"└ ", end="")
         return tls_scanner_res
 
+    def _get_scanned_results(self) -> set:
+        """
+        Get names of all files with TLS results. Directory is listed
+        only once, after that the set is updated on every saved result
+        :return: set of filenames with results
+        """
+        if self.scanned_results is None:
+            tls_results_path = (
+                Path(".")
+                .joinpath(DefaultValues.RESULTS_DIRECTORY)
+                .joinpath(DefaultTlsScannerValues.TLS_SCANNER_RESULTS_DIR)
+            )
+            self.scanned_results = (
+                set(listdir(tls_results_path)) if tls_results_path.exists() else set()
+            )
+        return self.scanned_results
+
     def _is_host_already_scanned(self, name_of_file) -> bool:
         """
         Check if host was already scanned and results are in "TLS" directory
         :param name_of_file: name of file to check, without extension
         :return: answer to question "Is current host was already scanned?"
         """
-        if f"{name_of_file}.txt" in listdir(
-            Path(".")
-            .joinpath(DefaultValues.RESULTS_DIRECTORY)
-            .joinpath(DefaultTlsScannerValues.TLS_SCANNER_RESULTS_DIR)):
+        if f"{name_of_file}.txt" in self._get_scanned_results():
             print(f"Host was already scanned: {name_of_file}")
             return True
         else:
             return False
 
+    def _scan_host(
+        self,
+        index: int,
+        alive_hosts_quantity: int,
+        host: str,
+        port: int or str,
+        name_of_file: str,
+        report_detail: str,
+        scan_detail: str,
+        scanner_path: str,
+        threads: int,
+        service_pool: TlsScannerServicePool = None,
+    ) -> str or None:
+        """
+        Run TLS-Scanner on one host, this is the job for scanning pool
+        :param index: index of current host
+        :param alive_hosts_quantity: quantity of all hosts to scan
+        :param host: host to scan
+        :param port: port to scan
+        :param name_of_file: name of file to save results, without extension
+        :param report_detail: details of report
+        :param scan_detail: details of scan
+        :param scanner_path: path to jar of TLS-Scanner
+        :param threads: quantity of TLS-Scanner threads for current host
+        :param service_pool: pool of long-lived TLS-Scanner services
+        :return: results of TLS-Scanner or nothing in case of fail/error
+        """
+        vendor = self.hosts[host].get("vendor")
+        product = self.hosts[host].get("product")
+        cprint(
+            f"Start TLS scan for {index} from {alive_hosts_quantity} hosts",
+            "blue",
+            attrs=["bold"],
+        )
+        print(f"│ Vendor: {vendor}")
+        print(f"│ Product: {product}")
+        print(f"│ Host: {host}")
+        print(f"│ Port: {port}")
+        print(f"│ File to save: {name_of_file}.txt")
+        try:
+            return self._run_tls_on_host(
+                scanner_path=scanner_path,
+                host=host,
+                port=port,
+                report_detail=report_detail,
+                scan_detail=scan_detail,
+                threads=threads,
+                service_pool=service_pool,
+            )
+        except Exception as unexp_err:
+            print(f"└ TLS Scanning error for {host}:{port} ({str(unexp_err)})")
+            return
+
     @timer
     def start_tls_scan(
         self,
@@ -281,59 +516,117 @@ class TlsScanner:
         scan_detail: str = DefaultTlsScannerValues.TLS_SCANNER_SCAN_DETAIL,
         scanner_path: str = DefaultTlsScannerValues.TLS_SCANNER_PATH,
         threads: int = DefaultTlsScannerValues.TLS_SCANNER_THREADS,
+        workers: int = DefaultTlsScannerValues.TLS_SCANNER_WORKERS,
+        threads_budget: int = DefaultTlsScannerValues.TLS_SCANNER_THREADS_BUDGET,
+        service: bool = DefaultTlsScannerValues.TLS_SCANNER_SERVICE,
     ) -> None:
         """
-        Basic TLS-Scanner wrapper-runner to run scan on all hosts
+        Basic TLS-Scanner wrapper-runner to run scan on all hosts.
+        Up to "workers" TLS-Scanner processes are running at the same
+        time, and every finished report is saved as soon as it is ready.
         :param report_detail: details of report ("NORMAL" by default)
         :param scan_detail: details of scan ("NORMAL" by default)
         :param scanner_path: path to jar of TLS-Scanner
         :param threads: quantity of threads, 4/4 by default
+        :param workers: quantity of TLS-Scanner processes running in parallel
+        :param threads_budget: total quantity of TLS-Scanner threads for all
+        of the processes, if set - threads are divided between processes
+        :param service: use long-lived TLS-Scanner JVM services instead of
+        new JVM for every host
         :return: None
         """
+        workers = max(int(workers or 1), 1)
+        if threads_budget:
+            threads = max(int(threads_budget) // workers, 1)
+        cprint(
+            f"TLS-Scanner processes: {workers}, threads per process: {threads}",
+            "blue",
+            attrs=["bold"],
+        )
+
+        service_pool = (
+            TlsScannerServicePool(scanner_path=scanner_path, size=workers)
+            if service
+            else None
+        )
+
         alive_hosts_quantity = len(self.alive_hosts_with_ports.items())
-        for index, host_port in enumerate(self.alive_hosts_with_ports.items()):
-            host, port = host_port
-            cprint(
-                f"Start TLS scan for {index} from {alive_hosts_quantity} hosts",
-                "blue",
-                attrs=["bold"],
+        try:
+            self._run_tls_pool(
+                alive_hosts_quantity=alive_hosts_quantity,
+                report_detail=report_detail,
+                scan_detail=scan_detail,
+                scanner_path=scanner_path,
+                threads=threads,
+                workers=workers,
+                service_pool=service_pool,
             )
-            vendor = self.hosts[host].get("vendor")
-            product = self.hosts[host].get("product")
-            name_of_file = "{host}-{port}-{vendor}-{product}".format(
-                host=host, port=str(port), vendor=vendor, product=product
-            ).replace(" ", "_")
-            print(f"│ Vendor: {vendor}")
-            print(f"│ Product: {product}")
-            print(f"│ Host: {host}")
-            print(f"│ Port: {port}")
-            print(f"│ File to save: {name_of_file}.txt")
-
-            # Check if file already exists
-            if self._is_host_already_scanned(name_of_file):
-                continue
+        finally:
+            if service_pool:
+                service_pool.close()
+        print(f"TLS scan for {alive_hosts_quantity} hosts: ", end="")
 
-            try:
-                tls_scanner_res = self._run_tls_on_host(
-                    scanner_path=scanner_path,
+    def _run_tls_pool(
+        self,
+        alive_hosts_quantity: int,
+        report_detail: str,
+        scan_detail: str,
+        scanner_path: str,
+        threads: int,
+        workers: int,
+        service_pool: TlsScannerServicePool = None,
+    ) -> None:
+        """
+        Scan all the alive hosts with pool of workers
+        :param alive_hosts_quantity: quantity of all hosts to scan
+        :param report_detail: details of report
+        :param scan_detail: details of scan
+        :param scanner_path: path to jar of TLS-Scanner
+        :param threads: quantity of TLS-Scanner threads for every host
+        :param workers: quantity of hosts scanned in parallel
+        :param service_pool: pool of long-lived TLS-Scanner services
+        :return: None
+        """
+        with ThreadPoolExecutor(max_workers=workers) as tls_pool:
+            futures = {}
+            for index, host_port in enumerate(self.alive_hosts_with_ports.items()):
+                host, port = host_port
+                vendor = self.hosts[host].get("vendor")
+                product = self.hosts[host].get("product")
+                name_of_file = "{host}-{port}-{vendor}-{product}".format(
+                    host=host, port=str(port), vendor=vendor, product=product
+                ).replace(" ", "_")
+
+                # Check if file already exists
+                if self._is_host_already_scanned(name_of_file):
+                    continue
+
+                future = tls_pool.submit(
+                    self._scan_host,
+                    index=index,
+                    alive_hosts_quantity=alive_hosts_quantity,
                     host=host,
                     port=port,
+                    name_of_file=name_of_file,
                     report_detail=report_detail,
                     scan_detail=scan_detail,
+                    scanner_path=scanner_path,
                     threads=threads,
+                    service_pool=service_pool,
+                )
+                futures[future] = name_of_file
+
+            # Save every report as soon as it is ready
+            for future in as_completed(futures):
+                tls_scanner_res = future.result()
+                if not tls_scanner_res:
+                    continue
+                self.save_tls_results(
+                    dest_dir=DefaultValues.RESULTS_DIRECTORY,
+                    sub_dir=DefaultTlsScannerValues.TLS_SCANNER_RESULTS_DIR,
+                    filename=futures[future],
+                    result=tls_scanner_res,
                 )
-            except Exception as unexp_err:
-                print(f"└ TLS Scanning error ({str(unexp_err)})")
-                continue
-            if not tls_scanner_res:
-                continue
-            self.save_tls_results(
-                dest_dir=DefaultValues.RESULTS_DIRECTORY,
-                sub_dir=DefaultTlsScannerValues.TLS_SCANNER_RESULTS_DIR,
-                filename=name_of_file,
-                result=tls_scanner_res,
-            )
-        print(f"TLS scan for {alive_hosts_quantity} hosts: ", end="")
 
     @create_results_directory()
     @create_subdirectory(subdirectory=DefaultTlsScannerValues.TLS_SCANNER_RESULTS_DIR)
@@ -351,3 +644,4 @@ class TlsScanner:
             .joinpath(dest_dir)
             .joinpath(sub_dir).joinpath(f"{filename}.txt"), mode="w") as result_file:
             result_file.write(result)
+        self._get_scanned_results().add(f"{filename}.txt")
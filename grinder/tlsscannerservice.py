@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+from os import killpg, setpgrp
+from pathlib import Path
+from queue import Queue, Empty
+from signal import SIGKILL
+from subprocess import Popen, PIPE, DEVNULL, check_call
+from threading import Thread, Lock
+from time import monotonic
+
+from grinder.decorators import exception_handler
+from grinder.defaultvalues import DefaultTlsScannerValues
+from grinder.errors import (
+    GrinderTlsScannerServiceStartError,
+    GrinderTlsScannerServiceScanError,
+    GrinderTlsScannerServiceCloseError,
+)
+
+# Services are started lazily from TLS worker threads, so
+# compilation must not run concurrently into the same directory
+_COMPILE_LOCK = Lock()
+
+
+class TlsScannerService:
+    """
+    One long-lived JVM with TLS-Scanner inside. Jobs are sent
+    to stdin line by line, reports are read from stdout until
+    end marker, so JVM startup and class loading are paid once.
+    """
+
+    def __init__(self, scanner_path: str, service_dir: str = None):
+        self.scanner_path: str = str(scanner_path)
+        self.service_dir: Path = Path(
+            service_dir or DefaultTlsScannerValues.TLS_SCANNER_SERVICE_DIR
+        )
+        self.process: Popen = None
+        self.lines: Queue = None
+
+    def _compile(self) -> None:
+        """
+        Compile service class if it was not compiled yet
+
+        :return None:
+        """
+        class_name = DefaultTlsScannerValues.TLS_SCANNER_SERVICE_CLASS
+        with _COMPILE_LOCK:
+            if self.service_dir.joinpath(f"{class_name}.class").exists():
+                return
+            check_call(
+                [
+                    "javac",
+                    "-d",
+                    str(self.service_dir),
+                    str(self.service_dir.joinpath(f"{class_name}.java")),
+                ],
+                stdout=DEVNULL,
+            )
+
+    def _read_lines(self, process: Popen, lines: Queue) -> None:
+        """
+        Move service stdout lines to queue, so reading
+        of report can be done with timeout
+
+        :param process (Popen): service process
+        :param lines (Queue): queue for lines
+        :return None:
+        """
+        for line in process.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    @exception_handler(expected_exception=GrinderTlsScannerServiceStartError)
+    def start(self) -> None:
+        """
+        Start JVM service process
+
+        :return None:
+        """
+        self._compile()
+        classpath = ":".join([self.scanner_path, str(self.service_dir)])
+        self.process = Popen(
+            [
+                "java",
+                "-cp",
+                classpath,
+                DefaultTlsScannerValues.TLS_SCANNER_SERVICE_CLASS,
+            ],
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=DEVNULL,
+            universal_newlines=True,
+            bufsize=1,
+            preexec_fn=setpgrp,
+        )
+        self.lines = Queue()
+        Thread(
+            target=self._read_lines, args=(self.process, self.lines), daemon=True
+        ).start()
+
+    @exception_handler(expected_exception=GrinderTlsScannerServiceScanError)
+    def scan(
+        self,
+        arguments: list,
+        timeout: int = DefaultTlsScannerValues.TLS_SCANNER_TIMEOUT,
+    ) -> str or None:
+        """
+        Send job to service and wait for report. If service is dead
+        or report is not ready in time, service will be restarted
+        on the next job.
+
+        :param arguments (list): TLS-Scanner command line arguments
+        :param timeout (int): maximum time to wait for report
+        :return str: report or None in case of error or timeout
+        """
+        if not self.is_alive():
+            self.start()
+        self.process.stdin.write("\t".join(map(str, arguments)) + "\n")
+        self.process.stdin.flush()
+
+        end_marker = DefaultTlsScannerValues.TLS_SCANNER_SERVICE_END_MARKER
+        report: list = []
+        # Timeout is for the whole job, not for every line of report
+        deadline = monotonic() + timeout
+        while True:
+            try:
+                line = self.lines.get(timeout=max(deadline - monotonic(), 0))
+            except Empty:
+                print(f"└ Timeout expired: ", end="")
+                self.close(force=True)
+                return
+            if line is None:
+                # Service died in the middle of the job
+                self.close()
+                return
+            if line.startswith(end_marker):
+                if line[len(end_marker):].strip() != "OK":
+                    return
+                return "".join(report)
+            report.append(line)
+
+    @exception_handler(expected_exception=GrinderTlsScannerServiceCloseError)
+    def close(self, force: bool = False) -> None:
+        """
+        Stop service, busy service can be stopped only by force
+
+        :param force (bool): kill service without waiting
+        :return None:
+        """
+        if not self.process:
+            return
+        if self.is_alive():
+            try:
+                if force:
+                    raise TimeoutError("Service is busy")
+                self.process.stdin.close()
+                self.process.wait(
+                    timeout=DefaultTlsScannerValues.TLS_SCANNER_SERVICE_STOP_TIMEOUT
+                )
+            except Exception:
+                killpg(self.process.pid, SIGKILL)
+                self.process.wait()
+        self.process = None
+
+
+class TlsScannerServicePool:
+    """
+    Small pool of TLS-Scanner services, every job takes
+    free service and returns it back when report is ready
+    """
+
+    def __init__(self, scanner_path: str, size: int):
+        self.services: list = [
+            TlsScannerService(scanner_path) for _ in range(max(size, 1))
+        ]
+        self.free_services: Queue = Queue()
+        for service in self.services:
+            self.free_services.put(service)
+
+    def scan(
+        self,
+        arguments: list,
+        timeout: int = DefaultTlsScannerValues.TLS_SCANNER_TIMEOUT,
+    ) -> str or None:
+        """
+        Run job on the first free service
+
+        :param arguments (list): TLS-Scanner command line arguments
+        :param timeout (int): maximum time to wait for report
+        :return str: report or None in case of error or timeout
+        """
+        service = self.free_services.get()
+        try:
+            return service.scan(arguments, timeout=timeout)
+        finally:
+            self.free_services.put(service)
+
+    def close(self) -> None:
+        for service in self.services:
+            try:
+                service.close()
+            except Exception as close_error:
+                print(f"Can not stop TLS-Scanner service: {close_error}")
@@ -9,24 +9,21 @@ class GrinderUtils:
         self.dict_with_limited_max_results: dict = {}
 
     def count_entities(self, results: list, max_entities: int) -> None:
-        number_of_entities: dict = Counter(results)
-        entities_sorted_by_value = dict(
-            sorted(number_of_entities.items(), key=lambda x: x[1], reverse=True)
-        )
+        self.set_counted_entities(Counter(results), max_entities)
 
-        real_max_entities = len(entities_sorted_by_value.keys())
-        if max_entities < real_max_entities:
-            real_max_entities = max_entities
+    def set_counted_entities(self, number_of_entities: dict, max_entities: int) -> None:
+        if not isinstance(number_of_entities, Counter):
+            number_of_entities = Counter(number_of_entities)
 
         # Check if current counted value in dict doesn't have key == None
         self.dict_with_all_results = {
-            key: entities_sorted_by_value[key]
-            for key in list(entities_sorted_by_value)
+            key: value
+            for key, value in number_of_entities.most_common()
             if key is not None
         }
         self.dict_with_limited_max_results = {
-            key: entities_sorted_by_value[key]
-            for key in list(entities_sorted_by_value)[:real_max_entities]
+            key: value
+            for key, value in number_of_entities.most_common(max_entities)
             if key is not None
         }
 
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+from os import chdir, getcwd
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from grinder.dbhandling import GrinderDatabase
+from grinder.hostrecord import HostRecord
+
+
+class TestAddScanResults(TestCase):
+    def setUp(self):
+        self.cwd = getcwd()
+        self.tmp_dir = TemporaryDirectory()
+        chdir(self.tmp_dir.name)
+        self.db = GrinderDatabase()
+        self.db.create_db()
+        self.db.initiate_scan()
+
+    def tearDown(self):
+        self.db.close()
+        chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_query_without_hosts(self):
+        host = HostRecord(
+            product="Apache",
+            vendor="Apache",
+            query="apache",
+            port=80,
+            proto="http",
+            ip="1.2.3.4",
+            lat=1.0,
+            lng=2.0,
+            country="Germany",
+        )
+        products = [
+            dict(
+                vendor="Apache",
+                product="Apache",
+                script=None,
+                vendor_confidence="firm",
+                is_processed=True,
+                shodan=[
+                    ({"query": "apache", "query_confidence": "firm"}, [host]),
+                    ({"query": "empty", "query_confidence": "firm"}, []),
+                ],
+                censys=[({"query": "empty", "query_confidence": "firm"}, None)],
+            )
+        ]
+        self.db.add_scan_results(products, total_products=1, total_results=1)
+
+        results_counts = self.db.connection.execute(
+            "SELECT query, results_count FROM shodan_results ORDER BY id"
+        ).fetchall()
+        self.assertEqual(results_counts, [("apache", 1), ("empty", None)])
+        censys_counts = self.db.connection.execute(
+            "SELECT query, results_count FROM censys_results"
+        ).fetchall()
+        self.assertEqual(censys_counts, [("empty", None)])
+        last_results = self.db.load_last_results()
+        self.assertEqual(list(last_results), ["1.2.3.4"])
+        self.assertIsInstance(last_results["1.2.3.4"], HostRecord)
+        self.assertEqual(last_results["1.2.3.4"], host)
+
+
+if __name__ == "__main__":
+    main()